@@ -15,10 +15,15 @@
 # ╚══════════════════════════════════════════════════════════════════╝
 
 import html as _html
+import uuid
 import streamlit as st
 import streamlit.components.v1 as components
-from summarizer import summarize_text
-from text_cleaner import clean_text
+import config
+from text_cleaner import (
+    clean_document, describe_admission, read_chunks, strip_html,
+)
+from theme import HEROES, PALETTES, STYLESHEETS
+from workers import PoolSaturated
 
 # ---------------------------------------------------
 # 1. PAGE CONFIGURATION
@@ -30,80 +35,49 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# ---------------------------------------------------
+# 1b. INFERENCE MODE
+# ---------------------------------------------------
+# Client mode (NEURALSUM_SERVER_URL set): models, tokenizers, caches and
+# the worker pool live in server.py and are shared by every UI process;
+# summarizer is never imported here.  In-process mode: opt-in background
+# warm-up (NEURALSUM_WARMUP) starts once per server process; later reruns
+# are a no-op.
+if config.SERVER_URL:
+    from client import RemoteSummarizer
+    _remote               = RemoteSummarizer(config.SERVER_URL)
+    input_hint            = _remote.input_hint
+    summarize_text_stream = _remote.summarize_text_stream
+    summarize_documents   = _remote.summarize_documents
+    summarize_file        = _remote.summarize_file
+    summarize_all_details = _remote.summarize_all_details
+    metrics_text          = _remote.metrics_text
+    new_chunk_store       = lambda: uuid.uuid4().hex    # the server keeps it by this id
+else:
+    from summarizer import (
+        input_hint, metrics_text, new_chunk_store, start_warmup, summarize_all_details,
+        summarize_documents, summarize_file, summarize_text_stream,
+    )
+    start_warmup()
+
+# Partial summaries of this session's long inputs, so re-running an edited
+# document only re-generates the chunks that changed.
+if "chunk_store" not in st.session_state:
+    st.session_state.chunk_store = new_chunk_store()
+
 # ---------------------------------------------------
 # 2. THEME STATE
 # ---------------------------------------------------
 if "theme" not in st.session_state:
     st.session_state.theme = "dark"
 
-is_dark = st.session_state.theme == "dark"
+theme   = st.session_state.theme
+is_dark = theme == "dark"
 
 # ---------------------------------------------------
-# 3. THEME VARIABLES
+# 3. THEME VARIABLES — colour tokens live in theme.py
 # ---------------------------------------------------
-T = {
-    # ── BACKGROUNDS ────────────────────────────────────────────────────────
-    "app_bg":          "#090c14"                    if is_dark else "#f5f3ff",
-    "textarea_bg":     "#111622"                    if is_dark else "#ffffff",
-    "textarea_border": "rgba(255,255,255,0.10)"     if is_dark else "rgba(79,70,229,0.20)",
-    "settings_bg":     "#0d1119"                    if is_dark else "#ffffff",
-    "select_bg":       "#111622"                    if is_dark else "#f5f3ff",
-    "select_border":   "rgba(255,255,255,0.09)"     if is_dark else "rgba(79,70,229,0.15)",
-    "popover_bg":      "#141824"                    if is_dark else "#ffffff",
-    "metric_bg":       "rgba(255,255,255,0.03)"     if is_dark else "rgba(79,70,229,0.05)",
-    "metric_border":   "rgba(255,255,255,0.06)"     if is_dark else "rgba(79,70,229,0.14)",
-    "card_border":     "rgba(255,255,255,0.07)"     if is_dark else "rgba(79,70,229,0.14)",
-    "settings_border": "rgba(255,255,255,0.06)"     if is_dark else "rgba(79,70,229,0.12)",
-    "pill_bg":         "rgba(255,255,255,0.04)"     if is_dark else "rgba(79,70,229,0.07)",
-    "pill_border":     "rgba(255,255,255,0.07)"     if is_dark else "rgba(79,70,229,0.16)",
-    "toggle_bg":       "#0d1119"                    if is_dark else "#ffffff",
-    # ── TEXT ───────────────────────────────────────────────────────────────
-    "text_primary":    "#ffffff"                    if is_dark else "#1e1b4b",
-    "text_secondary":  "rgba(255,255,255,0.42)"     if is_dark else "rgba(49,46,129,0.65)",
-    "text_muted":      "rgba(255,255,255,0.22)"     if is_dark else "rgba(49,46,129,0.50)",
-    "text_label":      "rgba(255,255,255,0.28)"     if is_dark else "rgba(79,70,229,0.65)",
-    "placeholder":     "rgba(255,255,255,0.18)"     if is_dark else "rgba(79,70,229,0.30)",
-    "textarea_text":   "rgba(255,255,255,0.88)"     if is_dark else "#1e1b4b",
-    "select_text":     "rgba(255,255,255,0.75)"     if is_dark else "#312e81",
-    "select_icon":     "rgba(255,255,255,0.35)"     if is_dark else "rgba(79,70,229,0.55)",
-    "opt_text":        "rgba(255,255,255,0.70)"     if is_dark else "rgba(49,46,129,0.85)",
-    # ── RESULT CARD ────────────────────────────────────────────────────────
-    "result_bg":       "rgba(99,255,200,0.03)"      if is_dark else "rgba(79,70,229,0.04)",
-    "result_border":   "rgba(99,255,200,0.12)"      if is_dark else "rgba(79,70,229,0.20)",
-    "result_text":     "rgba(255,255,255,0.82)"     if is_dark else "#1e1b4b",
-    # ── STRUCTURE / MESH ───────────────────────────────────────────────────
-    "grid":            "rgba(255,255,255,0.018)"    if is_dark else "rgba(79,70,229,0.015)",
-    #                                                                       ↑ ISSUE 9 — was 0.035
-    "mesh1":           "rgba(99,255,200,0.07)"      if is_dark else "rgba(79,70,229,0.07)",
-    "mesh2":           "rgba(120,80,255,0.09)"      if is_dark else "rgba(124,58,237,0.07)",
-    "mesh3":           "rgba(0,180,255,0.06)"       if is_dark else "rgba(192,38,211,0.05)",
-    "divider_mid":     "rgba(99,255,200,0.15)"      if is_dark else "rgba(79,70,229,0.30)",
-    "divider_side":    "rgba(255,255,255,0.04)"     if is_dark else "rgba(79,70,229,0.06)",
-    "footer_border":   "rgba(255,255,255,0.04)"     if is_dark else "rgba(79,70,229,0.10)",
-    "footer_text":     "rgba(255,255,255,0.15)"     if is_dark else "rgba(79,70,229,0.38)",
-    "compress_sub":    "rgba(255,255,255,0.22)"     if is_dark else "rgba(49,46,129,0.48)",
-    # ── BADGE / TIPS — ISSUE 6: reduced to ghost-hint level ───────────────
-    "badge_bg":        "rgba(99,255,200,0.02)"      if is_dark else "rgba(79,70,229,0.03)",
-    "badge_border":    "rgba(99,255,200,0.06)"      if is_dark else "rgba(79,70,229,0.10)",
-    "tip_label":       "rgba(99,255,200,0.35)"      if is_dark else "rgba(79,70,229,0.55)",
-    "tip_bold":        "rgba(255,255,255,0.30)"     if is_dark else "rgba(30,27,75,0.50)",
-    # ── ACCENT PALETTE ─────────────────────────────────────────────────────
-    "accent":          "#63ffc8"                    if is_dark else "#4f46e5",
-    "accent_blue":     "#3b82f6"                    if is_dark else "#7c3aed",
-    "accent_purple":   "#a78bfa"                    if is_dark else "#c026d3",
-    # ── COPY BUTTON — ISSUE 4: visible, clickable-looking ─────────────────
-    # dark  → mint border at 35% opacity + subtle mint tint bg
-    # light → indigo border at 35% opacity + subtle indigo tint bg
-    "copy_border":     "rgba(99,255,200,0.35)"      if is_dark else "rgba(79,70,229,0.35)",
-    "copy_bg":         "rgba(99,255,200,0.05)"      if is_dark else "rgba(79,70,229,0.05)",
-    "copy_text":       "rgba(99,255,200,0.75)"      if is_dark else "rgba(79,70,229,0.75)",
-    # ── SEMANTIC EXTRAS ────────────────────────────────────────────────────
-    "btn_text":        "#050810"                    if is_dark else "#ffffff",
-    "engine_bg":       "rgba(59,130,246,0.08)"      if is_dark else "rgba(79,70,229,0.07)",
-    "engine_border":   "rgba(59,130,246,0.18)"      if is_dark else "rgba(79,70,229,0.20)",
-    "engine_dot":      "#3b82f6"                    if is_dark else "#4f46e5",
-    "engine_val":      "#7dd3fc"                    if is_dark else "#4f46e5",
-}
+T = PALETTES[theme]
 
 # ---------------------------------------------------
 # 3b. Model lookup tables
@@ -112,11 +86,20 @@ _MODEL_LABEL_TO_KEY = {
     "Auto":            "auto",
     "T5 (Fast)":       "t5",
     "BART (Accurate)": "bart",
+    "Instant (Extractive)": "instant",
+}
+# "All (Compare)" returns every detail level from one encoder pass
+_DETAIL_LABEL_TO_KEY = {
+    "Short":         "short",
+    "Medium":        "medium",
+    "Long":          "long",
+    "All (Compare)": "all",
 }
 _MODEL_KEY_TO_DISPLAY = {
     "auto": "Auto \u2192 BART",   # ISSUE minor: proper spaced arrow
     "t5":   "T5 (Fast)",
     "bart": "BART (Accurate)",
+    "instant": "Instant (Extractive)",
 }
 
 # ---------------------------------------------------
@@ -126,12 +109,6 @@ _bar_heights = [10, 16, 22, 10, 16, 22, 10, 16, 22, 10, 16, 22, 10, 16, 22, 10]
 _grad        = "linear-gradient(180deg,#63ffc8,#3b82f6)"
 _bar_style   = "flex:1;border-radius:2px;transform-origin:bottom;background:" + _grad + ";"
 
-_bars_dim = "".join(
-    '<div style="' + _bar_style
-    + f'height:{_bar_heights[i]}px;opacity:0.12;'
-    + f'animation:blockFill 0.4s ease {round(i * 0.07, 3)}s infinite alternate;"></div>'
-    for i in range(16)
-)
 _bars_mid = "".join(
     '<div style="' + _bar_style
     + f'height:{_bar_heights[i]}px;'
@@ -147,11 +124,6 @@ _lbl   = ("font-family:'Syne',sans-serif;font-size:0.60rem;font-weight:700;"
 _lline = '<span style="width:10px;height:1px;background:#63ffc855;display:inline-block;"></span>'
 _brow  = "display:flex;gap:4px;align-items:flex-end;height:28px;"
 
-LOADER_PHASE1 = (
-    '<div style="margin-top:18px;margin-bottom:4px;">'
-    + '<div style="' + _lbl + 'color:#63ffc899;">' + _lline + "Processing" + _lline + '</div>'
-    + '<div style="' + _brow + '">' + _bars_dim + '</div></div>'
-)
 LOADER_PHASE2 = (
     '<div style="margin-top:18px;margin-bottom:4px;">'
     + '<div style="' + _lbl + 'color:#63ffc8cc;">' + _lline + "Generating Summary" + _lline + '</div>'
@@ -159,344 +131,9 @@ LOADER_PHASE2 = (
 )
 
 # ---------------------------------------------------
-# 5. CSS
+# 5. CSS — both stylesheets are pre-rendered once per process (theme.py)
 # ---------------------------------------------------
-st.markdown(f"""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Syne:wght@400;500;600;700;800&family=DM+Sans:ital,opsz,wght@0,9..40,300;0,9..40,400;0,9..40,500;1,9..40,300&display=swap');
-
-*, *::before, *::after {{ box-sizing: border-box; }}
-
-html, body, .stApp {{
-    background-color: {T['app_bg']} !important;
-    font-family: 'DM Sans', sans-serif;
-}}
-
-.stApp {{
-    position:   relative;
-    min-height: 100vh;
-    overflow-x: hidden;
-}}
-
-.stApp::before {{
-    content: '';
-    position: fixed;
-    inset: 0;
-    background:
-        radial-gradient(ellipse 80% 60% at 10%  0%,  {T['mesh1']} 0%, transparent 60%),
-        radial-gradient(ellipse 60% 50% at 90% 10%,  {T['mesh2']} 0%, transparent 55%),
-        radial-gradient(ellipse 50% 40% at 50% 90%,  {T['mesh3']} 0%, transparent 60%);
-    pointer-events: none;
-    z-index: 0;
-}}
-
-/* ISSUE 9 — grid opacity reduced in light mode via T['grid'] token above */
-.stApp::after {{
-    content: '';
-    position: fixed;
-    inset: 0;
-    background-image:
-        linear-gradient({T['grid']} 1px, transparent 1px),
-        linear-gradient(90deg, {T['grid']} 1px, transparent 1px);
-    background-size: 60px 60px;
-    pointer-events: none;
-    z-index: 0;
-}}
-
-section.main > div,
-[data-testid="stAppViewContainer"] > .main {{
-    position: relative;
-    z-index: 1;
-}}
-
-#MainMenu, footer, header {{ visibility: hidden !important; }}
-[data-testid="collapsedControl"] {{ display: none !important; }}
-.stDeployButton {{ display: none !important; }}
-
-::-webkit-scrollbar {{ width: 4px; }}
-::-webkit-scrollbar-track {{ background: transparent; }}
-::-webkit-scrollbar-thumb {{ background: {T['accent']}55; border-radius: 2px; }}
-
-.block-container {{
-    padding:   0 2rem !important;
-    max-width: 1300px !important;
-}}
-[data-testid="column"] {{ padding: 0 10px !important; }}
-
-/* ── TEXTAREA ─────────────────────────────────────────── */
-.stTextArea > div,
-.stTextArea > div > div,
-.stTextArea > div > div > div,
-[data-baseweb="textarea"],
-[data-baseweb="textarea"] > div,
-[data-baseweb="base-input"],
-[data-baseweb="base-input"] > div {{
-    background:       {T['textarea_bg']} !important;
-    background-color: {T['textarea_bg']} !important;
-    border:           none !important;
-    box-shadow:       none !important;
-}}
-
-.stTextArea textarea {{
-    background:         {T['textarea_bg']} !important;
-    background-color:   {T['textarea_bg']} !important;
-    border:             1px solid {T['textarea_border']} !important;
-    border-radius:      14px !important;
-    color:              {T['textarea_text']} !important;
-    font-family:        'DM Sans', sans-serif !important;
-    font-size:          0.97rem !important;
-    font-weight:        300 !important;
-    line-height:        1.8 !important;
-    padding:            22px 24px !important;   /* ISSUE minor: 24px padding */
-    caret-color:        {T['accent']} !important;
-    resize:             none !important;
-    overflow-y:         hidden !important;
-    box-shadow:         none !important;
-    outline:            none !important;
-    -webkit-box-shadow: none !important;
-    -webkit-appearance: none !important;
-    min-height:         220px !important;
-    transition:         border-color 0.25s ease, box-shadow 0.25s ease !important;
-}}
-
-.stTextArea textarea::placeholder {{
-    color:       {T['placeholder']} !important;
-    font-style:  italic !important;
-    font-weight: 300 !important;
-}}
-
-.stTextArea textarea:focus {{
-    border-color:       {T['accent']}55 !important;
-    box-shadow:         0 0 0 3px {T['accent']}0f !important;
-    outline:            none !important;
-    -webkit-box-shadow: 0 0 0 3px {T['accent']}0f !important;
-}}
-
-.stTextArea textarea:invalid,
-.stTextArea textarea:required,
-.stTextArea textarea:-moz-ui-invalid {{
-    box-shadow:         none !important;
-    -webkit-box-shadow: none !important;
-    border-color:       {T['textarea_border']} !important;
-    outline:            none !important;
-}}
-
-.stTextArea label {{ display: none !important; }}
-
-/* ── SELECTBOX ────────────────────────────────────────── */
-div[data-baseweb="select"] > div {{
-    background-color: {T['select_bg']} !important;
-    border-color:     {T['select_border']} !important;
-    border-radius:    10px !important;
-    color:            {T['select_text']} !important;
-    font-family:      'DM Sans', sans-serif !important;
-    font-size:        0.9rem !important;
-}}
-
-div[data-baseweb="select"] > div:hover {{
-    border-color: {T['accent']}44 !important;
-}}
-
-div[data-baseweb="select"] svg {{ color: {T['select_icon']} !important; }}
-
-[data-baseweb="popover"], [data-baseweb="menu"] {{
-    background:    {T['popover_bg']} !important;
-    border:        1px solid {T['select_border']} !important;
-    border-radius: 10px !important;
-}}
-
-[role="option"] {{
-    color:            {T['opt_text']} !important;
-    font-family:      'DM Sans', sans-serif !important;
-    font-size:        0.88rem !important;
-    background-color: {T['popover_bg']} !important;
-}}
-
-[role="option"]:hover, [aria-selected="true"] {{
-    background-color: {T['accent']}14 !important;
-    color:            {T['accent']} !important;
-}}
-
-.stSelectbox label {{
-    font-family:    'DM Sans', sans-serif !important;
-    font-size:      0.72rem !important;
-    font-weight:    600 !important;
-    color:          {T['text_label']} !important;
-    letter-spacing: 0.10em !important;
-    text-transform: uppercase !important;
-    margin-bottom:  2px !important;
-}}
-
-/* ── RUN ANALYSIS BUTTON ──────────────────────────────── */
-.stButton > button {{
-    background:     linear-gradient(135deg, {T['accent']} 0%, {T['accent_blue']} 100%) !important;
-    color:          {T['btn_text']} !important;
-    font-family:    'Syne', sans-serif !important;
-    font-weight:    800 !important;
-    font-size:      0.82rem !important;
-    letter-spacing: 0.15em !important;
-    text-transform: uppercase !important;
-    padding:        0.82rem 1.5rem !important;
-    border-radius:  12px !important;
-    border:         none !important;
-    width:          100% !important;
-    cursor:         pointer !important;
-    box-shadow:     0 2px 22px {T['accent']}35, 0 1px 0 rgba(255,255,255,0.15) inset !important;
-    transition:     transform 0.18s ease, box-shadow 0.18s ease !important;
-}}
-
-.stButton > button:hover {{
-    transform:  translateY(-2px) !important;
-    box-shadow: 0 8px 30px {T['accent']}55 !important;
-}}
-
-.stButton > button:active {{
-    transform: translateY(0) !important;
-}}
-
-/* ── METRICS ──────────────────────────────────────────── */
-div[data-testid="stMetric"] {{
-    background:    {T['metric_bg']} !important;
-    border:        1px solid {T['metric_border']} !important;
-    border-radius: 14px !important;
-    padding:       18px 20px !important;
-}}
-
-div[data-testid="stMetric"]:hover {{
-    border-color: {T['accent']}22 !important;
-}}
-
-[data-testid="stMetricValue"] {{
-    font-family:    'Syne', sans-serif !important;
-    font-size:      1.9rem !important;
-    font-weight:    800 !important;
-    color:          {T['text_primary']} !important;
-    letter-spacing: -1px !important;
-}}
-
-[data-testid="stMetricLabel"] {{
-    font-size:      0.70rem !important;
-    font-weight:    600 !important;
-    color:          {T['text_label']} !important;
-    letter-spacing: 0.10em !important;
-    text-transform: uppercase !important;
-}}
-
-[data-testid="stMetricDelta"],
-[data-testid="stMetricDeltaIcon"] {{
-    color:     {T['accent']} !important;
-    font-size: 0.78rem !important;
-}}
-
-/* ── ALERT ────────────────────────────────────────────── */
-.stAlert > div {{
-    background:    rgba(251,191,36,0.06) !important;
-    border:        1px solid rgba(251,191,36,0.20) !important;
-    border-radius: 10px !important;
-    color:         {T['text_secondary']} !important;
-}}
-
-/* ── GRADIENT TITLE — CSS class bypasses Streamlit sanitizer ── */
-.ns-grad {{
-    background:              linear-gradient(90deg, {T['accent']} 0%, {T['accent_blue']} 50%, {T['accent_purple']} 100%) !important;
-    -webkit-background-clip: text !important;
-    -webkit-text-fill-color: transparent !important;
-    background-clip:         text !important;
-    display:                 inline !important;
-}}
-
-/* ── COPY TOAST ───────────────────────────────────────── */
-#ns-toast {{
-    position:       fixed;
-    bottom:         36px;
-    left:           50%;
-    transform:      translateX(-50%) translateY(16px);
-    background:     {T['settings_bg']};
-    border:         1px solid {T['accent']}55;
-    border-radius:  100px;
-    padding:        11px 24px 11px 18px;
-    display:        flex;
-    align-items:    center;
-    gap:            11px;
-    font-family:    'Syne', sans-serif;
-    font-size:      0.78rem;
-    font-weight:    600;
-    letter-spacing: 0.06em;
-    color:          {T['accent']};
-    box-shadow:     0 10px 40px rgba(0,0,0,0.28), 0 0 0 1px {T['accent']}22;
-    opacity:        0;
-    transition:     opacity 0.22s ease, transform 0.22s ease;
-    z-index:        99999;
-    pointer-events: none;
-    white-space:    nowrap;
-}}
-#ns-toast.ns-show {{
-    opacity:   1;
-    transform: translateX(-50%) translateY(0);
-}}
-
-#ns-spinner {{
-    width:            15px;
-    height:           15px;
-    border:           2px solid {T['accent']}30;
-    border-top-color: {T['accent']};
-    border-radius:    50%;
-    animation:        ns-spin 0.65s linear infinite;
-    flex-shrink:      0;
-    display:          none;
-}}
-#ns-toast.ns-show  #ns-spinner {{ display: block; }}
-#ns-check {{
-    display:     none;
-    font-size:   1rem;
-    line-height: 1;
-    color:       {T['accent']};
-}}
-#ns-toast.ns-done #ns-spinner {{ display: none; }}
-#ns-toast.ns-done #ns-check   {{ display: block; }}
-
-/* ── RESULT CARD ACTION BUTTONS ───────────────────────── */
-/* ISSUE 4 — copy button visible & clickable-looking in dark mode */
-.ns-action-btn {{
-    background:    {T['copy_bg']} !important;
-    border:        1px solid {T['copy_border']} !important;
-    border-radius: 8px !important;
-    color:         {T['copy_text']} !important;
-    font-family:   'DM Sans', sans-serif !important;
-    font-size:     0.78rem !important;
-    font-weight:   500 !important;
-    letter-spacing:0.05em !important;
-    padding:       7px 18px !important;
-    cursor:        pointer !important;
-    transition:    all 0.2s ease !important;
-    display:       inline-flex !important;
-    align-items:   center !important;
-    gap:           7px !important;
-    text-decoration: none !important;
-    line-height:   1 !important;
-}}
-.ns-action-btn:hover {{
-    background:   {T['accent']}15 !important;
-    border-color: {T['accent']}66 !important;
-    color:        {T['accent']} !important;
-    transform:    translateY(-1px) !important;
-}}
-.ns-action-btn svg {{ opacity: 0.7; flex-shrink: 0; }}
-
-/* ── KEYFRAMES ────────────────────────────────────────── */
-@keyframes blockFill {{
-    0%   {{ opacity: 0.12; transform: scaleY(0.55); }}
-    100% {{ opacity: 1;    transform: scaleY(1); }}
-}}
-@keyframes pulse {{
-    0%,100% {{ opacity:1;   transform:scale(1); }}
-    50%     {{ opacity:0.5; transform:scale(0.85); }}
-}}
-@keyframes ns-spin {{
-    to {{ transform: rotate(360deg); }}
-}}
-</style>
-""", unsafe_allow_html=True)
+st.markdown(STYLESHEETS[theme], unsafe_allow_html=True)
 
 # ---------------------------------------------------
 # 6. AUTO-RESIZE TEXTAREA via JS
@@ -537,64 +174,10 @@ with toggle_col:
         st.session_state.theme = "light" if is_dark else "dark"
         st.rerun()
 
-st.markdown(f"""
-<style>
-[data-testid="stHorizontalBlock"]:first-of-type .stButton > button {{
-    background:     {T['toggle_bg']} !important;
-    border:         1px solid {T['card_border']} !important;
-    border-radius:  100px !important;
-    color:          {T['text_secondary']} !important;
-    font-family:    'DM Sans', sans-serif !important;
-    font-size:      0.75rem !important;
-    font-weight:    500 !important;
-    letter-spacing: 0.04em !important;
-    padding:        6px 16px !important;
-    box-shadow:     0 2px 10px rgba(0,0,0,0.15) !important;
-    width:          auto !important;
-    text-transform: none !important;
-}}
-[data-testid="stHorizontalBlock"]:first-of-type .stButton > button:hover {{
-    border-color: {T['accent']}55 !important;
-    color:        {T['accent']} !important;
-    transform:    none !important;
-    box-shadow:   0 2px 14px rgba(0,0,0,0.2) !important;
-}}
-</style>
-""", unsafe_allow_html=True)
-
 # ---------------------------------------------------
 # 8. HERO — ISSUE 8: padding reduced ~30%
 # ---------------------------------------------------
-eyebrow_bg     = "rgba(99,255,200,0.07)"  if is_dark else "rgba(79,70,229,0.07)"
-eyebrow_border = "rgba(99,255,200,0.18)"  if is_dark else "rgba(79,70,229,0.20)"
-
-st.markdown(f"""
-<div style="padding:12px 0 20px 0;">
-    <div style="display:inline-flex;align-items:center;gap:8px;
-        background:{eyebrow_bg};border:1px solid {eyebrow_border};
-        border-radius:100px;padding:5px 14px 5px 10px;margin-bottom:14px;">
-        <span style="width:7px;height:7px;background:{T['accent']};border-radius:50%;
-            box-shadow:0 0 8px {T['accent']};display:inline-block;
-            animation:pulse 2s ease infinite;"></span>
-        <span style="font-family:'DM Sans',sans-serif;font-size:0.70rem;font-weight:600;
-            color:{T['accent']};letter-spacing:0.14em;text-transform:uppercase;">
-            Transformer &middot; T5 &amp; BART &middot; NLP
-        </span>
-    </div>
-    <div style="font-family:'Syne',sans-serif;
-        font-size:clamp(2.4rem,5vw,4.2rem);font-weight:800;
-        line-height:1.0;letter-spacing:-2px;
-        color:{T['text_primary']};margin-bottom:10px;">
-        Neural<span class="ns-grad">Sum</span>
-    </div>
-    <div style="font-size:1.0rem;color:{T['text_secondary']};font-weight:300;
-        max-width:460px;line-height:1.6;font-family:'DM Sans',sans-serif;">
-        Distill vast information into precise intelligence &mdash; powered by transformer models.
-    </div>
-</div>
-<div style="height:1px;margin-bottom:24px;
-    background:linear-gradient(90deg,{T['divider_side']},{T['divider_mid']} 50%,{T['divider_side']});"></div>
-""", unsafe_allow_html=True)
+st.markdown(HEROES[theme], unsafe_allow_html=True)
 
 # ── reusable section label ────────────────────────
 def sec_label(text):
@@ -608,12 +191,75 @@ def sec_label(text):
         '</div>'
     )
 
+# ── result card shell — reused for streamed partials and the final render ──
+def result_card(body, footer=""):
+    return (
+        f'<div style="background:{T["result_bg"]};border:1px solid {T["result_border"]};'
+        'border-radius:16px;padding:28px 30px 22px 30px;'
+        f'color:{T["result_text"]};line-height:1.85;font-size:1.0rem;'
+        "font-weight:300;font-family:'DM Sans',sans-serif;"
+        'position:relative;overflow:hidden;">'
+        f'<div style="position:absolute;top:0;left:0;right:0;height:1px;'
+        f'background:linear-gradient(90deg,transparent,{T["accent"]}55,transparent);"></div>'
+        f'<div style="position:absolute;top:4px;right:20px;font-size:5.5rem;'
+        f"font-family:'Syne',sans-serif;color:{T['accent']}0d;"
+        'line-height:1;pointer-events:none;user-select:none;">&ldquo;</div>'
+        f'<div style="position:relative;z-index:1;">{body}</div>'
+        + footer
+        + '</div>'
+    )
+
+# blinking caret appended to partial summaries while tokens are still arriving
+_STREAM_CARET = (
+    f'<span style="display:inline-block;width:7px;height:1.05em;margin-left:3px;'
+    f'vertical-align:-2px;background:{T["accent"]};'
+    'animation:blockFill 0.5s ease infinite alternate;"></span>'
+)
+
 # ---------------------------------------------------
 # 9. MAIN LAYOUT
 # ---------------------------------------------------
-col_input, col_settings = st.columns([3, 1], gap="medium")
-
-with col_settings:
+# Input, settings and result are separate fragments: typing re-runs (and
+# re-sends) only the input panel, a settings change only the settings
+# panel.  They talk through session_state; RUN ANALYSIS is the one action
+# that re-runs the whole page, so the result fragment picks it up.
+def current_settings():
+    """(detail, model key) as last chosen in the settings panel."""
+    detail = _DETAIL_LABEL_TO_KEY[st.session_state.get("detail_option", "Medium")]
+    model  = _MODEL_LABEL_TO_KEY[st.session_state.get("model_option", "Auto")]
+    return detail, model
+
+
+def is_html(upload):
+    return upload.name.lower().endswith((".html", ".htm"))
+
+
+def source_documents():
+    """[(name, text)] — the pasted text (if any) followed by every uploaded file."""
+    documents = []
+    pasted = st.session_state.get("main_input", "")
+    if pasted and pasted.strip():
+        documents.append(("Pasted text", pasted))
+    for upload in st.session_state.get("uploads") or []:
+        upload.seek(0)
+        pieces = read_chunks(upload)
+        if is_html(upload):
+            pieces = strip_html(pieces)
+        # raw lines, not cleaned pieces: summarize_documents() admits and
+        # cleans each document once, and admit() judges it line by line
+        documents.append((upload.name, "".join(pieces)))
+    return documents
+
+
+def current_chunk_store():
+    """The session's chunk store, or None with incremental re-runs switched off."""
+    if st.session_state.get("incremental_option", True):
+        return st.session_state.chunk_store
+    return None
+
+
+@st.fragment
+def settings_panel():
     # ISSUE 5 — removed heavy card wrapper with border-bottom separator.
     # Now just a simple inline section label above the controls.
     st.markdown(
@@ -625,17 +271,30 @@ with col_settings:
         unsafe_allow_html=True
     )
 
-    length_option = st.selectbox("Summary Detail", ["Short", "Medium", "Long"], index=1)
+    st.selectbox(
+        "Summary Detail", list(_DETAIL_LABEL_TO_KEY), index=1,
+        help="All (Compare) generates short, medium and long summaries in one pass",
+        key="detail_option",
+    )
     st.write("")
-    model_option  = st.selectbox(
+    st.selectbox(
         "AI Engine",
         list(_MODEL_LABEL_TO_KEY.keys()),
-        help="Auto picks the best model based on word count"
+        help="Auto picks the best model based on token count",
+        key="model_option",
+    )
+    st.toggle(
+        "Incremental Re-runs",
+        value=True,
+        help="Long documents: keep each section's partial summary, so re-running "
+             "after an edit only re-summarizes the sections that changed",
+        key="incremental_option",
     )
-    model_choice  = _MODEL_LABEL_TO_KEY[model_option]
 
     st.markdown("<br>", unsafe_allow_html=True)
-    generate_btn = st.button("⚡  RUN ANALYSIS", use_container_width=True)
+    if st.button("⚡  RUN ANALYSIS", use_container_width=True):
+        st.session_state.run_requested = True
+        st.rerun(scope="app")
     st.markdown("<br>", unsafe_allow_html=True)
 
     # ISSUE 6 — model logic shown as ghost hint, not a prominent UI control
@@ -647,13 +306,15 @@ with col_settings:
         'Auto Model Logic</div>'
         f'<div style="font-size:0.74rem;color:{T["text_muted"]};'
         'font-family:\'DM Sans\',sans-serif;line-height:1.7;">'
-        f'<span style="color:{T["tip_bold"]};">&lt;120 words</span> &rarr; T5 Fast<br>'
-        f'<span style="color:{T["tip_bold"]};">&#8805;120 words</span> &rarr; BART Accurate'
+        f'<span style="color:{T["tip_bold"]};">&lt;160 tokens</span> &rarr; T5 Fast<br>'
+        f'<span style="color:{T["tip_bold"]};">&#8805;160 tokens</span> &rarr; BART Accurate'
         '</div></div>',
         unsafe_allow_html=True
     )
 
-with col_input:
+
+@st.fragment
+def input_panel():
     # Source Text header — clean, no word count pill above (it's shown below textarea)
     st.markdown(
         f'<div style="font-family:\'Syne\',sans-serif;font-size:0.65rem;font-weight:700;'
@@ -671,12 +332,40 @@ with col_input:
         key="main_input"
     )
 
+    # One cleaning pass per rerun — the badge, validation, summarizer and
+    # analytics all read from this document instead of re-splitting the text.
+    doc = clean_document(user_text)
+
     # ISSUE 2 — clean single-row flex: left group (count | model hint) + right pill
-    # Both wc values come from user_text (current render, always accurate)
+    # Both wc values come from doc (current render, always accurate)
     if user_text and user_text.strip():
-        wc     = len(user_text.split())
-        m_hint = "T5" if wc < 120 else "BART"
-        m_col  = T['accent'] if wc < 120 else T['accent_blue']
+        wc     = doc.word_count
+        # One call per rerun (one /predict in client mode, short timeout):
+        # the engine Auto would pick — same token-based routing the
+        # summarizer uses, tokenizer only — its non-blocking readiness, and
+        # the host-fitted latency estimate for the selected engine + detail
+        # (streamed → greedy); no pill until enough runs are recorded.
+        # Settings live in another fragment, so the pill names the detail
+        # level it was computed for.
+        detail, model_choice = current_settings()
+        m_eng, m_state, eta_s = input_hint(doc, detail, model_choice)
+        m_hint = m_eng.upper()
+        m_col  = T['accent'] if m_eng == "t5" else T['accent_blue']
+        m_state_label = {
+            "ready":   "ready",
+            "warming": "warming up",
+            "cold":    "loads on first run",
+            "offline": "server offline",
+        }.get(m_state, m_state)
+        eta_pill = (
+            f'<span style="display:inline-flex;align-items:center;gap:5px;'
+            f'background:{T["pill_bg"]};border:1px solid {T["pill_border"]};'
+            'border-radius:8px;padding:3px 10px;font-size:0.72rem;margin-right:6px;'
+            f'color:{T["text_muted"]};font-family:\'DM Sans\',sans-serif;flex-shrink:0;">'
+            f'&asymp;&nbsp;<b style="color:{T["accent_blue"]};font-family:\'Syne\',sans-serif;">'
+            f'{eta_s:.1f}s</b>&nbsp;{detail}'
+            '</span>'
+        ) if eta_s is not None else ""
         st.markdown(
             f'<div style="display:flex;align-items:center;gap:0;margin-top:6px;">'
             # ── left group ──
@@ -689,8 +378,11 @@ with col_input:
             'display:inline-block;flex-shrink:0;"></span>'
             f'<span style="font-size:0.72rem;font-family:\'DM Sans\',sans-serif;color:{T["text_muted"]};">'
             f'Auto:&nbsp;<b style="color:{m_col};font-family:\'Syne\',sans-serif;">{m_hint}</b>'
+            f'&nbsp;&middot;&nbsp;{m_state_label}'
             '</span>'
             '</div>'
+            # ── predicted latency, then the word pill ──
+            f'{eta_pill}'
             # ── right pill — ISSUE minor: border-radius 8px ──
             f'<span style="display:inline-flex;align-items:center;gap:5px;'
             f'background:{T["pill_bg"]};border:1px solid {T["pill_border"]};'
@@ -703,276 +395,500 @@ with col_input:
             unsafe_allow_html=True
         )
 
-# ---------------------------------------------------
-# 10. PROCESSING & OUTPUT
-# ---------------------------------------------------
-if generate_btn:
-    raw = (user_text or "").strip()
-
-    if not raw:
-        st.warning("⚠️  Please paste some text before running the analysis.")
-
-    elif len(raw.split()) < 10:
-        st.warning(
-            "⚠️  Input is too short — please provide at least **10 words** "
-            "so the model has enough context to summarize."
-        )
-
-    elif len(raw) > 50_000:
-        st.warning(
-            f"⚠️  Input is too long ({len(raw):,} characters). "
-            "Please trim it to under 50,000 characters."
-        )
-
-    else:
-        loader_slot = st.empty()
-        loader_slot.markdown(LOADER_PHASE1, unsafe_allow_html=True)
+    # Multi-document mode: with two or more sources (pasted text counts as
+    # one), each is summarized in parallel and the results are combined.
+    st.file_uploader(
+        "Add documents",
+        type=["txt", "md", "html", "htm"],
+        accept_multiple_files=True,
+        help="A single file is read as a stream with no length limit.  Two or more "
+             "documents are summarized in parallel, then combined into one briefing",
+        key="uploads",
+    )
 
-        cleaned = clean_text(raw)
 
-        if not cleaned or not cleaned.strip() or len(cleaned.split()) < 5:
-            loader_slot.empty()
-            st.warning(
-                "⚠️  No readable content remained after cleaning. "
-                "Please try different input text."
-            )
-        else:
-            loader_slot.markdown(LOADER_PHASE2, unsafe_allow_html=True)
+col_input, col_settings = st.columns([3, 1], gap="medium")
+with col_settings:
+    settings_panel()
+with col_input:
+    input_panel()
 
-            summary, model_used_raw = summarize_text(
-                cleaned,
-                length_option.lower(),
-                model_choice
-            )
+# ---------------------------------------------------
+# 10. PROCESSING & OUTPUT
+# ---------------------------------------------------
+def result_layout():
+    """Spacer, the two output columns and the (still empty) summary card slot."""
+    st.markdown("<br>", unsafe_allow_html=True)
+    out_left, out_right = st.columns([2, 1], gap="medium")
 
-            loader_slot.empty()
+    with out_left:
+        st.markdown(sec_label("Intelligence Output"), unsafe_allow_html=True)
+        card_slot = st.empty()
+    return out_left, out_right, card_slot
 
-            model_used_display = _MODEL_KEY_TO_DISPLAY.get(
-                str(model_used_raw).lower().strip(),
-                str(model_used_raw).upper()
-            )
 
-            st.markdown("<br>", unsafe_allow_html=True)
-            out_left, out_right = st.columns([2, 1], gap="medium")
-
-            # ── SUMMARY OUTPUT ──────────────────────────────────────────────
-            with out_left:
-                st.markdown(sec_label("Intelligence Output"), unsafe_allow_html=True)
-
-                # Escape summary for safe embedding in HTML attribute
-                summary_attr = _html.escape(summary, quote=True)
-
-                # ── ISSUE 4 FIX: Copy button root cause ────────────────────
-                # Streamlit's bleach HTML sanitizer strips 'onclick' and ALL
-                # event-handler attributes from st.markdown content — even with
-                # unsafe_allow_html=True.  The button renders but is dead.
-                #
-                # Solution: render the buttons as pure HTML (no onclick),
-                # then attach JS event listeners from components.html() which
-                # runs in its own iframe and accesses the parent document via
-                # window.parent.document — bypassing bleach entirely.
-                # ──────────────────────────────────────────────────────────
-
-                # SVG icons
-                _icon_copy = (
-                    '<svg width="11" height="13" viewBox="0 0 11 13" fill="none" '
-                    f'xmlns="http://www.w3.org/2000/svg" style="flex-shrink:0;">'
-                    f'<rect x="3" y="0.5" width="7.5" height="9.5" rx="1.5" stroke="currentColor" stroke-width="1.2"/>'
-                    f'<rect x="0.5" y="3" width="7.5" height="9.5" rx="1.5" fill="{T["result_bg"]}" stroke="currentColor" stroke-width="1.2"/>'
-                    '</svg>'
-                )
-                _icon_dl = (
-                    '<svg width="12" height="13" viewBox="0 0 12 13" fill="none" '
-                    'xmlns="http://www.w3.org/2000/svg" style="flex-shrink:0;">'
-                    '<path d="M6 1v8M3 6l3 3 3-3" stroke="currentColor" stroke-width="1.4" stroke-linecap="round" stroke-linejoin="round"/>'
-                    '<path d="M1 11h10" stroke="currentColor" stroke-width="1.4" stroke-linecap="round"/>'
-                    '</svg>'
-                )
+def render_result(out_left, out_right, card_slot, summary, model_used_raw, orig_words):
+    """Final summary card with copy / export actions, plus the analytics column."""
+    model_used_display = _MODEL_KEY_TO_DISPLAY.get(
+        str(model_used_raw).lower().strip(),
+        str(model_used_raw).upper()
+    )
 
-                action_row = (
-                    # Toast notification (position:fixed, appears above everything)
-                    '<div id="ns-toast">'
-                    '<div id="ns-spinner"></div>'
-                    '<span id="ns-check">&#10003;</span>'
-                    '<span id="ns-toast-msg">Copied to Clipboard</span>'
-                    '</div>'
-                    # Action button row inside card footer
-                    '<div style="display:flex;align-items:center;gap:10px;'
-                    'justify-content:flex-end;margin-top:18px;'
-                    f'padding-top:14px;border-top:1px solid {T["result_border"]};">'
-                    # Export button — id + data-payload (handler injected via components.html)
-                    f'<button id="ns-export-btn" class="ns-action-btn" data-payload="{summary_attr}">'
-                    + _icon_dl
-                    + 'Export</button>'
-                    # Copy button — id + data-payload
-                    f'<button id="ns-copy-btn" class="ns-action-btn" data-payload="{summary_attr}">'
-                    + _icon_copy
-                    + 'Copy</button>'
-                    '</div>'
-                )
+    # ── SUMMARY OUTPUT ──────────────────────────────────────────────
+    with out_left:
+        # Escape summary for safe embedding in HTML attribute
+        summary_attr = _html.escape(summary, quote=True)
+
+        # ── ISSUE 4 FIX: Copy button root cause ────────────────────
+        # Streamlit's bleach HTML sanitizer strips 'onclick' and ALL
+        # event-handler attributes from st.markdown content — even with
+        # unsafe_allow_html=True.  The button renders but is dead.
+        #
+        # Solution: render the buttons as pure HTML (no onclick),
+        # then attach JS event listeners from components.html() which
+        # runs in its own iframe and accesses the parent document via
+        # window.parent.document — bypassing bleach entirely.
+        # ──────────────────────────────────────────────────────────
+
+        # SVG icons
+        _icon_copy = (
+            '<svg width="11" height="13" viewBox="0 0 11 13" fill="none" '
+            f'xmlns="http://www.w3.org/2000/svg" style="flex-shrink:0;">'
+            f'<rect x="3" y="0.5" width="7.5" height="9.5" rx="1.5" stroke="currentColor" stroke-width="1.2"/>'
+            f'<rect x="0.5" y="3" width="7.5" height="9.5" rx="1.5" fill="{T["result_bg"]}" stroke="currentColor" stroke-width="1.2"/>'
+            '</svg>'
+        )
+        _icon_dl = (
+            '<svg width="12" height="13" viewBox="0 0 12 13" fill="none" '
+            'xmlns="http://www.w3.org/2000/svg" style="flex-shrink:0;">'
+            '<path d="M6 1v8M3 6l3 3 3-3" stroke="currentColor" stroke-width="1.4" stroke-linecap="round" stroke-linejoin="round"/>'
+            '<path d="M1 11h10" stroke="currentColor" stroke-width="1.4" stroke-linecap="round"/>'
+            '</svg>'
+        )
 
-                result_card = (
-                    f'<div style="background:{T["result_bg"]};border:1px solid {T["result_border"]};'
-                    'border-radius:16px;padding:28px 30px 22px 30px;'
-                    f'color:{T["result_text"]};line-height:1.85;font-size:1.0rem;'
-                    "font-weight:300;font-family:'DM Sans',sans-serif;"
-                    'position:relative;overflow:hidden;">'
-                    f'<div style="position:absolute;top:0;left:0;right:0;height:1px;'
-                    f'background:linear-gradient(90deg,transparent,{T["accent"]}55,transparent);"></div>'
-                    f'<div style="position:absolute;top:4px;right:20px;font-size:5.5rem;'
-                    f"font-family:'Syne',sans-serif;color:{T['accent']}0d;"
-                    'line-height:1;pointer-events:none;user-select:none;">&ldquo;</div>'
-                    f'<div style="position:relative;z-index:1;">{summary}</div>'
-                    + action_row
-                    + '</div>'
-                )
+        action_row = (
+            # Toast notification (position:fixed, appears above everything)
+            '<div id="ns-toast">'
+            '<div id="ns-spinner"></div>'
+            '<span id="ns-check">&#10003;</span>'
+            '<span id="ns-toast-msg">Copied to Clipboard</span>'
+            '</div>'
+            # Action button row inside card footer
+            '<div style="display:flex;align-items:center;gap:10px;'
+            'justify-content:flex-end;margin-top:18px;'
+            f'padding-top:14px;border-top:1px solid {T["result_border"]};">'
+            # Export button — id + data-payload (handler injected via components.html)
+            f'<button id="ns-export-btn" class="ns-action-btn" data-payload="{summary_attr}">'
+            + _icon_dl
+            + 'Export</button>'
+            # Copy button — id + data-payload
+            f'<button id="ns-copy-btn" class="ns-action-btn" data-payload="{summary_attr}">'
+            + _icon_copy
+            + 'Copy</button>'
+            '</div>'
+        )
 
-                st.markdown(result_card, unsafe_allow_html=True)
-
-                # ISSUE 4 FIX — Inject event handlers via components.html().
-                # This script runs inside Streamlit's component iframe and reaches
-                # into window.parent.document to attach real click handlers —
-                # completely bypassing bleach sanitization.
-                #
-                # Copy strategy: try modern navigator.clipboard API first (works on
-                # HTTPS / localhost), then fall back to legacy execCommand('copy').
-                # Export strategy: create Blob → object URL → auto-click <a> → revoke.
-                components.html(f"""
+        card_slot.markdown(result_card(summary, action_row), unsafe_allow_html=True)
+
+        # ISSUE 4 FIX — Inject event handlers via components.html().
+        # This script runs inside Streamlit's component iframe and reaches
+        # into window.parent.document to attach real click handlers —
+        # completely bypassing bleach sanitization.
+        #
+        # Copy strategy: try modern navigator.clipboard API first (works on
+        # HTTPS / localhost), then fall back to legacy execCommand('copy').
+        # Export strategy: create Blob → object URL → auto-click <a> → revoke.
+        components.html(f"""
 <script>
 (function() {{
   var doc = window.parent.document;
 
   function showToast(ok) {{
-    var toast = doc.getElementById('ns-toast');
-    var msg   = doc.getElementById('ns-toast-msg');
-    if (!toast) return;
-    toast.classList.remove('ns-done');
-    toast.classList.add('ns-show');
-    if (ok) {{
-      msg.textContent = 'Copied to Clipboard';
-      setTimeout(function() {{ toast.classList.add('ns-done'); }}, 350);
-    }} else {{
-      msg.textContent = 'Could not copy \u2014 please copy manually';
-    }}
-    setTimeout(function() {{ toast.classList.remove('ns-show', 'ns-done'); }}, 2500);
+var toast = doc.getElementById('ns-toast');
+var msg   = doc.getElementById('ns-toast-msg');
+if (!toast) return;
+toast.classList.remove('ns-done');
+toast.classList.add('ns-show');
+if (ok) {{
+  msg.textContent = 'Copied to Clipboard';
+  setTimeout(function() {{ toast.classList.add('ns-done'); }}, 350);
+}} else {{
+  msg.textContent = 'Could not copy \u2014 please copy manually';
+}}
+setTimeout(function() {{ toast.classList.remove('ns-show', 'ns-done'); }}, 2500);
   }}
 
   function execCopy(text) {{
-    var ta = doc.createElement('textarea');
-    ta.value = text;
-    ta.style.cssText = 'position:fixed;top:-9999px;left:-9999px;opacity:0;';
-    doc.body.appendChild(ta);
-    ta.focus(); ta.select();
-    var ok = false;
-    try {{ ok = doc.execCommand('copy'); }} catch(e) {{}}
-    doc.body.removeChild(ta);
-    showToast(ok);
+var ta = doc.createElement('textarea');
+ta.value = text;
+ta.style.cssText = 'position:fixed;top:-9999px;left:-9999px;opacity:0;';
+doc.body.appendChild(ta);
+ta.focus(); ta.select();
+var ok = false;
+try {{ ok = doc.execCommand('copy'); }} catch(e) {{}}
+doc.body.removeChild(ta);
+showToast(ok);
   }}
 
   function attachHandlers() {{
-    // ── Copy button ──────────────────────────────────────────────────
-    var copyBtn = doc.getElementById('ns-copy-btn');
-    if (copyBtn && !copyBtn.dataset.nsAttached) {{
-      copyBtn.dataset.nsAttached = '1';
-      copyBtn.addEventListener('click', function() {{
-        var text = copyBtn.getAttribute('data-payload');
-        if (window.parent.isSecureContext && navigator.clipboard && navigator.clipboard.writeText) {{
-          navigator.clipboard.writeText(text)
-            .then(function() {{ showToast(true); }})
-            .catch(function() {{ execCopy(text); }});
-        }} else {{
-          execCopy(text);
-        }}
-      }});
-    }}
-
-    // ── Export button ────────────────────────────────────────────────
-    var expBtn = doc.getElementById('ns-export-btn');
-    if (expBtn && !expBtn.dataset.nsAttached) {{
-      expBtn.dataset.nsAttached = '1';
-      expBtn.addEventListener('click', function(e) {{
-        e.preventDefault();
-        var text = expBtn.getAttribute('data-payload');
-        var blob = new Blob([text], {{type: 'text/plain'}});
-        var url  = URL.createObjectURL(blob);
-        var a    = doc.createElement('a');
-        a.href     = url;
-        a.download = 'NeuralSum_Report.txt';
-        doc.body.appendChild(a);
-        a.click();
-        doc.body.removeChild(a);
-        URL.revokeObjectURL(url);
-      }});
+// ── Copy button ──────────────────────────────────────────────────
+var copyBtn = doc.getElementById('ns-copy-btn');
+if (copyBtn && !copyBtn.dataset.nsAttached) {{
+  copyBtn.dataset.nsAttached = '1';
+  copyBtn.addEventListener('click', function() {{
+    var text = copyBtn.getAttribute('data-payload');
+    if (window.parent.isSecureContext && navigator.clipboard && navigator.clipboard.writeText) {{
+      navigator.clipboard.writeText(text)
+        .then(function() {{ showToast(true); }})
+        .catch(function() {{ execCopy(text); }});
+    }} else {{
+      execCopy(text);
     }}
+  }});
+}}
+
+// ── Export button ────────────────────────────────────────────────
+var expBtn = doc.getElementById('ns-export-btn');
+if (expBtn && !expBtn.dataset.nsAttached) {{
+  expBtn.dataset.nsAttached = '1';
+  expBtn.addEventListener('click', function(e) {{
+    e.preventDefault();
+    var text = expBtn.getAttribute('data-payload');
+    var blob = new Blob([text], {{type: 'text/plain'}});
+    var url  = URL.createObjectURL(blob);
+    var a    = doc.createElement('a');
+    a.href     = url;
+    a.download = 'NeuralSum_Report.txt';
+    doc.body.appendChild(a);
+    a.click();
+    doc.body.removeChild(a);
+    URL.revokeObjectURL(url);
+  }});
+}}
   }}
 
   // Attach immediately, then watch for DOM changes (Streamlit may re-render)
   attachHandlers();
   new MutationObserver(function() {{ attachHandlers(); }}).observe(
-    doc.body, {{ childList: true, subtree: true }}
+doc.body, {{ childList: true, subtree: true }}
   );
 }})();
 </script>
 """, height=0)
 
-            # ── ANALYTICS ──────────────────────────────────────────────────
-            with out_right:
-                # FUNCTIONAL FIX — word counter discrepancy:
-                # analytics "Original" used len(cleaned.split()) which differs
-                # from the badge showing len(user_text.split()).
-                # Unified to user_text so both displays show the same number.
-                orig_words = len(user_text.split())
-                sum_words  = len(summary.split())
-
-                if orig_words > 0:
-                    reduction = round(((orig_words - sum_words) / orig_words) * 100, 1)
-                else:
-                    reduction = 0.0
-
-                bar_pct     = max(0.0, min(reduction, 100.0))
-                display_pct = max(0.0, reduction)
-
-                compress_bg  = "rgba(255,255,255,0.03)" if is_dark else "rgba(79,70,229,0.04)"
-                compress_brd = "rgba(255,255,255,0.06)" if is_dark else "rgba(79,70,229,0.12)"
-                bar_track    = "rgba(255,255,255,0.07)" if is_dark else "rgba(79,70,229,0.10)"
-
-                st.markdown(sec_label("Analytics"), unsafe_allow_html=True)
-
-                m1, m2 = st.columns(2)
-                with m1: st.metric("Original", orig_words)
-                with m2: st.metric("Summary",  sum_words)
-
-                st.markdown(
-                    f'<div style="background:{compress_bg};border:1px solid {compress_brd};'
-                    'border-radius:12px;padding:16px 18px;margin-top:14px;">'
-                    f'<div style="font-size:0.68rem;color:{T["text_label"]};'
-                    "font-family:'DM Sans',sans-serif;text-transform:uppercase;"
-                    'letter-spacing:0.12em;margin-bottom:10px;font-weight:600;">Compression Ratio</div>'
-                    f'<div style="background:{bar_track};border-radius:100px;'
-                    'height:5px;width:100%;overflow:hidden;margin-bottom:10px;">'
-                    f'<div style="height:5px;border-radius:100px;width:{bar_pct}%;'
-                    f'background:linear-gradient(90deg,{T["accent"]},{T["accent_blue"]});"></div></div>'
-                    f'<div style="font-family:\'Syne\',sans-serif;font-size:1.8rem;font-weight:800;'
-                    f'color:{T["accent"]};letter-spacing:-1px;">{display_pct}%</div>'
-                    f'<div style="font-size:0.73rem;color:{T["compress_sub"]};'
-                    f"font-family:'DM Sans',sans-serif;margin-top:2px;"
-                    f'">{orig_words} &rarr; {sum_words} words</div>'
-                    '</div>'
-                    '<div style="margin-top:12px;display:inline-flex;align-items:center;gap:8px;'
-                    f'background:{T["engine_bg"]};border:1px solid {T["engine_border"]};'
-                    'border-radius:8px;padding:8px 14px;'
-                    f"font-family:'DM Sans',sans-serif;font-size:0.80rem;color:{T['text_muted']};"
-                    '">'
-                    f'<span style="width:6px;height:6px;background:{T["engine_dot"]};'
-                    f'border-radius:50%;box-shadow:0 0 6px {T["engine_dot"]};'
-                    'display:inline-block;flex-shrink:0;"></span>'
-                    '<span>Engine:</span>'
-                    # ISSUE minor — model_used_display uses spaced arrow "Auto → BART"
-                    f'<span style="font-family:\'Syne\',sans-serif;font-weight:700;'
-                    f'color:{T["engine_val"]};font-size:0.85rem;">{model_used_display}</span>'
-                    '</div>',
-                    unsafe_allow_html=True
+    # ── ANALYTICS ──────────────────────────────────────────────────
+    with out_right:
+        # FUNCTIONAL FIX — word counter discrepancy:
+        # analytics "Original" (orig_words) and the badge both read
+        # doc.word_count, so both displays always show the same number.
+        sum_words  = len(summary.split())
+
+        if orig_words > 0:
+            reduction = round(((orig_words - sum_words) / orig_words) * 100, 1)
+        else:
+            reduction = 0.0
+
+        bar_pct     = max(0.0, min(reduction, 100.0))
+        display_pct = max(0.0, reduction)
+
+        compress_bg  = "rgba(255,255,255,0.03)" if is_dark else "rgba(79,70,229,0.04)"
+        compress_brd = "rgba(255,255,255,0.06)" if is_dark else "rgba(79,70,229,0.12)"
+        bar_track    = "rgba(255,255,255,0.07)" if is_dark else "rgba(79,70,229,0.10)"
+
+        st.markdown(sec_label("Analytics"), unsafe_allow_html=True)
+
+        m1, m2 = st.columns(2)
+        with m1: st.metric("Original", orig_words)
+        with m2: st.metric("Summary",  sum_words)
+
+        st.markdown(
+            f'<div style="background:{compress_bg};border:1px solid {compress_brd};'
+            'border-radius:12px;padding:16px 18px;margin-top:14px;">'
+            f'<div style="font-size:0.68rem;color:{T["text_label"]};'
+            "font-family:'DM Sans',sans-serif;text-transform:uppercase;"
+            'letter-spacing:0.12em;margin-bottom:10px;font-weight:600;">Compression Ratio</div>'
+            f'<div style="background:{bar_track};border-radius:100px;'
+            'height:5px;width:100%;overflow:hidden;margin-bottom:10px;">'
+            f'<div style="height:5px;border-radius:100px;width:{bar_pct}%;'
+            f'background:linear-gradient(90deg,{T["accent"]},{T["accent_blue"]});"></div></div>'
+            f'<div style="font-family:\'Syne\',sans-serif;font-size:1.8rem;font-weight:800;'
+            f'color:{T["accent"]};letter-spacing:-1px;">{display_pct}%</div>'
+            f'<div style="font-size:0.73rem;color:{T["compress_sub"]};'
+            f"font-family:'DM Sans',sans-serif;margin-top:2px;"
+            f'">{orig_words} &rarr; {sum_words} words</div>'
+            '</div>'
+            '<div style="margin-top:12px;display:inline-flex;align-items:center;gap:8px;'
+            f'background:{T["engine_bg"]};border:1px solid {T["engine_border"]};'
+            'border-radius:8px;padding:8px 14px;'
+            f"font-family:'DM Sans',sans-serif;font-size:0.80rem;color:{T['text_muted']};"
+            '">'
+            f'<span style="width:6px;height:6px;background:{T["engine_dot"]};'
+            f'border-radius:50%;box-shadow:0 0 6px {T["engine_dot"]};'
+            'display:inline-block;flex-shrink:0;"></span>'
+            '<span>Engine:</span>'
+            # ISSUE minor — model_used_display uses spaced arrow "Auto → BART"
+            f'<span style="font-family:\'Syne\',sans-serif;font-weight:700;'
+            f'color:{T["engine_val"]};font-size:0.85rem;">{model_used_display}</span>'
+            '</div>',
+            unsafe_allow_html=True
+        )
+
+
+def render_documents(names, report):
+    """Per-document summaries and timings under a multi-document result."""
+    rows = [
+        {
+            "document": name,
+            "words":    d["words"],
+            "engine":   d["model_used"],
+            "seconds":  d["seconds"],
+            "cached":   d["cached"],
+            "summary":  d["summary"],
+            "notes":    describe_admission(d.get("reasons", ())),
+        }
+        for name, d in zip(names, report["documents"])
+    ]
+    label = (
+        f"{len(rows)} documents · {report['total_s']:.1f}s total "
+        f"({report['reduce_s']:.1f}s combining)"
+    )
+    with st.expander(label, expanded=False):
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+
+
+def render_details(summaries):
+    """Short / medium / long side by side under an All (Compare) result."""
+    st.markdown(sec_label("Detail Levels"), unsafe_allow_html=True)
+    for column, (detail, summary) in zip(st.columns(len(summaries)), summaries.items()):
+        with column:
+            footer = (
+                f'<div style="margin-top:12px;font-size:0.72rem;color:{T["text_muted"]};'
+                "font-family:'DM Sans',sans-serif;"
+                f'">{detail.title()} &middot; {len(summary.split())} words</div>'
+            )
+            st.markdown(result_card(_html.escape(summary), footer), unsafe_allow_html=True)
+
+
+def run_all_details(doc, model_choice):
+    """All (Compare): every detail level from one encoder pass; medium is the main card."""
+    loader_slot = st.empty()
+    loader_slot.markdown(LOADER_PHASE2, unsafe_allow_html=True)
+    try:
+        summaries, model_used_raw = summarize_all_details(doc, model_choice)
+    except PoolSaturated:
+        loader_slot.empty()
+        st.warning(
+            "⚠️  The summarizer is at capacity right now. "
+            "Please try again in a few seconds."
+        )
+        return
+    loader_slot.empty()
+
+    st.session_state.last_result    = (summaries["medium"], model_used_raw, doc.word_count)
+    st.session_state.last_documents = None
+    st.session_state.last_details   = summaries
+    render_result(*result_layout(), *st.session_state.last_result)
+    render_details(summaries)
+
+
+def run_file(upload):
+    """One uploaded file: read, cleaned and summarized as a stream — no length cap."""
+    detail, model_choice = current_settings()
+    detail = "medium" if detail == "all" else detail
+
+    loader_slot = st.empty()
+    loader_slot.markdown(LOADER_PHASE2, unsafe_allow_html=True)
+    try:
+        upload.seek(0)
+        summary, model_used_raw, meta = summarize_file(
+            upload, detail, model_choice, html=is_html(upload), return_meta=True
+        )
+    except PoolSaturated:
+        loader_slot.empty()
+        st.warning(
+            "⚠️  The summarizer is at capacity right now. "
+            "Please try again in a few seconds."
+        )
+        return
+    loader_slot.empty()
+
+    admission = meta.get("admission") or {}
+    if admission.get("verdict") == "reject":
+        st.warning(
+            f"⚠️  {upload.name} doesn't look like text to summarize — "
+            f"{describe_admission(admission['reasons'], admission['dropped'])}."
+        )
+        return
+    if admission.get("verdict") == "reduce":
+        st.caption(
+            "Dropped before summarizing: "
+            f"{describe_admission(admission['reasons'], admission['dropped'])}"
+        )
+
+    st.session_state.last_result    = (summary, model_used_raw, meta.get("words", 0))
+    st.session_state.last_documents = None
+    st.session_state.last_details   = None
+    render_result(*result_layout(), *st.session_state.last_result)
+
+
+def run_documents(documents):
+    """Multi-document run: parallel per-document summaries, one combined result."""
+    detail, model_choice = current_settings()
+    detail = "medium" if detail == "all" else detail
+    too_long = [name for name, text in documents if len(text) > 50_000]
+    if too_long:
+        st.warning(
+            f"⚠️  {', '.join(too_long)} {'is' if len(too_long) == 1 else 'are'} too long. "
+            "Please keep each document under 50,000 characters, or upload a long "
+            "one on its own (no length limit)."
+        )
+        return
+
+    loader_slot = st.empty()
+    loader_slot.markdown(LOADER_PHASE2, unsafe_allow_html=True)
+    try:
+        summary, model_used_raw, report = summarize_documents(
+            [text for _, text in documents], detail, model_choice
+        )
+    except PoolSaturated:
+        loader_slot.empty()
+        st.warning(
+            "⚠️  The summarizer is at capacity right now. "
+            "Please try again in a few seconds."
+        )
+        return
+    loader_slot.empty()
+
+    words = sum(d["words"] for d in report["documents"])
+    st.session_state.last_result    = (summary, model_used_raw, words)
+    st.session_state.last_documents = ([name for name, _ in documents], report)
+    st.session_state.last_details   = None
+    render_result(*result_layout(), *st.session_state.last_result)
+    render_documents(*st.session_state.last_documents)
+
+
+@st.fragment
+def result_panel():
+    if not st.session_state.pop("run_requested", False):
+        # a full rerun without a new request (e.g. the theme toggle)
+        # re-draws the last result instead of dropping it
+        if "last_result" in st.session_state:
+            render_result(*result_layout(), *st.session_state.last_result)
+            if st.session_state.get("last_documents"):
+                render_documents(*st.session_state.last_documents)
+            if st.session_state.get("last_details"):
+                render_details(st.session_state.last_details)
+        return
+
+    uploads = st.session_state.get("uploads") or []
+    pasted  = st.session_state.get("main_input", "").strip()
+    if len(uploads) == 1 and not pasted:
+        run_file(uploads[0])
+        return
+
+    documents = source_documents()
+    if len(documents) > 1:
+        run_documents(documents)
+        return
+
+    user_text = documents[0][1] if documents else ""
+    doc       = clean_document(user_text)
+    detail, model_choice = current_settings()
+    raw = (user_text or "").strip()
+
+    if not raw:
+        st.warning("⚠️  Please paste some text before running the analysis.")
+
+    elif doc.admission.verdict == "reject":
+        st.warning(
+            "⚠️  This doesn't look like text to summarize — "
+            f"{describe_admission(doc.admission.reasons, doc.admission.dropped)}. "
+            "Please paste prose such as an article, report or paper."
+        )
+
+    elif doc.word_count < 5:
+        st.warning(
+            "⚠️  No readable content remained after cleaning. "
+            "Please try different input text."
+        )
+
+    elif doc.word_count < 10:
+        st.warning(
+            "⚠️  Input is too short — please provide at least **10 words** "
+            "so the model has enough context to summarize."
+        )
+
+    elif len(raw) > 50_000:
+        st.warning(
+            f"⚠️  Input is too long ({len(raw):,} characters). "
+            "Please trim it to under 50,000 characters, or upload it as a file "
+            "(no length limit)."
+        )
+
+    elif detail == "all":
+        run_all_details(doc, model_choice)
+
+    else:
+        if doc.admission.verdict == "reduce":
+            st.caption(
+                "Dropped before summarizing: "
+                f"{describe_admission(doc.admission.reasons, doc.admission.dropped)}"
+            )
+        loader_slot = st.empty()
+        loader_slot.markdown(LOADER_PHASE2, unsafe_allow_html=True)
+
+        out_left, out_right, card_slot = result_layout()
+
+        # ── STREAMED GENERATION ─────────────────────────────────────────
+        # The loader stays up only until the first tokens arrive; after
+        # that every partial summary is re-rendered into the card.
+        # Generation runs on the shared worker pool — when every worker is
+        # busy and the queue is full we say so instead of piling on.
+        try:
+            for summary, model_used_raw in summarize_text_stream(
+                doc,
+                detail,
+                model_choice,
+                chunk_store=current_chunk_store(),
+            ):
+                loader_slot.empty()
+                card_slot.markdown(
+                    result_card(summary + _STREAM_CARET), unsafe_allow_html=True
                 )
+        except PoolSaturated:
+            loader_slot.empty()
+            card_slot.empty()
+            st.warning(
+                "⚠️  The summarizer is at capacity right now. "
+                "Please try again in a few seconds."
+            )
+            return
+
+        loader_slot.empty()
+
+        st.session_state.last_result    = (summary, model_used_raw, doc.word_count)
+        st.session_state.last_documents = None
+        st.session_state.last_details   = None
+        render_result(out_left, out_right, card_slot, *st.session_state.last_result)
+
+
+result_panel()
+
+# ---------------------------------------------------
+# 10b. DIAGNOSTICS (NEURALSUM_DIAGNOSTICS=1)
+# ---------------------------------------------------
+# Where the time goes: per-stage timings plus the raw metrics page.  In
+# client mode the numbers come from server.py, which does the inference.
+if config.DIAGNOSTICS:
+    st.markdown("<br>", unsafe_allow_html=True)
+    with st.expander("Diagnostics", expanded=False):
+        if not config.SERVER_URL:
+            import metrics
+            st.dataframe(metrics.timing_table(), use_container_width=True, hide_index=True)
+        try:
+            st.code(metrics_text(), language="text")
+        except OSError as exc:
+            st.warning(f"Metrics unavailable: {exc}")
 
 # ---------------------------------------------------
 # 11. FOOTER
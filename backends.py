@@ -0,0 +1,286 @@
+# ─────────────────────────────────────────────────────────────────────────────
+#  INFERENCE BACKENDS
+#
+#  A backend owns one seq2seq model + tokenizer and exposes the three steps
+#  summarizer.py needs:  tokenize → generate → decode.  summarize_lengths()
+#  decodes one input at several length budgets; the transformers backend
+#  runs its encoder once for all of them.
+#
+#  "transformers" — PyTorch weights through AutoModelForSeq2SeqLM (default).
+#  "onnx"         — exported encoder / decoder / decoder-with-past graphs
+#                   under ONNX Runtime.  The with-past decoder reuses the
+#                   key/value cache between steps, so each new token only
+#                   runs attention for that token.
+#
+#  Selected with NEURALSUM_BACKEND; app.py never needs to know which one
+#  is active.
+#
+#  Load modes (transformers backend, NEURALSUM_LOAD_MODE):
+#  "default" — from_pretrained(); every process holds a private copy of
+#              the weights.
+#  "mmap"    — the model is built on the meta device and its parameters
+#              alias a private (copy-on-write) mapping of the checkpoint
+#              file.  Weight pages live in the page cache: they are read on
+#              first touch, shared by every process mapping the same file
+#              and by forked workers, and never copied unless written.
+# ─────────────────────────────────────────────────────────────────────────────
+
+import json
+import mmap
+import os
+import struct
+import threading
+
+from metrics import STAGE_SECONDS
+
+# Fast (Rust) tokenizers raise "Already borrowed" when two threads call them
+# with different padding/truncation settings at once.  Tokenizing is cheap
+# next to generation, so one process-wide lock serializes it.
+TOKENIZER_LOCK = threading.RLock()
+
+
+class InferenceBackend:
+    name = "base"
+
+    def __init__(self, model, tokenizer):
+        self.model     = model
+        self.tokenizer = tokenizer
+        _apply_task_params(model)
+
+    # ── steps ────────────────────────────────────────────────────────────────
+    def tokenize(self, texts, truncation: bool = True):
+        with TOKENIZER_LOCK, STAGE_SECONDS.time(stage="tokenize"):
+            return self.tokenizer(
+                list(texts),
+                return_tensors="pt",
+                padding=True,
+                truncation=truncation,
+            )
+
+    def generate(self, encoded, **kwargs):
+        with STAGE_SECONDS.time(stage="generate"):
+            return self.model.generate(**encoded, **kwargs)
+
+    def decode(self, output_ids):
+        with TOKENIZER_LOCK, STAGE_SECONDS.time(stage="decode"):
+            return self.tokenizer.batch_decode(
+                output_ids,
+                skip_special_tokens=True,
+                clean_up_tokenization_spaces=False,
+            )
+
+    # ── composed ─────────────────────────────────────────────────────────────
+    def summarize(self, texts, batch_size: int = 1, truncation: bool = True, **kwargs):
+        """Run tokenize → generate → decode over `texts` in padded batches."""
+        texts   = list(texts)
+        outputs = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenize(texts[start:start + batch_size], truncation)
+            outputs.extend(self.decode(self.generate(encoded, **kwargs)))
+        return outputs
+
+    def summarize_lengths(self, text: str, budgets, truncation: bool = True, **kwargs):
+        """
+        Summaries of one input, one per (max_length, min_length) in
+        `budgets`.  Generic version: a full tokenize → generate → decode
+        pass per budget.
+        """
+        encoded = self.tokenize([text], truncation)
+        return [
+            self.decode(self.generate(
+                encoded, max_length=max_len, min_length=min_len, **kwargs
+            ))[0]
+            for max_len, min_len in budgets
+        ]
+
+
+def _apply_task_params(model):
+    """
+    Copy the checkpoint's "summarization" task parameters (beam count,
+    length penalty, ...) into its generation config — the step
+    pipeline("summarization") used to do for us.
+    """
+    params = (getattr(model.config, "task_specific_params", None) or {}).get(
+        "summarization", {}
+    )
+    generation_config = getattr(model, "generation_config", None)
+    if generation_config is None:
+        return
+    for key, value in params.items():
+        if key != "prefix" and hasattr(generation_config, key):
+            setattr(generation_config, key, value)
+
+
+LOAD_MODES = ("default", "mmap")
+
+# safetensors dtype tags → torch dtype names
+_SAFETENSORS_DTYPES = {
+    "F64": "float64", "F32": "float32", "F16": "float16", "BF16": "bfloat16",
+    "I64": "int64", "I32": "int32", "I16": "int16", "I8": "int8",
+    "U8": "uint8", "BOOL": "bool",
+}
+
+
+def _mmap_safetensors(path: str) -> dict:
+    """
+    Tensors of a .safetensors file as views of one private file mapping.
+    Nothing is read until a page is touched, and untouched / unwritten
+    pages stay shared with the page cache.
+    """
+    import torch
+
+    with open(path, "rb") as f:
+        header_len = struct.unpack("<Q", f.read(8))[0]
+        header     = json.loads(f.read(header_len))
+        mapping    = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    base    = 8 + header_len
+    tensors = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype      = getattr(torch, _SAFETENSORS_DTYPES[info["dtype"]])
+        start, end = info["data_offsets"]
+        count      = (end - start) // torch.empty(0, dtype=dtype).element_size()
+        tensors[name] = torch.frombuffer(
+            mapping, dtype=dtype, count=count, offset=base + start
+        ).reshape(info["shape"])
+    return tensors
+
+
+def _mmap_state_dict(model_id: str):
+    """Memory-mapped state dict of `model_id`, or None without a single-file checkpoint."""
+    import torch
+    from transformers.utils import cached_file
+
+    path = cached_file(model_id, "model.safetensors",
+                       _raise_exceptions_for_missing_entries=False)
+    if path:
+        return _mmap_safetensors(path)
+
+    path = cached_file(model_id, "pytorch_model.bin",
+                       _raise_exceptions_for_missing_entries=False)
+    if path:                                     # zip checkpoints map too (torch ≥ 2.1)
+        return torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    return None
+
+
+def _load_mmap(model_id: str):
+    """
+    Build the model on the meta device (no weight allocation at all), then
+    assign the memory-mapped checkpoint tensors as its parameters.  Falls
+    back to from_pretrained(low_cpu_mem_usage=True) for sharded checkpoints
+    or architectures that leave tensors unassigned.
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSeq2SeqLM, GenerationConfig
+
+    state_dict = _mmap_state_dict(model_id)
+    if state_dict is not None:
+        with torch.device("meta"):
+            model = AutoModelForSeq2SeqLM.from_config(AutoConfig.from_pretrained(model_id))
+        model.load_state_dict(state_dict, strict=False, assign=True)
+        model.tie_weights()
+        unassigned = [
+            n for n, t in list(model.named_parameters()) + list(model.named_buffers())
+            if t.is_meta
+        ]
+        if not unassigned:
+            try:
+                model.generation_config = GenerationConfig.from_pretrained(model_id)
+            except OSError:
+                model.generation_config = GenerationConfig.from_model_config(model.config)
+            return model
+
+    return AutoModelForSeq2SeqLM.from_pretrained(model_id, low_cpu_mem_usage=True)
+
+
+class TransformersBackend(InferenceBackend):
+    name = "transformers"
+
+    @classmethod
+    def load(cls, model_id: str, load_mode: str = "default"):
+        from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+        if load_mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode {load_mode!r}; expected one of {LOAD_MODES}")
+        if load_mode == "mmap":
+            model = _load_mmap(model_id)
+        else:
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_id)
+        model.eval()
+        return cls(model, AutoTokenizer.from_pretrained(model_id))
+
+    def encode(self, encoded):
+        """Encoder forward pass only — reusable by any number of decodes."""
+        import torch
+        with STAGE_SECONDS.time(stage="encode"), torch.inference_mode():
+            return self.model.get_encoder()(
+                input_ids=encoded["input_ids"],
+                attention_mask=encoded["attention_mask"],
+                return_dict=True,
+            )
+
+    def summarize_lengths(self, text: str, budgets, truncation: bool = True, **kwargs):
+        """
+        Tokenize and encode once, then decode once per budget: generate()
+        skips its own encoder pass when handed encoder_outputs, so each
+        extra length costs only the decoder.
+        """
+        encoded         = self.tokenize([text], truncation)
+        encoder_outputs = self.encode(encoded)
+        outputs = []
+        for max_len, min_len in budgets:
+            # generate() expands encoder outputs for beam search in place,
+            # so every call gets its own container around the same tensors
+            shared = type(encoder_outputs)(**encoder_outputs)
+            outputs.append(self.decode(self.generate(
+                encoded, encoder_outputs=shared,
+                max_length=max_len, min_length=min_len, **kwargs,
+            ))[0])
+        return outputs
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    name = "onnx"
+
+    @classmethod
+    def load(cls, model_id: str, export_dir: str = None):
+        """
+        Load exported graphs from `export_dir`/<model name> if present;
+        otherwise export from the PyTorch checkpoint (slow, once) and save
+        them there for the next start.
+        """
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as exc:
+            raise ImportError(
+                "The onnx backend needs `pip install optimum[onnxruntime]`."
+            ) from exc
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(model_id)
+        local     = os.path.join(export_dir, model_id.replace("/", "--")) if export_dir else None
+
+        if local and os.path.isdir(local):
+            model = ORTModelForSeq2SeqLM.from_pretrained(local, use_cache=True)
+        else:
+            model = ORTModelForSeq2SeqLM.from_pretrained(model_id, export=True, use_cache=True)
+            if local:
+                model.save_pretrained(local)
+                tokenizer.save_pretrained(local)
+
+        return cls(model, tokenizer)
+
+
+BACKENDS = {
+    TransformersBackend.name: TransformersBackend,
+    OnnxRuntimeBackend.name:  OnnxRuntimeBackend,
+}
+
+
+def load_backend(name: str, model_id: str, **options) -> InferenceBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend {name!r}; expected one of {sorted(BACKENDS)}")
+    if name == OnnxRuntimeBackend.name:
+        return OnnxRuntimeBackend.load(model_id, export_dir=options.get("export_dir"))
+    return BACKENDS[name].load(model_id, load_mode=options.get("load_mode", "default"))
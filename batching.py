@@ -0,0 +1,108 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from workers import PoolSaturated
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  DYNAMIC MICRO-BATCHING
+#
+#  A request-per-inference API runs every forward pass with a batch of one.
+#  The batcher instead holds the first request of a window for up to
+#  window_ms (or until max_batch requests are waiting), groups what arrived
+#  by request settings, and hands each group to summarize_batch() — which
+#  splits it further by resolved model and token length — as one pool job.
+#  The added latency is bounded by window_ms.
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class _Pending:
+    __slots__ = ("text", "key", "future", "enqueued")
+
+    def __init__(self, text, key):
+        self.text     = text
+        self.key      = key                      # (detail, model, long_document)
+        self.future   = Future()
+        self.enqueued = time.perf_counter()
+
+
+class MicroBatcher:
+    def __init__(self, pool, window_ms: float = 10, max_batch: int = 8):
+        self.pool      = pool
+        self.window    = window_ms / 1000
+        self.max_batch = max(1, max_batch)
+        self._queue    = queue.Queue()
+        self._thread   = threading.Thread(target=self._loop, name="neuralsum-batcher", daemon=True)
+        self._thread.start()
+
+    # ── public ───────────────────────────────────────────────────────────────
+    def submit(self, text, detail: str = "medium", model: str = "auto",
+               long_document: bool = True) -> Future:
+        """
+        Queue one request; the Future resolves to a dict with summary,
+        model_used and timing (queue_ms, batch_ms, total_ms, batch_size),
+        or raises PoolSaturated when the pool cannot take the batch.
+        """
+        pending = _Pending(text, (detail, model, long_document))
+        self._queue.put(pending)
+        return pending.future
+
+    # ── collector ────────────────────────────────────────────────────────────
+    def _loop(self):
+        while True:
+            batch    = [self._queue.get()]
+            deadline = batch[0].enqueued + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        groups = {}
+        for pending in batch:
+            groups.setdefault(pending.key, []).append(pending)
+
+        for key, group in groups.items():
+            try:
+                self.pool.submit(self._run, key, group)
+            except PoolSaturated as exc:
+                for pending in group:
+                    pending.future.set_exception(exc)
+
+    # ── worker side ──────────────────────────────────────────────────────────
+    @staticmethod
+    def _run(key, group):
+        from summarizer import summarize_batch
+
+        detail, model, long_document = key
+        timing = {}
+        start  = time.perf_counter()
+        try:
+            results = summarize_batch(
+                [p.text for p in group], detail, model,
+                batch_size=len(group), long_document=long_document, timing=timing,
+            )
+        except Exception as exc:
+            for pending in group:
+                pending.future.set_exception(exc)
+            return
+
+        end = time.perf_counter()
+        for pending, (summary, model_used), size in zip(group, results, timing["batch_sizes"]):
+            pending.future.set_result({
+                "summary":    summary,
+                "model_used": model_used,
+                "timing": {
+                    "queue_ms":   round((start - pending.enqueued) * 1000, 2),
+                    "batch_ms":   round((end - start) * 1000, 2),
+                    "total_ms":   round((end - pending.enqueued) * 1000, 2),
+                    "batch_size": size,      # rows in its forward pass, 0 = no model
+                },
+            })
@@ -0,0 +1,5 @@
+"""
+Offline measurement scripts.  Run from the repository root, e.g.
+
+    python -m benchmarks.precision
+"""
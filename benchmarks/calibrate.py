@@ -0,0 +1,79 @@
+"""
+Fit the latency router to this host.
+
+Times every (engine, beam / greedy, detail) combination over the fixture
+corpus plus synthetic documents of several sizes and stores the runs in
+the cost-model file the router predicts from:
+
+    python -m benchmarks.calibrate --out cost_model.json
+    NEURALSUM_COST_MODEL=cost_model.json streamlit run app.py
+
+Runs are appended to an existing file; the model keeps the newest samples.
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.common import load_corpus
+from benchmarks.suite import BUCKETS, DETAILS, synthetic_documents
+
+ENGINES = ("t5", "bart")
+
+
+def calibrate(path: str, engines=ENGINES, details=DETAILS, repeat: int = 2) -> dict:
+    # Recorded runs must reach the model, and land in `path`.
+    os.environ["NEURALSUM_CACHE_SIZE"]  = "0"
+    os.environ["NEURALSUM_COST_MODEL"] = path
+    os.environ.pop("NEURALSUM_CACHE_DIR", None)
+    import summarizer
+
+    corpus = load_corpus()
+    docs   = list(dict(corpus, **synthetic_documents(corpus, BUCKETS)).values())
+    model  = summarizer.COST_MODEL
+
+    for engine in engines:
+        backend   = summarizer._load(engine)
+        prefix    = summarizer._PREFIXES[engine]
+        tokenizer = backend.tokenizer
+        summarizer._generate(backend, prefix + docs[0], 20, 10)    # first call pays set-up
+
+        for text in docs:
+            text   = summarizer.clean_document(text).text
+            tokens = summarizer._count_tokens(tokenizer, text)
+            for detail in details:
+                max_len, min_len = summarizer._length_budget(tokens, detail)
+                for greedy in (False, True):
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        summarizer._summarize_long(
+                            backend, text, prefix, max_len, min_len,
+                            summarizer._BATCH_SIZE, greedy=greedy,
+                        )
+                        model.record(
+                            engine, greedy, tokens, max_len, time.perf_counter() - start
+                        )
+            print(f"{engine}: {tokens:>5} tokens done", flush=True)
+
+    model.save()
+    return model.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--out",     default="cost_model.json", help="cost-model file")
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument("--repeat",  type=int, default=2)
+    args = parser.parse_args()
+
+    stats = calibrate(
+        args.out,
+        engines=[e.strip() for e in args.engines.split(",") if e.strip()],
+        repeat=args.repeat,
+    )
+    for key, count in stats.items():
+        print(f"{key:<14} {count} samples")
+
+
+if __name__ == "__main__":
+    main()
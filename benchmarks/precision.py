@@ -0,0 +1,123 @@
+"""
+Compare fp32 / int8 / bf16 inference on the fixture corpus.
+
+Each precision runs in its own subprocess so load time and peak RSS are not
+polluted by the other modes.  Output drift is measured against the fp32
+summaries with a word-level similarity ratio (1.0 = identical).
+
+    python -m benchmarks.precision --model bart --repeat 3 --out precision.json
+"""
+
+import argparse
+import difflib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import load_corpus, peak_rss_mb, percentile
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  WORKER — one precision, one process
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _run_worker(args) -> dict:
+    import summarizer
+
+    corpus = load_corpus()
+
+    engines = ["t5", "bart"] if args.model == "auto" else [args.model]
+    load_s  = {}
+    for engine in engines:
+        start = time.perf_counter()
+        summarizer._load(engine)
+        load_s[engine] = time.perf_counter() - start
+
+    latencies, summaries, precision = [], {}, None
+    for name, text in corpus.items():
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            summary, _, meta = summarizer.summarize_text(
+                text, args.detail, args.model, return_meta=True
+            )
+            latencies.append(time.perf_counter() - start)
+        summaries[name] = summary
+        precision       = meta["precision"] or precision
+
+    return {
+        "requested":   args.precision,
+        "precision":   precision,
+        "load_s":      load_s,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_avg": statistics.fmean(latencies),
+        "peak_rss_mb": peak_rss_mb(),
+        "summaries":   summaries,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  DRIVER
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _spawn(precision: str, args) -> dict:
+    env = dict(os.environ, NEURALSUM_PRECISION=precision, NEURALSUM_CACHE_SIZE="0")
+    env.pop("NEURALSUM_CACHE_DIR", None)         # every run must hit the model
+    cmd = [
+        sys.executable, "-m", "benchmarks.precision", "--worker",
+        "--precision", precision, "--model", args.model,
+        "--detail", args.detail, "--repeat", str(args.repeat),
+    ]
+    out = subprocess.run(cmd, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, a.split(), b.split()).ratio()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--precisions", default="fp32,int8,bf16")
+    parser.add_argument("--model",  default="bart", choices=["auto", "t5", "bart"])
+    parser.add_argument("--detail", default="medium", choices=["short", "medium", "long"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out",    default=None, help="write the JSON report here")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--precision", default="fp32", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(_run_worker(args)))
+        return
+
+    runs = {p: _spawn(p, args) for p in args.precisions.split(",")}
+
+    baseline = runs.get("fp32")
+    for run in runs.values():
+        if baseline is None:
+            break
+        scores = [
+            _similarity(baseline["summaries"][name], summary)
+            for name, summary in run["summaries"].items()
+        ]
+        run["drift_similarity"] = statistics.fmean(scores)
+        run["exact_match_rate"] = sum(s == 1.0 for s in scores) / len(scores)
+
+    print(f"{'mode':<6} {'in effect':<10} {'p50 s':>7} {'p95 s':>7} "
+          f"{'peak MB':>8} {'similarity':>10}")
+    for name, run in runs.items():
+        print(f"{name:<6} {run['precision']:<10} {run['latency_p50']:>7.2f} "
+              f"{run['latency_p95']:>7.2f} {run['peak_rss_mb']:>8.0f} "
+              f"{run.get('drift_similarity', float('nan')):>10.3f}")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"model": args.model, "detail": args.detail, "runs": runs}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
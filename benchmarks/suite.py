@@ -0,0 +1,201 @@
+"""
+Latency / throughput / memory benchmark for summarize_text().
+
+Runs every (model, detail, input-size bucket) combination over the fixture
+corpus plus synthetic documents, and writes a JSON report that can be
+diffed between runs:
+
+    python -m benchmarks.suite --repeat 5 --out bench.json
+    python -m benchmarks.suite --baseline bench.json     # print p50 deltas
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+
+from benchmarks.common import current_rss_mb, load_corpus, peak_rss_mb, percentile
+
+MODELS  = ("t5", "bart", "auto")
+DETAILS = ("short", "medium", "long")
+BUCKETS = (60, 150, 400, 1000, 3000)             # target words per document
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  CORPUS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def synthetic_documents(corpus: dict, buckets=BUCKETS, seed: int = 13) -> dict:
+    """
+    One document per bucket, built by sampling fixture sentences with a fixed
+    seed, so sizes and content are identical from run to run.
+    """
+    rng       = random.Random(seed)
+    sentences = [
+        s.strip() + "."
+        for text in corpus.values()
+        for s in text.split(".")
+        if len(s.split()) > 3
+    ]
+    docs = {}
+    for target in buckets:
+        picked, words = [], 0
+        while True:                              # fill up to, never past, the bucket
+            sentence = rng.choice(sentences)
+            if picked and words + len(sentence.split()) > target:
+                break
+            picked.append(sentence)
+            words += len(sentence.split())
+        docs[f"synthetic_{target}"] = " ".join(picked)
+    return docs
+
+
+def bucket_of(words: int, buckets=BUCKETS) -> int:
+    """Smallest bucket that holds `words`; the largest bucket otherwise."""
+    for b in buckets:
+        if words <= b:
+            return b
+    return buckets[-1]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  RUN
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run(models=MODELS, details=DETAILS, repeat: int = 3) -> dict:
+    # Every timed call must reach the model — switch the summary cache off
+    # before summarizer reads its configuration.
+    os.environ["NEURALSUM_CACHE_SIZE"] = "0"
+    os.environ.pop("NEURALSUM_CACHE_DIR", None)
+    import config
+    import summarizer
+
+    corpus = load_corpus()
+    docs   = dict(corpus, **synthetic_documents(corpus))
+
+    # ── cold load, once per engine ───────────────────────────────────────────
+    engines = sorted({"t5", "bart"} if "auto" in models else set(models))
+    load    = {}
+    for engine in engines:
+        before = current_rss_mb()
+        start  = time.perf_counter()
+        summarizer._load(engine)
+        load[engine] = {
+            "seconds":     round(time.perf_counter() - start, 4),
+            "rss_added_mb": round(current_rss_mb() - before, 1),
+        }
+
+    # ── timed combinations ───────────────────────────────────────────────────
+    results = []
+    for model in models:
+        for detail in details:
+            samples = {}                         # bucket → [(seconds, out_tokens)]
+            for text in docs.values():
+                bucket = bucket_of(len(text.split()))
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    summary, _, meta = summarizer.summarize_text(
+                        text, detail, model, return_meta=True
+                    )
+                    elapsed = time.perf_counter() - start
+                    tokens  = 0
+                    if meta["engine"]:
+                        tokenizer = summarizer._load(meta["engine"]).tokenizer
+                        tokens    = len(tokenizer(summary)["input_ids"])
+                    samples.setdefault(bucket, []).append((elapsed, tokens))
+
+            for bucket in sorted(samples):
+                seconds = [s for s, _ in samples[bucket]]
+                tokens  = sum(t for _, t in samples[bucket])
+                results.append({
+                    "model":          model,
+                    "detail":         detail,
+                    "bucket_words":   bucket,
+                    "runs":           len(seconds),
+                    "p50_s":          round(percentile(seconds, 50), 4),
+                    "p95_s":          round(percentile(seconds, 95), 4),
+                    "p99_s":          round(percentile(seconds, 99), 4),
+                    "tokens_per_sec": round(tokens / sum(seconds), 2) if sum(seconds) else 0.0,
+                    "rss_mb":         round(current_rss_mb(), 1),
+                    "peak_rss_mb":    round(peak_rss_mb(), 1),
+                })
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit":    _git_commit(),
+            "python":    platform.python_version(),
+            "platform":  platform.platform(),
+            "cpus":      os.cpu_count(),
+            "backend":   config.BACKEND,
+            "precision": config.PRECISION,
+            "repeat":    repeat,
+        },
+        "load":    load,
+        "results": results,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  REPORT
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _key(row: dict):
+    return row["model"], row["detail"], row["bucket_words"]
+
+
+def print_report(report: dict, baseline: dict = None):
+    previous = {_key(r): r for r in (baseline or {}).get("results", [])}
+
+    for engine, info in report["load"].items():
+        print(f"load {engine:<5} {info['seconds']:>7.2f} s   +{info['rss_added_mb']:.0f} MB")
+    print()
+    print(f"{'model':<5} {'detail':<7} {'words':>6} {'p50 s':>7} {'p95 s':>7} "
+          f"{'p99 s':>7} {'tok/s':>7} {'peak MB':>8}  {'Δp50':>7}")
+    for row in report["results"]:
+        delta = ""
+        if _key(row) in previous and previous[_key(row)]["p50_s"]:
+            change = row["p50_s"] / previous[_key(row)]["p50_s"] - 1
+            delta  = f"{change:+.1%}"
+        print(f"{row['model']:<5} {row['detail']:<7} {row['bucket_words']:>6} "
+              f"{row['p50_s']:>7.3f} {row['p95_s']:>7.3f} {row['p99_s']:>7.3f} "
+              f"{row['tokens_per_sec']:>7.1f} {row['peak_rss_mb']:>8.0f}  {delta:>7}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--models",   default=",".join(MODELS))
+    parser.add_argument("--details",  default=",".join(DETAILS))
+    parser.add_argument("--repeat",   type=int, default=3)
+    parser.add_argument("--out",      default=None, help="write the JSON report here")
+    parser.add_argument("--baseline", default=None, help="earlier report to compare against")
+    args = parser.parse_args(argv)
+
+    report = run(args.models.split(","), args.details.split(","), args.repeat)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Headless bulk summarization.
+
+Streams documents from a directory of .txt/.md files, a JSONL file, or
+JSONL on stdin, and appends one JSON line per document to the output as
+soon as it is done.  Completed IDs go to a checkpoint file, so an
+interrupted job resumes where it stopped:
+
+    python cli.py --input reports/ --output summaries.jsonl --jobs 2
+    cat docs.jsonl | python cli.py --input - --output out.jsonl --detail short
+
+Output records
+--------------
+{"id", "status": "ok" | "rejected" | "error", "summary", "model_used",
+ "words", "clean_ms", "infer_ms", "batch_size"}
+infer_ms is the batch wall time divided by the documents in the batch;
+batch_size is the size of the forward pass that generated the summary
+(0 when it came from the cache).
+Rejected records have no timings past clean_ms; their "reasons" list the
+admission reason codes (text_cleaner.REASONS) they were refused for.
+A JSONL line that is not a JSON object with a string text field becomes an
+error record with its line number as id; the job continues.  Such lines are
+checkpointed (they cannot succeed on a re-run); documents whose batch failed
+are not, so a resumed job retries them.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from text_cleaner import clean_document
+from workers import InferencePool
+
+_TEXT_SUFFIXES = (".txt", ".md")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  READERS — generators, so nothing is held beyond the current batch
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _read_directory(root: str):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.endswith(_TEXT_SUFFIXES):
+                path = os.path.join(dirpath, name)
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    yield os.path.relpath(path, root), f.read(), None
+
+
+def _read_jsonl(stream, id_field: str, text_field: str):
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            doc_id = str(record.get(id_field, line_no))
+            text   = record.get(text_field) or ""
+            if not isinstance(text, str):
+                raise TypeError(f"{text_field!r} is {type(text).__name__}, not str")
+        except (ValueError, AttributeError, TypeError) as exc:
+            yield str(line_no), None, repr(exc)
+            continue
+        yield doc_id, text, None
+
+
+def read_documents(source: str, id_field: str = "id", text_field: str = "text"):
+    """
+    Yield (doc_id, raw_text, error) from a directory, a .jsonl file, or '-'
+    (stdin).  error is None, or — for a JSONL line that could not be read —
+    the reason, with the line number as doc_id and raw_text None.
+    """
+    if source == "-":
+        yield from _read_jsonl(sys.stdin, id_field, text_field)
+    elif os.path.isdir(source):
+        yield from _read_directory(source)
+    else:
+        with open(source, encoding="utf-8") as f:
+            yield from _read_jsonl(f, id_field, text_field)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  CHECKPOINT
+# ─────────────────────────────────────────────────────────────────────────────
+
+def load_checkpoint(path: str) -> set:
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  JOB
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _summarize_batch_job(batch, detail: str, model: str, batch_size: int):
+    from summarizer import summarize_batch
+
+    timing  = {}
+    start   = time.perf_counter()
+    results = summarize_batch([doc for _, doc, _ in batch], detail, model, batch_size,
+                              timing=timing)
+    per_doc = (time.perf_counter() - start) * 1000 / len(batch)
+    return [
+        {
+            "id":         doc_id,
+            "status":     "ok",
+            "summary":    summary,
+            "model_used": model_used,
+            "words":      doc.word_count,
+            "clean_ms":   round(clean_ms, 3),
+            "infer_ms":   round(per_doc, 1),
+            "batch_size": size,
+        }
+        for (doc_id, doc, clean_ms), (summary, model_used), size
+        in zip(batch, results, timing["batch_sizes"])
+    ]
+
+
+def run(args) -> dict:
+    checkpoint = args.checkpoint or args.output + ".done"
+    done       = load_checkpoint(checkpoint)
+    counts     = {"ok": 0, "rejected": 0, "error": 0, "skipped": 0}
+    pool       = InferencePool(workers=args.jobs, max_pending=args.jobs)
+
+    with open(args.output, "a", encoding="utf-8") as out, \
+         open(checkpoint, "a", encoding="utf-8") as ckpt:
+
+        def write(records, completed: bool = True):
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                counts[record["status"]] += 1
+            out.flush()
+            if completed:                        # failed batches stay out → retried on resume
+                for record in records:
+                    ckpt.write(record["id"] + "\n")
+                ckpt.flush()
+
+        pending = {}                             # future → batch
+
+        def collect(block: bool):
+            if not pending:
+                return
+            finished, _ = wait(list(pending), timeout=None if block else 0,
+                               return_when=FIRST_COMPLETED)
+            for future in finished:
+                batch = pending.pop(future)
+                try:
+                    write(future.result())
+                except Exception as exc:
+                    write([
+                        {"id": doc_id, "status": "error", "error": repr(exc)}
+                        for doc_id, _, _ in batch
+                    ], completed=False)
+
+        def submit(batch):
+            future = pool.submit(                # blocks while the pool is full
+                _summarize_batch_job, batch, args.detail, args.model, args.batch_size,
+                timeout=None,
+            )
+            pending[future] = batch
+            collect(block=False)
+
+        batch = []
+        for doc_id, raw, error in read_documents(args.input, args.id_field, args.text_field):
+            if doc_id in done:
+                counts["skipped"] += 1
+                continue
+            if error is not None:
+                write([{"id": doc_id, "status": "error", "error": error}])
+                continue
+
+            start    = time.perf_counter()
+            doc      = clean_document(raw)
+            clean_ms = (time.perf_counter() - start) * 1000
+
+            if doc.is_garbage:
+                write([{
+                    "id": doc_id, "status": "rejected", "summary": None,
+                    "model_used": "none", "words": doc.word_count,
+                    "reasons": list(doc.admission.reasons),
+                    "clean_ms": round(clean_ms, 3),
+                }])
+                continue
+
+            batch.append((doc_id, doc, clean_ms))
+            if len(batch) >= args.batch_size:
+                submit(batch)
+                batch = []
+
+        if batch:
+            submit(batch)
+        while pending:
+            collect(block=True)
+
+    pool.shutdown()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--input",      required=True, help="directory, .jsonl file, or '-' for stdin")
+    parser.add_argument("--output",     required=True, help="JSONL file to append results to")
+    parser.add_argument("--checkpoint", default=None,  help="completed-ID file (default: <output>.done)")
+    parser.add_argument("--detail",     default="medium", choices=["short", "medium", "long"])
+    parser.add_argument("--model",      default="auto", choices=["auto", "t5", "bart", "instant"])
+    parser.add_argument("--jobs",       type=int, default=1, help="batches summarized in parallel")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--id-field",   default="id")
+    parser.add_argument("--text-field", default="text")
+    args = parser.parse_args(argv)
+
+    start  = time.perf_counter()
+    counts = run(args)
+    print(
+        f"done in {time.perf_counter() - start:.1f}s — "
+        + ", ".join(f"{k}: {v}" for k, v in counts.items()),
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
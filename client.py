@@ -0,0 +1,157 @@
+import json
+import os
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from workers import PoolSaturated
+
+_HINT_TIMEOUT_S       = 5       # /predict and /health: hints must never stall the UI
+_OFFLINE_T5_MAX_WORDS = 120     # Auto's old word rule, used while the server is unreachable
+
+
+class RemoteSummarizer:
+    """
+    Client for server.py with the same call shapes as summarizer.py, so
+    app.py can swap between in-process and remote inference.
+    """
+
+    def __init__(self, url: str, timeout: float = 300):
+        self.url     = url.rstrip("/")
+        self.timeout = timeout
+
+    @staticmethod
+    def _session(chunk_store) -> dict:
+        # the server keeps the chunk store; here chunk_store is its session id
+        return {} if chunk_store is None else {"session": chunk_store}
+
+    # ── helpers ──────────────────────────────────────────────────────────────
+    def _post(self, path: str, text, detail: str, model: str, long_document: bool = True,
+              timeout: float = None, **extra):
+        if text is not None:
+            extra["text"] = getattr(text, "text", text)    # CleanedDocument → its text
+        body = json.dumps(dict(
+            extra, detail=detail, model=model, long_document=long_document,
+        )).encode("utf-8")
+        request = urllib.request.Request(
+            self.url + path, data=body, headers={"Content-Type": "application/json"}
+        )
+        try:
+            return urllib.request.urlopen(request, timeout=timeout or self.timeout)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 503:
+                raise PoolSaturated("inference server is at capacity") from exc
+            raise
+
+    # ── API ──────────────────────────────────────────────────────────────────
+    def summarize_text(self, text, detail="medium", model="auto",
+                       long_document=True, return_meta=False, latency_budget=None,
+                       chunk_store=None):
+        extra = self._session(chunk_store)
+        if latency_budget is not None:
+            extra["latency_budget"] = latency_budget
+        with self._post("/summarize", text, detail, model, long_document, **extra) as response:
+            payload = json.load(response)
+        if return_meta:
+            meta = dict(payload.get("meta", {}), timing=payload.get("timing", {}))
+            return payload["summary"], payload["model_used"], meta
+        return payload["summary"], payload["model_used"]
+
+    def summarize_text_stream(self, text, detail="medium", model="auto", long_document=True,
+                              chunk_store=None):
+        """chunk_store: a session id (any string) the server keeps partial summaries under."""
+        extra = self._session(chunk_store)
+        with self._post("/summarize/stream", text, detail, model, long_document,
+                        **extra) as response:
+            for line in response:
+                if line.strip():
+                    payload = json.loads(line)
+                    yield payload["summary"], payload["model_used"]
+
+    def summarize_all_details(self, text, model="auto", long_document=True, return_meta=False):
+        with self._post("/summarize/details", text, "medium", model, long_document) as response:
+            payload = json.load(response)
+        if return_meta:
+            return payload["summaries"], payload["model_used"], payload.get("meta", {})
+        return payload["summaries"], payload["model_used"]
+
+    def summarize_documents(self, texts, detail="medium", model="auto", long_document=True):
+        texts = [getattr(t, "text", t) for t in texts]
+        with self._post("/summarize/multi", None, detail, model, long_document,
+                        texts=texts) as response:
+            payload = json.load(response)
+        timing = payload.get("timing", {})
+        return payload["summary"], payload["model_used"], {
+            "documents": payload["documents"],
+            "reduce_s":  timing.get("reduce_ms", 0) / 1000,
+            "total_s":   timing.get("total_ms", 0) / 1000,
+        }
+
+    def summarize_file(self, stream, detail="medium", model="auto", html=False,
+                       return_meta=False):
+        """Upload a binary file object; the server reads and cleans it as a stream."""
+        stream.seek(0, os.SEEK_END)
+        length = stream.tell()
+        stream.seek(0)
+        query = urllib.parse.urlencode(
+            {"detail": detail, "model": model, "format": "html" if html else "text"}
+        )
+        request = urllib.request.Request(
+            f"{self.url}/summarize/file?{query}", data=stream,
+            headers={"Content-Type": "application/octet-stream",
+                     "Content-Length": str(length)},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.load(response)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 503:
+                raise PoolSaturated("inference server is at capacity") from exc
+            raise
+        if return_meta:
+            return payload["summary"], payload["model_used"], payload.get("meta", {})
+        return payload["summary"], payload["model_used"]
+
+    def predict_latency(self, text, detail="medium", model="auto", stream=False):
+        """(engine, seconds) from the server's cost model; (None, None) when offline."""
+        try:
+            with self._post("/predict", text, detail, model, timeout=_HINT_TIMEOUT_S,
+                            stream=stream) as response:
+                payload = json.load(response)
+        except (OSError, ValueError):
+            return None, None
+        return payload["engine"], payload["seconds"]
+
+    def input_hint(self, text, detail="medium", model="auto"):
+        """
+        (auto_engine, state, seconds) from one /predict call — see
+        summarizer.input_hint().  When the server does not answer within
+        _HINT_TIMEOUT_S: a word-count engine guess, "offline" and None.
+        """
+        try:
+            with self._post("/predict", text, "medium" if detail == "all" else detail,
+                            model, timeout=_HINT_TIMEOUT_S, stream=True) as response:
+                payload = json.load(response)
+        except (OSError, ValueError):
+            words = getattr(text, "word_count", None)
+            if words is None:
+                words = len(str(text).split())
+            return ("t5" if words < _OFFLINE_T5_MAX_WORDS else "bart"), "offline", None
+        seconds = None if detail == "all" else payload["seconds"]
+        return payload["auto_engine"], payload["state"], seconds
+
+    def health(self) -> dict:
+        with urllib.request.urlopen(self.url + "/health", timeout=_HINT_TIMEOUT_S) as response:
+            return json.load(response)
+
+    def metrics_text(self) -> str:
+        """The server's /metrics page (Prometheus text format)."""
+        with urllib.request.urlopen(self.url + "/metrics", timeout=_HINT_TIMEOUT_S) as response:
+            return response.read().decode("utf-8")
+
+    def model_status(self, engine: str) -> str:
+        """"ready" | "warming" | "cold"; "offline" when the server is unreachable."""
+        try:
+            return self.health()["models"].get(engine, "cold")
+        except (OSError, ValueError):
+            return "offline"
@@ -0,0 +1,93 @@
+"""
+Runtime configuration.
+
+Every knob is an environment variable so the same code runs unchanged on
+Streamlit Cloud, in a container, or from a shell.  Values are read once at
+import time.
+"""
+
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def _env_str(name: str, default=None):
+    value = os.environ.get(name, "").strip()
+    return value or default
+
+
+# ── Inference backend ────────────────────────────────────────────────────────
+# "transformers" (PyTorch) | "onnx" (ONNX Runtime, needs optimum[onnxruntime]).
+BACKEND  = _env_str("NEURALSUM_BACKEND", "transformers").lower()
+ONNX_DIR = _env_str("NEURALSUM_ONNX_DIR")              # exported graphs are kept here
+
+# ── Inference precision ──────────────────────────────────────────────────────
+# "fp32" | "int8" | "bf16" — see summarizer.PRECISIONS.  bf16 falls back to
+# fp32 on CPUs without native support.
+PRECISION = _env_str("NEURALSUM_PRECISION", "fp32").lower()
+
+# ── Weight loading ───────────────────────────────────────────────────────────
+# "default" | "mmap" — see backends.LOAD_MODES.  mmap keeps fp32 weights in
+# shared, file-backed pages (one copy for every process / forked worker);
+# int8 and bf16 convert the weights and so always hold a private copy.
+LOAD_MODE = _env_str("NEURALSUM_LOAD_MODE", "default").lower()
+
+# ── Summary cache ────────────────────────────────────────────────────────────
+CACHE_SIZE = _env_int("NEURALSUM_CACHE_SIZE", 256)     # in-memory entries, 0 = off
+CACHE_DIR  = _env_str("NEURALSUM_CACHE_DIR")           # on-disk tier, unset = off
+
+# ── Near-duplicate reuse ─────────────────────────────────────────────────────
+# Inputs whose word shingles overlap an earlier input's by at least this
+# Jaccard similarity reuse its summary (same detail / model / settings).
+# 0 = off.  NEAR_DUP_SIZE bounds how many summarized inputs are indexed.
+NEAR_DUP_THRESHOLD = _env_float("NEURALSUM_NEAR_DUP_THRESHOLD", 0.0)
+NEAR_DUP_SIZE      = _env_int("NEURALSUM_NEAR_DUP_SIZE", 2048)
+
+# ── Latency cost model ───────────────────────────────────────────────────────
+# JSON file of recorded runs (engine, tokens, length cap, seconds) the
+# latency router fits on; unset = learn in memory only.  Fill it with
+# `python -m benchmarks.calibrate`.
+COST_MODEL_PATH = _env_str("NEURALSUM_COST_MODEL")
+
+# ── Warm-up ──────────────────────────────────────────────────────────────────
+# Comma-separated engines to load in the background at start, e.g. "t5,bart".
+WARMUP_MODELS = [
+    m.strip().lower()
+    for m in _env_str("NEURALSUM_WARMUP", "").split(",")
+    if m.strip()
+]
+
+# ── Extractive pre-selection ─────────────────────────────────────────────────
+# 1 = fit overlong inputs to the model window by TextRank sentence selection
+# (one abstractive pass) instead of map-reduce.
+PRESELECT = bool(_env_int("NEURALSUM_PRESELECT", 0))
+
+# ── Inference worker pool ────────────────────────────────────────────────────
+WORKERS            = _env_int("NEURALSUM_WORKERS", 2)             # concurrent generations
+THREADS_PER_WORKER = _env_int("NEURALSUM_THREADS_PER_WORKER", 0)  # 0 = cores / workers
+QUEUE_SIZE         = _env_int("NEURALSUM_QUEUE_SIZE", 8)          # waiting jobs before rejecting
+
+# ── Remote inference ─────────────────────────────────────────────────────────
+# When set (e.g. "http://127.0.0.1:8765"), app.py sends work to server.py
+# instead of loading models in the Streamlit process.
+SERVER_URL = _env_str("NEURALSUM_SERVER_URL")
+
+# ── HTTP micro-batching (server.py) ──────────────────────────────────────────
+BATCH_WINDOW_MS = _env_int("NEURALSUM_BATCH_WINDOW_MS", 10)   # 0 = one request per forward
+MAX_BATCH       = _env_int("NEURALSUM_MAX_BATCH", 8)
+
+# ── Diagnostics ──────────────────────────────────────────────────────────────
+# 1 = show the metrics panel (stage timings, counters, gauges) in app.py.
+DIAGNOSTICS = bool(_env_int("NEURALSUM_DIAGNOSTICS", 0))
@@ -0,0 +1,214 @@
+# ─────────────────────────────────────────────────────────────────────────────
+#  LATENCY COST MODEL
+#
+#  Predicts how long one summarization will take on *this* host, from runs
+#  recorded on this host.  One least-squares fit per (engine, decoding):
+#
+#      seconds ≈ a + b · input_tokens + c · max_len + d · input_tokens · max_len
+#
+#  max_len (the generation cap) stands in for the output length — decoding
+#  dominates and runs one step per output token; the interaction term is the
+#  cross-attention over the input that every step pays.  Detail level only
+#  changes max_len, so it needs no feature of its own.
+#
+#  Samples come from summarize_text / summarize_text_stream (every uncached
+#  run records one) or from `python -m benchmarks.calibrate`.  With a path,
+#  samples persist as JSON so fits survive restarts.  record() never touches
+#  the disk: a background thread — started by the first record() in each
+#  process — writes every _SAVE_EVERY samples or _SAVE_INTERVAL_S seconds,
+#  whichever comes first, and once more at exit.
+#
+#  Forked workers (server.py --processes N) each write their own
+#  <path>.<pid> file instead of racing on <path>; the next load merges
+#  those into <path> and removes them.
+# ─────────────────────────────────────────────────────────────────────────────
+
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+from collections import deque
+
+import numpy as np
+
+_MIN_SAMPLES = 8             # fewer than this → no prediction for that key
+_SAVE_EVERY  = 8             # persist after this many new samples,
+_SAVE_INTERVAL_S = 60.0      # or this many seconds after the last write
+
+
+def _features(input_tokens, max_len):
+    tokens  = np.asarray(input_tokens, dtype=np.float64)
+    lengths = np.asarray(max_len, dtype=np.float64)
+    return np.stack(
+        [np.ones_like(tokens), tokens, lengths, tokens * lengths / 1000.0], axis=-1
+    )
+
+
+class CostModel:
+    """
+    Bounded per-(engine, decoding) sample store with lazily refitted
+    latency predictions.  Thread-safe.
+
+    Parameters
+    ----------
+    path        : JSON file to load samples from and save them to (None =
+                  in memory only)
+    max_samples : samples kept per key; the oldest are dropped first, so
+                  fits follow the host's current behaviour
+    """
+
+    def __init__(self, path: str = None, max_samples: int = 512):
+        self.path        = path
+        self.max_samples = max_samples
+        self._samples    = {}                    # (engine, greedy) → deque[(tokens, max_len, s)]
+        self._fits       = {}                    # (engine, greedy) → coefficients | None
+        self._unsaved    = 0
+        self._lock       = threading.Lock()
+        self._save_lock  = threading.RLock()     # one write at a time; flush() waits for it
+        self._wake       = threading.Event()
+        self._owner      = os.getpid()           # the one process that writes `path` itself
+        self._flushing   = None                  # pid whose flusher thread is running
+        if path:
+            self._load()
+
+    # ── samples ──────────────────────────────────────────────────────────────
+    def record(self, engine: str, greedy: bool, input_tokens: int, max_len: int,
+               seconds: float):
+        """Add one observed run (in memory; the flusher thread persists it)."""
+        key = (engine, bool(greedy))
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.max_samples)
+            samples.append((int(input_tokens), int(max_len), float(seconds)))
+            self._fits.pop(key, None)
+            self._unsaved += 1
+            if self._unsaved >= _SAVE_EVERY:
+                self._wake.set()
+            start = self.path and self._flushing != os.getpid()
+            if start:
+                self._flushing = os.getpid()     # threads do not survive fork()
+        if start:
+            threading.Thread(target=self._flusher, name="neuralsum-cost-model", daemon=True).start()
+            atexit.register(self.flush)
+
+    def _fit(self, key):
+        samples = self._samples.get(key)
+        if not samples or len(samples) < _MIN_SAMPLES:
+            return None
+        rows    = np.array(samples, dtype=np.float64)
+        coef, *_ = np.linalg.lstsq(_features(rows[:, 0], rows[:, 1]), rows[:, 2], rcond=None)
+        return coef
+
+    def _coefficients(self, key):
+        with self._lock:
+            if key not in self._fits:
+                self._fits[key] = self._fit(key)
+            return self._fits[key]
+
+    # ── predictions ──────────────────────────────────────────────────────────
+    def predict(self, engine: str, greedy: bool, input_tokens: int, max_len: int):
+        """Predicted seconds, or None while the key has too few samples."""
+        coef = self._coefficients((engine, bool(greedy)))
+        if coef is None:
+            return None
+        return max(0.0, float(_features(input_tokens, max_len) @ coef))
+
+    def largest_max_len(self, engine: str, greedy: bool, input_tokens: int,
+                        budget_s: float, low: int, high: int):
+        """
+        Largest generation cap in [low, high] predicted to finish within
+        `budget_s`, or None when even `low` is predicted to overrun it.
+        """
+        coef = self._coefficients((engine, bool(greedy)))
+        if coef is None:
+            return None
+        caps  = np.arange(low, high + 1)
+        fits  = caps[_features(np.full(caps.shape, input_tokens), caps) @ coef <= budget_s]
+        return int(fits.max()) if fits.size else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                f"{engine}:{'greedy' if greedy else 'beam'}": len(samples)
+                for (engine, greedy), samples in sorted(self._samples.items())
+            }
+
+    # ── persistence ──────────────────────────────────────────────────────────
+    def _flusher(self):
+        while True:
+            self._wake.wait(_SAVE_INTERVAL_S)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Save if any sample was recorded since the last write, or one is being written."""
+        with self._save_lock:
+            if self._unsaved:
+                self.save()
+
+    def _target(self) -> str:
+        if os.getpid() == self._owner:
+            return self.path
+        return f"{self.path}.{os.getpid()}"
+
+    def _parts(self) -> list:
+        """Files left by forked workers: <path>.<pid>."""
+        return sorted(
+            p for p in glob.glob(glob.escape(self.path) + ".*")
+            if p.rsplit(".", 1)[1].isdigit()
+        )
+
+    def _load(self):
+        rows  = {}                               # key → {row: None}, ordered and de-duplicated
+        parts = self._parts()
+        for path in [self.path] + parts:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    stored = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for entry in stored.get("samples", []):
+                key = (entry["engine"], bool(entry["greedy"]))
+                # workers inherit the parent's samples — keep each row once
+                rows.setdefault(key, {}).update(dict.fromkeys(tuple(r) for r in entry["rows"]))
+        for key, merged in rows.items():
+            self._samples[key] = deque(merged, maxlen=self.max_samples)
+        if parts and self.save():
+            for path in parts:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def save(self):
+        """
+        Write all samples atomically (a crash never leaves a torn file) —
+        to `path`, or to <path>.<pid> from a forked worker.  True once
+        written.
+        """
+        if not self.path:
+            return False
+        with self._save_lock:
+            with self._lock:
+                payload = {"samples": [
+                    {"engine": engine, "greedy": greedy, "rows": list(samples)}
+                    for (engine, greedy), samples in self._samples.items()
+                ]}
+                self._unsaved = 0
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(payload, f)
+                os.replace(tmp, self._target())
+            except OSError:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                return False
+            return True
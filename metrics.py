@@ -0,0 +1,409 @@
+# ─────────────────────────────────────────────────────────────────────────────
+#  METRICS
+#
+#  In-process counters, gauges and histograms for the summarization path,
+#  rendered in the Prometheus text exposition format (version 0.0.4).
+#  Stdlib only; every metric is thread-safe because the worker pool and the
+#  HTTP server record from many threads at once.
+#
+#  Instrumented:
+#    text_cleaner  — clean time
+#    backends      — tokenize / encode / generate / decode time
+#    summarizer    — requests per model and detail, input sizes, garbage
+#                    rejections, truncations, near-duplicate reuses, request
+#                    latency, model loads, cold requests, loaded models,
+#                    pool occupancy
+#
+#  Exposed by server.py at GET /metrics and by the diagnostics panel in
+#  app.py (NEURALSUM_DIAGNOSTICS=1).
+# ─────────────────────────────────────────────────────────────────────────────
+
+import math
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Seconds — from a cached tokenizer call up to a cold BART load.
+_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Words / tokens — the input-size distribution we plan capacity around.
+_SIZE_BUCKETS = (15, 50, 100, 160, 250, 500, 1000, 2000, 5000, 10000, 50000)
+# Ratios in [0, 1] — the admission scores the text_cleaner thresholds sit on.
+_RATIO_BUCKETS = (0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1)
+
+
+def _label_key(names, labels: dict) -> tuple:
+    if set(labels) != set(names):
+        raise ValueError(f"expected labels {names}, got {tuple(labels)}")
+    return tuple(str(labels[n]) for n in names)
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name   = name
+        self.help   = help
+        self.labels = tuple(labels)
+        self._lock  = threading.Lock()
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        super().__init__(name, help, labels)
+        self._values = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(self.labels, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(self.labels, labels), 0)
+
+    def samples(self):
+        with self._lock:
+            return sorted(self._values.items())
+
+    def render(self):
+        lines = self._header()
+        for key, value in self.samples():
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    A value that goes up and down.  With `fn`, the value is read at render
+    time instead (fn returns a number, or {label values tuple: number}).
+    """
+    kind = "gauge"
+
+    def __init__(self, name, help, labels=(), fn=None):
+        super().__init__(name, help, labels)
+        self._values = {}
+        self._fn     = fn
+
+    def set(self, value: float, **labels):
+        key = _label_key(self.labels, labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self):
+        if self._fn is not None:
+            value = self._fn()
+            return sorted(value.items()) if isinstance(value, dict) else [((), value)]
+        with self._lock:
+            return sorted(self._values.items())
+
+    def render(self):
+        lines = self._header()
+        for key, value in self.samples():
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=_TIME_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series = {}                        # label values → [bucket counts, sum, count, max]
+
+    def observe(self, value: float, **labels):
+        key = _label_key(self.labels, labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+            series[3] = max(series[3], value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration of the `with` block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        """[(label values, cumulative bucket counts, sum, count)]"""
+        with self._lock:
+            out = []
+            for key, (counts, total, count, _) in sorted(self._series.items()):
+                cumulative, running = [], 0
+                for c in counts:
+                    running += c
+                    cumulative.append(running)
+                out.append((key, cumulative, total, count))
+            return out
+
+    def quantile(self, q: float, **labels) -> float:
+        """
+        Upper bucket bound holding the q-quantile — the same estimate a
+        dashboard gets from the exported buckets — capped at the largest
+        observed value, so the +Inf bucket still reads as a number.  0.0
+        with no samples.
+        """
+        key = _label_key(self.labels, labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None or not series[2]:
+                return 0.0
+            counts, _, count, peak = series
+            seen = 0
+            for bound, c in zip(self.buckets, counts):
+                seen += c
+                if seen >= q * count:
+                    return min(bound, peak)
+        return peak
+
+    def render(self):
+        lines = self._header()
+        for key, cumulative, total, count in self.samples():
+            for bound, seen in zip(self.buckets, cumulative):
+                le = _format_labels(self.labels, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{le} {seen}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock    = threading.Lock()
+
+    def register(self, metric):
+        # Re-registering a name replaces the old metric, so a module that is
+        # re-executed (Streamlit reloads edited modules) re-binds cleanly.
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def metrics(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics():
+            try:
+                lines.extend(metric.render())
+            except Exception:                    # a failing callback gauge must not break the page
+                continue
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labels=()) -> Counter:
+    return REGISTRY.register(Counter(name, help, labels))
+
+
+def gauge(name: str, help: str, labels=(), fn=None) -> Gauge:
+    return REGISTRY.register(Gauge(name, help, labels, fn))
+
+
+def histogram(name: str, help: str, labels=(), buckets=_TIME_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, help, labels, buckets))
+
+
+def render() -> str:
+    """All metrics in Prometheus text format."""
+    return REGISTRY.render()
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  PROCESS GAUGES
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _rss_bytes() -> float:
+    """Resident set size right now (Linux); falls back to the peak."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+_SMAPS_FIELDS = {
+    "Rss:": "rss", "Pss:": "pss",
+    "Shared_Clean:": "shared", "Shared_Dirty:": "shared",
+    "Private_Clean:": "private", "Private_Dirty:": "private",
+}
+
+
+def process_memory(pid="self") -> dict:
+    """
+    Resident memory of `pid` in bytes: rss, pss (shared pages divided by
+    the number of processes mapping them), shared and private.  Across
+    forked workers, sum(pss) is the real footprint; sum(rss) counts shared
+    weight pages once per worker.  Linux only — elsewhere pss / shared /
+    private are None.
+    """
+    usage = {"rss": 0, "pss": 0, "shared": 0, "private": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                field = _SMAPS_FIELDS.get(parts[0]) if parts else None
+                if field:
+                    usage[field] += int(parts[1]) * 1024       # kB
+        return usage
+    except (OSError, ValueError, IndexError):
+        rss = _rss_bytes() if pid == "self" else 0
+        return {"rss": rss, "pss": None, "shared": None, "private": None}
+
+
+PROCESS_RSS = gauge(
+    "neuralsum_process_resident_memory_bytes",
+    "Resident set size of this process.",
+    fn=_rss_bytes,
+)
+PROCESS_PSS = gauge(
+    "neuralsum_process_proportional_memory_bytes",
+    "Proportional set size of this process (shared pages split between sharers).",
+    fn=lambda: process_memory()["pss"] or 0,
+)
+PROCESS_SHARED = gauge(
+    "neuralsum_process_shared_memory_bytes",
+    "Resident pages of this process that are shared with other processes.",
+    fn=lambda: process_memory()["shared"] or 0,
+)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  SUMMARIZATION PATH
+# ─────────────────────────────────────────────────────────────────────────────
+
+STAGE_SECONDS = histogram(
+    "neuralsum_stage_seconds",
+    "Time spent per pipeline stage (clean, tokenize, encode, generate, decode).",
+    labels=("stage",),
+)
+REQUEST_SECONDS = histogram(
+    "neuralsum_request_seconds",
+    "End-to-end summarize_text latency by engine.",
+    labels=("engine",),
+)
+MODEL_LOAD_SECONDS = histogram(
+    "neuralsum_model_load_seconds",
+    "Time to load a model (weights, precision conversion).",
+    labels=("engine",),
+)
+INPUT_WORDS = histogram(
+    "neuralsum_input_words",
+    "Words per cleaned input.",
+    buckets=_SIZE_BUCKETS,
+)
+INPUT_TOKENS = histogram(
+    "neuralsum_input_tokens",
+    "Tokens per routed input, by engine.",
+    labels=("engine",),
+    buckets=_SIZE_BUCKETS,
+)
+REQUESTS = counter(
+    "neuralsum_requests_total",
+    "Summarization requests by requested model and detail level.",
+    labels=("model", "detail"),
+)
+GARBAGE_REJECTIONS = counter(
+    "neuralsum_garbage_rejections_total",
+    "Inputs rejected as too short, too repetitive or refused at admission.",
+)
+ADMISSIONS = counter(
+    "neuralsum_admissions_total",
+    "Admission-control outcomes: lines dropped (reduce) or inputs refused (reject), by reason.",
+    labels=("verdict", "reason"),
+)
+ADMISSION_SCORES = histogram(
+    "neuralsum_admission_score",
+    "Admission statistics of each input (alpha, compress, function-word ratios).",
+    labels=("signal",),
+    buckets=_RATIO_BUCKETS,
+)
+TRUNCATIONS = counter(
+    "neuralsum_truncations_total",
+    "Inputs longer than the model window that were truncated.",
+    labels=("engine",),
+)
+NEAR_DUPLICATE_REUSES = counter(
+    "neuralsum_near_duplicate_reuses_total",
+    "Summaries reused from a near-identical earlier input (MinHash match).",
+)
+COLD_REQUESTS = counter(
+    "neuralsum_cold_requests_total",
+    "Requests that had to wait for their model to load.",
+    labels=("engine",),
+)
+MODELS_LOADED = gauge(
+    "neuralsum_model_loaded",
+    "1 when the engine's model is resident in this process.",
+    labels=("engine",),
+)
+
+
+def timing_table() -> list:
+    """
+    One row per timed series — stage, model load and request latency —
+    with count, mean and bucket-estimated p50 / p95 in milliseconds.
+    """
+    rows = []
+    for kind, hist in (
+        ("stage", STAGE_SECONDS),
+        ("load", MODEL_LOAD_SECONDS),
+        ("request", REQUEST_SECONDS),
+    ):
+        for key, _, total, count in hist.samples():
+            labels = dict(zip(hist.labels, key))
+            rows.append({
+                "metric":  f"{kind}:{key[0]}",
+                "count":   count,
+                "mean_ms": round(total / count * 1000, 1) if count else 0.0,
+                "p50_ms":  round(hist.quantile(0.5, **labels) * 1000, 1),
+                "p95_ms":  round(hist.quantile(0.95, **labels) * 1000, 1),
+            })
+    return rows
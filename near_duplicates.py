@@ -0,0 +1,165 @@
+# ─────────────────────────────────────────────────────────────────────────────
+#  NEAR-DUPLICATE INDEX
+#
+#  The summary cache only matches byte-identical cleaned text, so the same
+#  wire story under another byline, or a report with a new date, always
+#  misses.  This index finds earlier inputs whose word shingles overlap the
+#  new one by at least a Jaccard threshold and hands back their summary.
+#
+#  Signature — MinHash over word 5-gram shingles: 128 multiply-shift hash
+#              functions, the minimum of each over the shingle set.  The
+#              fraction of equal positions in two signatures estimates the
+#              Jaccard similarity of the shingle sets.
+#  LSH       — the signature is cut into 16 bands of 8 rows; documents that
+#              agree on a whole band land in the same bucket.  A lookup
+#              touches 16 buckets and compares only the signatures found
+#              there, independent of how many documents are indexed.
+#  Bounds    — at most `max_entries` documents (LRU); an evicted document
+#              is removed from its buckets too.  Each entry costs its
+#              512-byte signature, 16 bucket slots and the stored summary.
+#
+#  Entries are scoped by a namespace (the settings part of the summary cache
+#  key), so a summary is only reused for the same detail, model and
+#  generation settings.
+# ─────────────────────────────────────────────────────────────────────────────
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+_SHINGLE    = 5                                  # words per shingle
+_MIN_WORDS  = 3 * _SHINGLE                       # shorter inputs are not indexed
+_BANDS      = 16
+_ROWS       = 8
+_NUM_HASHES = _BANDS * _ROWS
+
+_rng    = np.random.default_rng(0x5EED)          # fixed: signatures stay comparable across runs
+_MULT   = _rng.integers(1, 2**63, _NUM_HASHES, dtype=np.uint64) | np.uint64(1)   # odd multipliers
+_OFFSET = _rng.integers(0, 2**63, _NUM_HASHES, dtype=np.uint64)
+
+_WORD = re.compile(r"\w+")
+
+
+def _shingle_hashes(text: str):
+    """32-bit CRC of every word 5-gram (lower-cased, punctuation ignored)."""
+    words = _WORD.findall(text.lower())
+    if len(words) < _MIN_WORDS:
+        return None
+    shingles = {" ".join(words[i:i + _SHINGLE]) for i in range(len(words) - _SHINGLE + 1)}
+    return np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+
+
+def signature(text: str):
+    """MinHash signature (uint32[128]) of `text`, or None when too short to compare."""
+    hashes = _shingle_hashes(text)
+    if hashes is None:
+        return None
+    # multiply-shift: (a·x + b) mod 2^64, top 32 bits — uint64 arithmetic wraps
+    with np.errstate(over="ignore"):
+        mixed = hashes[:, None] * _MULT[None, :] + _OFFSET[None, :]
+    return (mixed >> np.uint64(32)).min(axis=0).astype(np.uint32)
+
+
+def similarity(a, b) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.count_nonzero(a == b)) / _NUM_HASHES
+
+
+class NearDuplicateIndex:
+    """
+    Bounded MinHash / LSH index of summarized inputs.  Thread-safe.
+
+    Parameters
+    ----------
+    threshold   : minimum estimated Jaccard similarity for a match (0 < t ≤ 1)
+    max_entries : documents kept; least recently matched or added go first
+    """
+
+    def __init__(self, threshold: float = 0.9, max_entries: int = 2048):
+        self.threshold   = threshold
+        self.max_entries = max_entries
+        self._entries    = OrderedDict()         # id → (namespace, signature, value)
+        self._buckets    = {}                    # (namespace, band, band bytes) → {id}
+        self._next_id    = 0
+        self._lock       = threading.Lock()
+        self.hits        = 0
+        self.misses      = 0
+
+    # ── helpers ──────────────────────────────────────────────────────────────
+    @staticmethod
+    def _band_keys(namespace: str, sig):
+        return [
+            (namespace, band, sig[band * _ROWS:(band + 1) * _ROWS].tobytes())
+            for band in range(_BANDS)
+        ]
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            entry_id, (namespace, sig, _) = self._entries.popitem(last=False)
+            for key in self._band_keys(namespace, sig):
+                ids = self._buckets.get(key)
+                if ids is not None:
+                    ids.discard(entry_id)
+                    if not ids:
+                        del self._buckets[key]
+
+    # ── public ───────────────────────────────────────────────────────────────
+    def lookup(self, namespace: str, sig):
+        """
+        Stored value of the most similar indexed document in `namespace`,
+        as (value, similarity) — or None below the threshold.
+        """
+        if sig is None or self.max_entries <= 0:
+            return None
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(namespace, sig):
+                candidates |= self._buckets.get(key, set())
+
+            best, best_sim = None, self.threshold
+            for entry_id in candidates:
+                sim = similarity(sig, self._entries[entry_id][1])
+                if sim >= best_sim:
+                    best, best_sim = entry_id, sim
+
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best)
+            return self._entries[best][2], best_sim
+
+    def add(self, namespace: str, sig, value):
+        """Index one summarized document's signature with its summary."""
+        if sig is None or self.max_entries <= 0:
+            return
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (namespace, sig, value)
+            for key in self._band_keys(namespace, sig):
+                self._buckets.setdefault(key, set()).add(entry_id)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "hit_rate":  self.hits / lookups if lookups else 0.0,
+                "size":      len(self._entries),
+                "capacity":  self.max_entries,
+                "threshold": self.threshold,
+            }
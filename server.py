@@ -0,0 +1,460 @@
+"""
+Standalone NeuralSum inference server.
+
+One process owns the models; any number of Streamlit replicas (or other
+callers) talk to it over localhost HTTP, so weights are loaded once and UI
+restarts never trigger a model reload.
+
+    python server.py --port 8765 --warmup t5,bart
+    NEURALSUM_SERVER_URL=http://127.0.0.1:8765 streamlit run app.py
+
+With --processes N (Linux / macOS) the parent loads the models once, then
+forks N worker processes that accept on the same socket.  Workers share the
+parent's weight pages copy-on-write — with NEURALSUM_LOAD_MODE=mmap those
+pages are file-backed and stay shared for the life of the workers.  Each
+worker's /health reports the memory of every worker (rss / pss / shared /
+private), so the saving can be read off directly: sum(pss) is the real
+footprint, sum(rss) what N independent servers would cost.
+
+Endpoints
+---------
+POST /summarize         {"text", "detail", "model", "long_document",
+                         "latency_budget" (optional, seconds),
+                         "session" (optional, incremental re-runs)}
+                        → {"summary", "model_used", "timing"}
+                        Concurrent requests are micro-batched: each waits
+                        at most --batch-window-ms for company, then runs in
+                        one batched forward per model.  With a window of 0,
+                        a latency_budget or a session, a request runs alone
+                        and also returns "meta".  A session keeps the
+                        partial summaries of its long inputs, so re-sending
+                        an edited document only re-generates changed chunks.
+POST /summarize/details same body → {"summaries": {"short", "medium", "long"},
+                        "model_used", "meta"}: all three detail levels from
+                        one encoder pass ("detail" is ignored)
+POST /summarize/multi   {"texts": [...], "detail", "model", "long_document"}
+                        → {"summary", "model_used", "documents", "timing"}:
+                        each text summarized in parallel on the pool, then
+                        one combined summary; "documents" holds the
+                        per-text summaries and seconds.  Each text waits
+                        up to 2 s for queue space, then the request gets
+                        the usual 503
+POST /summarize/file    raw file bytes (UTF-8 text / Markdown / HTML), with
+                        ?detail=&model=&format=html in the query string
+                        → {"summary", "model_used", "meta"}: read, cleaned
+                        and summarized in a streaming pass — no size cap
+POST /predict           same body → {"engine", "seconds", "auto_engine",
+                        "state"}: the host's latency estimate (seconds is
+                        null until enough runs are recorded), plus the engine
+                        Auto would pick and its readiness — everything the
+                        UI's input hint needs in one call; "stream": true
+                        predicts /summarize/stream
+POST /summarize/stream  same body → newline-delimited JSON, one
+                        {"summary", "model_used"} object per partial
+GET  /health            model readiness, worker pool, cache counters and
+                        per-process memory
+GET  /metrics           per-stage timings, counters and gauges in the
+                        Prometheus text format
+
+A full worker pool answers 503 {"error": "busy"} with Retry-After; a failed
+generation answers 500 {"error": ...}.  "model": "instant" texts over 200,000
+characters answer 413 — /summarize/file takes any size.
+"""
+
+import argparse
+import gc
+import json
+import os
+import signal
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import config
+import metrics
+import summarizer
+from batching import MicroBatcher
+from text_cleaner import clean_document
+from workers import PoolSaturated
+
+_MULTI_QUEUE_WAIT_S = 2.0       # /summarize/multi: wait per text for queue space, then 503
+_MAX_INSTANT_CHARS  = 200_000   # "instant" runs on the request thread, off the pool: 413 beyond
+
+
+class SummarizeHandler(BaseHTTPRequestHandler):
+    server_version = "NeuralSum/1"
+
+    # ── helpers ──────────────────────────────────────────────────────────────
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, status: int, text: str, content_type: str):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_request(self, multi: bool = False):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return None
+        if not isinstance(body, dict):
+            return None
+        if multi:
+            texts = body.get("texts")
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                return None
+            request = {"texts": texts}
+        elif isinstance(body.get("text"), str):
+            request = {"text": body["text"]}
+        else:
+            return None
+        request.update({
+            "detail":        body.get("detail", "medium"),
+            "model":         body.get("model", "auto"),
+            "long_document": bool(body.get("long_document", True)),
+        })
+        budget = body.get("latency_budget")
+        if isinstance(budget, (int, float)) and not isinstance(budget, bool):
+            request["latency_budget"] = float(budget)
+        if body.get("stream"):
+            request["stream"] = True
+        if isinstance(body.get("session"), str) and body["session"]:
+            request["session"] = body["session"]
+        return request
+
+    def _busy(self):
+        self._send_json(503, {"error": "busy"}, {"Retry-After": "2"})
+
+    def _failed(self, exc: Exception):
+        traceback.print_exc()
+        self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+
+    def _summarize(self, request: dict):
+        batcher = self.server.batcher
+        try:
+            # budgets and sessions are per request, so they skip the batcher
+            if batcher is not None and not {"latency_budget", "chunk_store"} & set(request):
+                self._send_json(200, batcher.submit(**request).result())
+                return
+
+            start  = time.perf_counter()
+            future = summarizer.summarize_text_async(**request, return_meta=True)
+            summary, model_used, meta = future.result()
+        except PoolSaturated:
+            self._busy()
+            return
+        except Exception as exc:
+            self._failed(exc)
+            return
+
+        total_ms = round((time.perf_counter() - start) * 1000, 2)
+        self._send_json(200, {
+            "summary":    summary,
+            "model_used": model_used,
+            "meta":       meta,
+            "timing":     {"total_ms": total_ms, "batch_size": 1},
+        })
+
+    # ── routes ───────────────────────────────────────────────────────────────
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send_text(200, summarizer.metrics_text(), metrics.CONTENT_TYPE)
+            return
+        if self.path != "/health":
+            self._send_json(404, {"error": "not found"})
+            return
+        self._send_json(200, {
+            "status":  "ok",
+            "models":  {e: summarizer.model_status(e) for e in ("t5", "bart")},
+            "pool":    summarizer.pool_stats(),
+            "cache":   summarizer.cache_stats(),
+            "process": _memory_mb(os.getpid()),
+            "workers": [_memory_mb(pid) for pid in _worker_pids()],
+        })
+
+    def _summarize_details(self, request: dict):
+        try:
+            summaries, model_used, meta = summarizer.summarize_all_details(
+                request["text"], request["model"], request["long_document"], return_meta=True,
+            )
+        except PoolSaturated:
+            self._busy()
+            return
+        self._send_json(200, {"summaries": summaries, "model_used": model_used, "meta": meta})
+
+    def _summarize_multi(self, request: dict):
+        try:
+            summary, model_used, report = summarizer.summarize_documents(
+                request["texts"], request["detail"], request["model"], request["long_document"],
+                timeout=_MULTI_QUEUE_WAIT_S,
+            )
+        except PoolSaturated:
+            self._busy()
+            return
+        except Exception as exc:
+            self._failed(exc)
+            return
+        self._send_json(200, {
+            "summary":    summary,
+            "model_used": model_used,
+            "documents":  report["documents"],
+            "timing":     {"total_ms":  round(report["total_s"] * 1000, 2),
+                           "reduce_ms": round(report["reduce_s"] * 1000, 2)},
+        })
+
+    def _summarize_file(self, query: dict):
+        def arg(name, default):
+            return query.get(name, [default])[0]
+
+        body = _BodyReader(self.rfile, int(self.headers.get("Content-Length") or 0))
+        try:
+            summary, model_used, meta = summarizer.summarize_file(
+                body, arg("detail", "medium"), arg("model", "auto"),
+                html=arg("format", "text") == "html", return_meta=True,
+            )
+        except PoolSaturated:
+            self._busy()
+            return
+        self._send_json(200, {"summary": summary, "model_used": model_used, "meta": meta})
+
+    def _predict(self, request: dict):
+        doc = clean_document(request["text"])       # cleaned once for both answers
+        engine, seconds = summarizer.predict_latency(
+            doc, request["detail"], request["model"], stream=request.get("stream", False),
+        )
+        auto = engine if request["model"] == "auto" else summarizer.auto_engine(doc)
+        self._send_json(200, {
+            "engine": engine, "seconds": seconds,
+            "auto_engine": auto, "state": summarizer.model_status(auto),
+        })
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path == "/summarize/file":
+            self._summarize_file(parse_qs(url.query))
+            return
+        if self.path not in ("/summarize", "/summarize/stream", "/summarize/details",
+                             "/summarize/multi", "/predict"):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        multi   = self.path == "/summarize/multi"
+        request = self._read_request(multi)
+        if request is None:
+            expected = "a 'texts' list of strings" if multi else "a 'text' string"
+            self._send_json(400, {"error": f"expected a JSON object with {expected}"})
+            return
+
+        if self.path == "/predict":
+            self._predict(request)
+            return
+        texts = request["texts"] if multi else [request["text"]]
+        if request["model"] == "instant" and any(len(t) > _MAX_INSTANT_CHARS for t in texts):
+            self._send_json(413, {"error": f"instant texts are limited to {_MAX_INSTANT_CHARS} "
+                                           "characters; send large files to /summarize/file"})
+            return
+
+        if multi:
+            self._summarize_multi(request)
+            return
+        if self.path == "/summarize/details":
+            self._summarize_details(request)
+            return
+
+        request.pop("stream", None)
+        session = request.pop("session", None)
+        if session is not None:
+            request["chunk_store"] = summarizer.session_chunk_store(session)
+        if self.path == "/summarize":
+            self._summarize(request)
+            return
+
+        # ── streaming: NDJSON, connection closes at the end ──────────────────
+        request.pop("latency_budget", None)
+        stream = summarizer.summarize_text_stream(**request)
+        try:
+            first = next(stream)
+        except PoolSaturated:
+            self._busy()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        for summary, model_used in _chain(first, stream):
+            line = json.dumps({"summary": summary, "model_used": model_used}) + "\n"
+            self.wfile.write(line.encode("utf-8"))
+            self.wfile.flush()
+
+    def log_message(self, fmt, *args):
+        pass                                     # keep stdout quiet under load
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+class _BodyReader:
+    """File-like view of the next `length` bytes of a request body."""
+
+    def __init__(self, rfile, length: int):
+        self._rfile     = rfile
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._rfile.read(size) if size else b""
+        self._remaining -= len(data)
+        return data
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  PRE-FORK WORKERS
+#
+#  The parent loads every model before forking and never runs inference,
+#  so the workers inherit loaded weights (no reload, no second copy) and
+#  no threads — the inference pool, micro-batcher, warm-up and cost-model
+#  flusher threads are all created inside each worker (the flusher on its
+#  first recorded run).  Workers flush their cost-model samples on the way
+#  out, since they leave through os._exit() and skip atexit hooks.
+# ─────────────────────────────────────────────────────────────────────────────
+
+_workers_parent = None                           # pid of the pre-fork parent, if any
+
+
+def _memory_mb(pid) -> dict:
+    usage = metrics.process_memory(pid)
+    return dict(pid=pid, **{
+        f"{k}_mb": None if v is None else round(v / 2**20, 1) for k, v in usage.items()
+    })
+
+
+def _worker_pids() -> list:
+    """Pids of all forked workers (this process alone when not pre-forked)."""
+    if _workers_parent is None:
+        return [os.getpid()]
+    try:
+        with open(f"/proc/{_workers_parent}/task/{_workers_parent}/children") as f:
+            return sorted(int(pid) for pid in f.read().split())
+    except (OSError, ValueError):
+        return [os.getpid()]
+
+
+def _serve(httpd):
+    # SIGTERM (the pre-fork parent stopping its workers, or a service
+    # manager) ends the loop like Ctrl-C, so the cleanup below still runs.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        summarizer.COST_MODEL.flush()
+
+
+def _fork_workers(httpd, processes: int, warmup, batch_window_ms, max_batch):
+    """Fork `processes` workers serving `httpd`; the parent waits for them."""
+    global _workers_parent
+
+    import torch
+    # Split the cores between workers unless configured explicitly; each
+    # worker's pool applies it (torch threads are process-wide) when its
+    # first thread starts.
+    if not config.THREADS_PER_WORKER:
+        summarizer.POOL.threads_per_worker = max(
+            1, (os.cpu_count() or 1) // (processes * summarizer.POOL.workers)
+        )
+    # Single-threaded in the parent: an OpenMP pool started before fork()
+    # would deadlock the workers' first parallel region.
+    torch.set_num_threads(1)
+    loaded = summarizer.preload(warmup)
+    parent = _memory_mb(os.getpid())
+    print(f"preloaded {','.join(loaded) or 'nothing'}: "
+          f"{parent['rss_mb']} MB resident in the parent", flush=True)
+
+    gc.collect()
+    gc.freeze()                                  # keep inherited objects out of worker GCs
+    httpd.socket.setblocking(False)              # workers race for accept(); losers move on
+    _workers_parent = os.getpid()
+
+    children = []
+    for _ in range(processes):
+        pid = os.fork()
+        if pid == 0:                             # ── worker ──
+            signal.signal(signal.SIGINT, signal.SIG_IGN)   # the parent stops us with SIGTERM
+            httpd.batcher = (
+                MicroBatcher(summarizer.POOL, batch_window_ms, max_batch)
+                if batch_window_ms > 0 else None
+            )
+            summarizer.start_warmup(loaded)      # dummy generation per worker
+            _serve(httpd)
+            os._exit(0)
+        children.append(pid)
+
+    print(f"{processes} workers: {', '.join(map(str, children))}", flush=True)
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in children:
+            os.waitpid(pid, 0)
+    finally:
+        httpd.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="NeuralSum inference server")
+    parser.add_argument("--host",   default="127.0.0.1")
+    parser.add_argument("--port",   type=int, default=8765)
+    parser.add_argument("--warmup", default="t5,bart",
+                        help="engines to load at start, comma-separated ('' = lazy)")
+    parser.add_argument("--batch-window-ms", type=float, default=config.BATCH_WINDOW_MS,
+                        help="how long a request may wait for others to batch with (0 = off)")
+    parser.add_argument("--max-batch", type=int, default=config.MAX_BATCH)
+    parser.add_argument("--processes", type=int, default=1,
+                        help="worker processes forked after loading the models (shared weights)")
+    args = parser.parse_args(argv)
+    warmup = [m for m in args.warmup.split(",") if m]
+
+    httpd = ThreadingHTTPServer((args.host, args.port), SummarizeHandler)
+    httpd.daemon_threads = True
+    print(f"NeuralSum inference server on http://{args.host}:{args.port}", flush=True)
+
+    if args.processes > 1:
+        _fork_workers(httpd, args.processes, warmup, args.batch_window_ms, args.max_batch)
+        return
+
+    summarizer.start_warmup(warmup)
+    httpd.batcher = (
+        MicroBatcher(summarizer.POOL, args.batch_window_ms, args.max_batch)
+        if args.batch_window_ms > 0 else None
+    )
+    _serve(httpd)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,113 +1,1679 @@
-import streamlit as st
-from text_cleaner import clean_text, is_garbage_input
+import functools
+import itertools
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+
+import config
+import metrics
+from backends import TOKENIZER_LOCK, load_backend
+from cost_model import CostModel
+from extractive import extractive_summary, preselect as extractive_preselect, split_sentences
+from near_duplicates import NearDuplicateIndex, signature as near_dup_signature
+from summary_cache import SummaryCache, make_key
+from text_cleaner import (
+    Admission, CleanedDocument, clean_document, describe_admission, stream_document,
+    with_dropped,
+)
+from workers import InferencePool, PoolSaturated
+
+try:
+    import streamlit as st
+    _cache_resource = st.cache_resource(show_spinner=False)
+except ImportError:                              # headless (server / CLI) without the UI
+    _cache_resource = functools.lru_cache(maxsize=None)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  PRECISION
+#
+#  "fp32" — the stock weights (default).
+#  "int8" — dynamic int8 quantization of every nn.Linear; activations are
+#           quantized on the fly, so no calibration data is needed.
+#  "bf16" — bfloat16 weights, only where the CPU has native bf16 support
+#           (AVX512-BF16 / AMX); otherwise the model stays fp32.
+# ─────────────────────────────────────────────────────────────────────────────
+
+PRECISIONS = ("fp32", "int8", "bf16")
+
+_precision_in_use = {}                           # engine → precision actually applied
+
+
+def _bf16_supported() -> bool:
+    import torch
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except (AttributeError, RuntimeError):
+        return False
+
+
+def _apply_precision(backend, precision: str) -> str:
+    """
+    Convert backend.model in place; return the precision actually in effect.
+    Only PyTorch weights are converted — ONNX graphs run as exported (fp32).
+    """
+    if backend.name != "transformers":
+        return "fp32"
+
+    import torch
+
+    if precision == "int8":
+        backend.model = torch.ao.quantization.quantize_dynamic(
+            backend.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        return "int8"
+
+    if precision == "bf16" and _bf16_supported():
+        backend.model = backend.model.to(torch.bfloat16)
+        return "bf16"
+
+    return "fp32"
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  MODEL LOADERS
 #
-#  @st.cache_resource  — called once per server lifetime, never on rerun.
+#  @_cache_resource    — called once per server lifetime, never on rerun
+#                        (st.cache_resource, or lru_cache where Streamlit
+#                        is not installed).  Keyed by precision, backend and
+#                        load mode, so switching modes never returns a model
+#                        built for another mode.
 #  Lazy placement      — _load_bart() is only called when BART is actually
 #                        needed.  If the user only ever sends short texts
 #                        (Auto → T5), BART never enters RAM at all.
 # ─────────────────────────────────────────────────────────────────────────────
 
-@st.cache_resource(show_spinner=False)
-def _load_t5():
-    from transformers import pipeline
-    return pipeline(
-        "summarization",
-        model="google-t5/t5-small",   # 242 MB
-        device=-1,
-        framework="pt",
+_MODEL_IDS = {
+    "t5":   "google-t5/t5-small",              # 242 MB
+    "bart": "sshleifer/distilbart-cnn-6-6",    # 600 MB  (vs bart-large-cnn 1.6 GB)
+}
+
+
+@_cache_resource
+def _load_tokenizer(engine: str):
+    """Tokenizer only — a few MB, so routing and budgets never load a model."""
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(_MODEL_IDS[engine])
+
+
+@_cache_resource
+def _load_t5(precision: str = config.PRECISION, backend_name: str = config.BACKEND,
+             load_mode: str = config.LOAD_MODE):
+    with metrics.MODEL_LOAD_SECONDS.time(engine="t5"):
+        backend = load_backend(backend_name, _MODEL_IDS["t5"],
+                               export_dir=config.ONNX_DIR, load_mode=load_mode)
+        _precision_in_use["t5"] = _apply_precision(backend, precision)
+    metrics.MODELS_LOADED.set(1, engine="t5")
+    return backend
+
+
+@_cache_resource
+def _load_bart(precision: str = config.PRECISION, backend_name: str = config.BACKEND,
+               load_mode: str = config.LOAD_MODE):
+    with metrics.MODEL_LOAD_SECONDS.time(engine="bart"):
+        backend = load_backend(backend_name, _MODEL_IDS["bart"],
+                               export_dir=config.ONNX_DIR, load_mode=load_mode)
+        _precision_in_use["bart"] = _apply_precision(backend, precision)
+    metrics.MODELS_LOADED.set(1, engine="bart")
+    return backend
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  LONG-DOCUMENT HELPERS
+#
+#  Both models have a hard input window (T5 ≈ 512 tokens, distilbart ≈ 1024).
+#  Instead of letting truncation=True silently drop everything past it, long
+#  inputs are split into sentence-aligned chunks that each fit the window,
+#  every chunk is summarized (map), and the joined partial summaries are
+#  summarized again (reduce) until they fit a single pass.  Work grows
+#  linearly with the number of chunks.
+#
+#  Incremental mode (a chunk store is passed): chunk boundaries are chosen
+#  by sentence content rather than by packing, so an edit only moves the
+#  boundaries next to it, and each chunk's partial summary is kept under a
+#  hash of the chunk.  Re-running an edited document re-generates only the
+#  chunks that changed, then the final combine pass.
+# ─────────────────────────────────────────────────────────────────────────────
+
+_WINDOW_FALLBACK  = 512      # used when a tokenizer reports no sane limit
+_WINDOW_MARGIN    = 16       # headroom for special tokens / join spacing
+_MAX_REDUCE_DEPTH = 4        # safety net — each level shrinks text ≥2×
+_CUT_EVERY_TOKENS = 64       # stable chunks: 1 in (budget // this) sentences may end a chunk
+
+_GENERATION_KWARGS = dict(
+    do_sample=False,
+    repetition_penalty=1.3,
+    no_repeat_ngram_size=3,
+    early_stopping=True,
+)
+
+# Greedy decoding (num_beams=1): streaming, and the router's fast option.
+# early_stopping only applies to beam search.
+_GREEDY_KWARGS = dict(
+    {k: v for k, v in _GENERATION_KWARGS.items() if k != "early_stopping"},
+    num_beams=1,
+)
+
+
+# Summary length as a fraction of input tokens: (max ratio, min ratio).
+# min_length is kept well below max_length — forcing long minimums makes
+# generation slower without making summaries better.
+_LENGTH_RATIOS = {
+    "short":  (0.27, 0.08),
+    "medium": (0.42, 0.12),
+    "long":   (0.58, 0.20),
+}
+
+# Budgets follow the input length rounded up to a multiple of this, so
+# inputs of similar length get the same (max_len, min_len) and can share
+# one padded batch (generate() takes a single pair per call).
+_BUDGET_STEP_TOKENS = 64
+
+
+def _length_budget(tokens: int, detail: str):
+    """Return (max_len, min_len) in tokens for an input of `tokens` tokens."""
+    max_ratio, min_ratio = _LENGTH_RATIOS.get(detail, _LENGTH_RATIOS["medium"])
+    tokens = -(-max(1, tokens) // _BUDGET_STEP_TOKENS) * _BUDGET_STEP_TOKENS
+
+    max_len = max(20, min(int(tokens * max_ratio), 200))
+    min_len = max(10, min(int(tokens * min_ratio), max_len // 2))
+    return max_len, min_len
+
+
+def _generate_many(backend, inputs, max_len: int, min_len: int, batch_size: int,
+                   greedy: bool = False):
+    """Run `inputs` through the backend as padded batches of `batch_size`."""
+    outputs = backend.summarize(
+        inputs,
+        batch_size=batch_size,
+        max_length=max_len,
+        min_length=min_len,
+        **(_GREEDY_KWARGS if greedy else _GENERATION_KWARGS),
+    )
+    return [o.strip() for o in outputs]
+
+
+def _generate(backend, input_text: str, max_len: int, min_len: int,
+              greedy: bool = False) -> str:
+    return _generate_many(backend, [input_text], max_len, min_len, 1, greedy)[0]
+
+
+def _generate_bucketed(backend, inputs, lengths, budgets, batch_size: int,
+                       greedy: bool = False, batch_sizes: list = None):
+    """
+    Length bucketing: group inputs by their (max_len, min_len) budget, sort
+    each group by token length and run consecutive runs of `batch_size` as
+    one padded batch, so sequences in a batch are close in length and
+    padding stays small.  Only inputs with the same budget share a batch —
+    every output is generated with exactly the bounds a single request for
+    it would use, so it may be cached under the single-request key.
+
+    Returns outputs in the original input order.  `batch_sizes`, when
+    given, receives at each input's index the size of the batch it ran in.
+    """
+    groups = {}                                  # (max_len, min_len) → [idx], by length
+    for i in sorted(range(len(inputs)), key=lengths.__getitem__):
+        groups.setdefault(tuple(budgets[i]), []).append(i)
+
+    results = [""] * len(inputs)
+    for (max_len, min_len), members in groups.items():
+        for start in range(0, len(members), batch_size):
+            bucket  = members[start:start + batch_size]
+            outputs = _generate_many(
+                backend, [inputs[i] for i in bucket], max_len, min_len, batch_size, greedy
+            )
+            for i, out in zip(bucket, outputs):
+                results[i] = out
+                if batch_sizes is not None:
+                    batch_sizes[i] = len(bucket)
+
+    return results
+
+
+def _token_lengths(tokenizer, texts):
+    with TOKENIZER_LOCK:
+        encoded = tokenizer(list(texts), add_special_tokens=False)["input_ids"]
+    return [len(ids) for ids in encoded]
+
+
+def _count_tokens(tokenizer, text: str) -> int:
+    return _token_lengths(tokenizer, [text])[0]
+
+
+def _model_window(tokenizer) -> int:
+    """Tokens the tokenizer keeps before truncating (prefix and specials included)."""
+    window = tokenizer.model_max_length
+    if not window or window > 100_000:          # HF "unset" sentinel
+        window = _WINDOW_FALLBACK
+    return window
+
+
+def _input_budget(tokenizer, prefix: str) -> int:
+    """Tokens available for body text in one forward pass."""
+    return _model_window(tokenizer) - _count_tokens(tokenizer, prefix) - _WINDOW_MARGIN
+
+
+def _split_words(sentence: str, n_tokens: int, budget: int):
+    """Split a run-on sentence that alone exceeds the budget."""
+    words = sentence.split()
+    step  = max(1, int(len(words) * budget / n_tokens))
+    return [" ".join(words[i:i + step]) for i in range(0, len(words), step)]
+
+
+def _pack_chunks(sentences, budget: int):
+    """
+    Pack (sentence, tokens) pairs into chunks of at most `budget` tokens.
+    A generator over any iterable, so streamed input is packed as it
+    arrives.
+    """
+    current, used = [], 0
+    for sentence, n in sentences:
+        if used + n > budget and current:
+            yield " ".join(current)
+            current, used = [], 0
+        if n > budget:
+            yield from _split_words(sentence, n, budget)
+            continue
+        current.append(sentence)
+        used += n
+
+    if current:
+        yield " ".join(current)
+
+
+def _split_chunks(text: str, tokenizer, budget: int):
+    """Pack whole sentences into chunks of at most `budget` tokens."""
+    sentences = split_sentences(text)
+    return list(_pack_chunks(zip(sentences, _token_lengths(tokenizer, sentences)), budget))
+
+
+def _split_chunks_stable(text: str, tokenizer, budget: int):
+    """
+    Content-defined chunking: cut after a sentence whose CRC is divisible
+    by budget // _CUT_EVERY_TOKENS once the chunk holds half of the
+    budget, or where the next sentence would overflow it.  Cuts depend only
+    on nearby sentences, so chunks away from an edit keep their exact text.
+    """
+    sentences = split_sentences(text)
+    lengths   = _token_lengths(tokenizer, sentences)
+    divisor   = max(2, budget // _CUT_EVERY_TOKENS)
+    minimum   = budget // 2
+
+    chunks, current, used = [], [], 0
+    for sentence, n in zip(sentences, lengths):
+        if used + n > budget and current:
+            chunks.append(" ".join(current))
+            current, used = [], 0
+        if n > budget:
+            chunks.extend(_split_words(sentence, n, budget))
+            continue
+        current.append(sentence)
+        used += n
+        if used >= minimum and zlib.crc32(sentence.encode("utf-8")) % divisor == 0:
+            chunks.append(" ".join(current))
+            current, used = [], 0
+
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _map_chunks(backend, chunks, prefix: str, batch_size: int, greedy: bool,
+                chunk_store=None, counts: dict = None):
+    """
+    Partial summaries of `chunks`.  With a chunk store, partials found
+    under the chunk's hash are reused and only the rest are generated.
+    """
+    lengths = _token_lengths(backend.tokenizer, chunks)
+    budgets = [_length_budget(n, "medium") for n in lengths]
+    if chunk_store is None:
+        return _generate_bucketed(
+            backend, [prefix + c for c in chunks], lengths, budgets, batch_size, greedy
+        )
+
+    params   = {"greedy": greedy, "precision": config.PRECISION, "backend": config.BACKEND}
+    keys     = [make_key(prefix + c, "map", backend.tokenizer.name_or_path, params)
+                for c in chunks]
+    partials = [chunk_store.get(k) for k in keys]
+    missing  = [i for i, p in enumerate(partials) if p is None]
+    outputs  = _generate_bucketed(
+        backend,
+        [prefix + chunks[i] for i in missing],
+        [lengths[i] for i in missing],
+        [budgets[i] for i in missing],
+        batch_size,
+        greedy,
     )
+    for i, out in zip(missing, outputs):
+        partials[i] = out
+        chunk_store.put(keys[i], out)
+
+    if counts is not None:
+        counts["chunks"] = counts.get("chunks", 0) + len(chunks)
+        counts["chunks_reused"] = counts.get("chunks_reused", 0) + len(chunks) - len(missing)
+    return partials
+
+
+def _reduce_to_window(
+    backend,
+    text: str,
+    prefix: str,
+    batch_size: int = 1,
+    preselect: bool = False,
+    greedy: bool = False,
+    chunk_store=None,
+    counts: dict = None,
+) -> str:
+    """
+    Shrink `text` until it fits one forward pass.  Text that already fits
+    is returned unchanged.
+
+    preselect=False — map stage(s): replace the text with the joined
+                      summaries of its chunks until it fits.  The chunks
+                      of one level are independent, so they are generated
+                      as batches.
+    preselect=True  — extractive stage: keep the most central sentences
+                      (TF-IDF / TextRank) that fit the window, in original
+                      order.  One abstractive pass instead of many.
+
+    chunk_store     — incremental map stage: content-defined chunks, and
+                      partials reused across calls (see _map_chunks);
+                      `counts` receives chunks / chunks_reused.
+    """
+    tokenizer = backend.tokenizer
+    budget    = _input_budget(tokenizer, prefix)
+
+    if preselect:
+        return extractive_preselect(
+            text, budget, lambda sentences: _token_lengths(tokenizer, sentences)
+        )
+
+    split = _split_chunks if chunk_store is None else _split_chunks_stable
+    depth = 0
+    while _count_tokens(tokenizer, text) > budget and depth < _MAX_REDUCE_DEPTH:
+        chunks   = split(text, tokenizer, budget)
+        partials = _map_chunks(
+            backend, chunks, prefix, batch_size, greedy, chunk_store, counts
+        )
+        text   = " ".join(p for p in partials if p)
+        depth += 1
+
+    return text
 
 
-@st.cache_resource(show_spinner=False)
-def _load_bart():
-    from transformers import pipeline
-    return pipeline(
-        "summarization",
-        model="sshleifer/distilbart-cnn-6-6",  # 600 MB  (vs bart-large-cnn 1.6 GB)
-        device=-1,
-        framework="pt",
+def _summarize_long(
+    backend,
+    text: str,
+    prefix: str,
+    max_len: int,
+    min_len: int,
+    batch_size: int = 1,
+    preselect: bool = False,
+    greedy: bool = False,
+    chunk_store=None,
+    counts: dict = None,
+) -> str:
+    """Summarization for text that may exceed the model window."""
+    text = _reduce_to_window(
+        backend, text, prefix, batch_size, preselect, greedy, chunk_store, counts
     )
+    return _generate(backend, prefix + text, max_len, min_len, greedy)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  WORKER POOL + STREAMING
+#
+#  All request-path inference runs on one bounded InferencePool (see
+#  workers.py), so concurrent sessions share the cores instead of each
+#  oversubscribing them, and an overloaded server rejects work with
+#  PoolSaturated instead of queueing it forever.  Cache hits and rejected
+#  inputs are answered on the caller's thread; only model work is queued.
+#
+#  Streaming: the pool job pushes decoded text into a TextIteratorStreamer
+#  that the caller iterates.  Streamers cannot follow several beams at
+#  once, so streamed generation is greedy (num_beams=1).
+# ─────────────────────────────────────────────────────────────────────────────
+
+POOL = InferencePool(
+    workers=config.WORKERS,
+    threads_per_worker=config.THREADS_PER_WORKER,
+    max_pending=config.QUEUE_SIZE,
+)
+
+metrics.gauge(
+    "neuralsum_pool_jobs",
+    "Inference pool jobs running or waiting for a worker.",
+    labels=("state",),
+    fn=lambda: {
+        (state,): POOL.stats()[state] for state in ("inflight", "queued")
+    },
+)
+
+
+def _stream_job(backend, text: str, prefix: str, max_len: int, min_len: int,
+                long_document: bool, preselect: bool, streamer, chunk_store=None) -> float:
+    """
+    Pool job: fit the window (if needed), then the streamed final pass.
+    Returns the seconds spent, excluding time queued for a worker.
+    """
+    start = time.perf_counter()
+    try:
+        if long_document:
+            text = _reduce_to_window(
+                backend, text, prefix, _BATCH_SIZE, preselect, chunk_store=chunk_store
+            )
+        backend.generate(
+            backend.tokenize([prefix + text]),
+            max_length=max_len,
+            min_length=min_len,
+            streamer=streamer,
+            **_GREEDY_KWARGS,
+        )
+    except BaseException:
+        streamer.end()                           # unblock the consumer, then re-raise
+        raise
+    return time.perf_counter() - start
+
+
+def _stream_generate(backend, text: str, prefix: str, max_len: int, min_len: int,
+                     long_document: bool, preselect: bool, timing: dict = None,
+                     chunk_store=None):
+    """
+    Yield the decoded output so far, growing as tokens are generated.
+    When given, `timing["seconds"]` receives the job's compute time.
+    """
+    from transformers import TextIteratorStreamer
+
+    streamer = TextIteratorStreamer(
+        backend.tokenizer, skip_prompt=True, skip_special_tokens=True
+    )
+    future = POOL.submit(
+        _stream_job, backend, text, prefix, max_len, min_len, long_document, preselect,
+        streamer, chunk_store,
+    )
+
+    out = ""
+    for piece in streamer:
+        out += piece
+        yield out
+
+    seconds = future.result()                    # re-raise a failed generation here
+    if timing is not None:
+        timing["seconds"] = seconds
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  MODEL ROUTING
+# ─────────────────────────────────────────────────────────────────────────────
+
+_GARBAGE_MESSAGE = "Input text is too short for meaningful summarization."
+_REJECT_MESSAGE  = "Input was not summarized: {reasons}."
+_BATCH_SIZE      = 8
+
+SUMMARY_CACHE   = SummaryCache(max_entries=config.CACHE_SIZE, disk_dir=config.CACHE_DIR)
+NEAR_DUPLICATES = NearDuplicateIndex(            # max_entries 0 = disabled
+    threshold=config.NEAR_DUP_THRESHOLD,
+    max_entries=config.NEAR_DUP_SIZE if config.NEAR_DUP_THRESHOLD > 0 else 0,
+)
+COST_MODEL      = CostModel(config.COST_MODEL_PATH)
+
+# Incremental re-runs: partial summaries per session, bounded both ways.
+_SESSION_CHUNKS = 256                            # partials kept per session
+_MAX_SESSIONS   = 64                             # sessions kept by session_chunk_store()
+_sessions       = OrderedDict()                  # session id → SummaryCache
+_sessions_lock  = threading.Lock()
+
+
+_LOADERS = {"t5": _load_t5, "bart": _load_bart}
+_PREFIXES = {"t5": "summarize: ", "bart": ""}   # T5 requires a task prefix
+
+_INSTANT = "instant"                             # extractive only, no model
+_ALL_DETAILS = "all"                             # summarize_all_details() metric label
+
+_STREAM_HEAD      = 16_000    # chars read before a streamed input counts as long
+_STREAM_MAX_SPLIT = 8_000     # chars of unterminated text cut into a "sentence" anyway
+_INSTANT_WINDOW   = 400       # words per map chunk when streaming in instant mode
+
+
+# Auto sends inputs below this many T5 tokens (≈120 words) to T5.
+_AUTO_T5_MAX_TOKENS = 160
+
+
+def _resolve_model(model: str, doc: CleanedDocument):
+    """
+    Map the requested model to (engine key, model_used, input tokens)
+    without loading any model — only the engine's tokenizer.  Auto routes
+    on real T5 token counts, so inputs T5 would have to truncate or chunk
+    go to BART.  Every word is at least one token, so long inputs skip the
+    T5 count entirely.
+    """
+    if model in _LOADERS:
+        return model, model, _count_tokens(_load_tokenizer(model), doc.text)
+
+    if doc.word_count < _AUTO_T5_MAX_TOKENS:
+        t5_tokens = _count_tokens(_load_tokenizer("t5"), doc.text)
+        if t5_tokens < _AUTO_T5_MAX_TOKENS:
+            return "t5", "auto", t5_tokens
+
+    return "bart", "auto", _count_tokens(_load_tokenizer("bart"), doc.text)
+
+
+@dataclass(frozen=True)
+class _Plan:
+    engine: str
+    model_used: str
+    tokens: int
+    max_len: int
+    min_len: int
+    greedy: bool
+    predicted_s: float                           # None until the cost model has data
+
+
+_MIN_LENGTH_CAP = 20                             # the router never caps below this
+
+
+def _plan(model: str, doc: CleanedDocument, detail: str, latency_budget: float = None):
+    """
+    Choose engine and generation settings for one request.
+
+    Without a budget: the usual routing with the model's beam settings.
+    With `latency_budget` (seconds), candidates are tried in quality order —
+    the routed engine with beams, then greedy, then (Auto only) T5 with
+    beams, then greedy — and the first one the cost model predicts to
+    finish in time wins.  If none does, the fastest candidate runs with its
+    length cap lowered until it fits (never below _MIN_LENGTH_CAP tokens).
+    Candidates without enough recorded runs are skipped; with no data at
+    all the usual routing is used.
+    """
+    engine, model_used, tokens = _resolve_model(model, doc)
+    max_len, min_len = _length_budget(tokens, detail)
+    default = _Plan(
+        engine, model_used, tokens, max_len, min_len, False,
+        COST_MODEL.predict(engine, False, tokens, max_len),
+    )
+    if latency_budget is None:
+        return default
+
+    candidates = [(engine, False), (engine, True)]
+    if model == "auto" and engine != "t5":
+        candidates += [("t5", False), ("t5", True)]
+
+    over_budget = []
+    for candidate, greedy in candidates:
+        n = tokens if candidate == engine else _count_tokens(_load_tokenizer(candidate), doc.text)
+        hi, lo = _length_budget(n, detail)
+        predicted = COST_MODEL.predict(candidate, greedy, n, hi)
+        if predicted is None:
+            continue
+        if predicted <= latency_budget:
+            return _Plan(candidate, model_used, n, hi, lo, greedy, predicted)
+        over_budget.append((predicted, candidate, greedy, n, hi, lo))
+
+    if not over_budget:
+        return default
+
+    _, candidate, greedy, n, hi, lo = min(over_budget)
+    cap = COST_MODEL.largest_max_len(
+        candidate, greedy, n, latency_budget, _MIN_LENGTH_CAP, hi
+    ) or _MIN_LENGTH_CAP
+    return _Plan(
+        candidate, model_used, n, cap, min(lo, cap // 2), greedy,
+        COST_MODEL.predict(candidate, greedy, n, cap),
+    )
+
+
+def _cache_key(
+    text: str,
+    detail: str,
+    engine: str,
+    long_document: bool,
+    stream: bool = False,
+    preselect: bool = False,
+    greedy: bool = False,
+    max_len: int = None,
+    incremental: bool = False,
+) -> str:
+    if stream or greedy:                         # greedy decoding → different output
+        params = dict(_GREEDY_KWARGS)
+    else:
+        params = dict(_GENERATION_KWARGS)
+    if greedy and not stream:
+        params["greedy_map"] = True              # map stage greedy too (router)
+    if max_len is not None:
+        params["max_length"] = max_len           # cap lowered by the router
+    params["long_document"] = long_document
+    params["preselect"]     = preselect
+    params["incremental"]   = incremental        # content-defined chunks differ
+    params["length_ratios"] = _LENGTH_RATIOS
+    params["budget_step"]   = _BUDGET_STEP_TOKENS
+    params["precision"]     = config.PRECISION   # reduced precision drifts output
+    params["backend"]       = config.BACKEND
+    return make_key(text, detail, engine, params)
+
+
+def _near_duplicate(text: str, namespace: str):
+    """
+    (signature, reused) for `text`: its MinHash signature (None when the
+    index is off or the text too short) and the (value, similarity) of a
+    near-identical earlier input under the same settings, or None.
+    """
+    if NEAR_DUPLICATES.max_entries <= 0:
+        return None, None
+    sig    = near_dup_signature(text)
+    reused = NEAR_DUPLICATES.lookup(namespace, sig)
+    if reused is not None:
+        metrics.NEAR_DUPLICATE_REUSES.inc()
+    return sig, reused
+
+
+def _prepare(text) -> CleanedDocument:
+    """Accept raw text or an already cleaned document; clean only once."""
+    if isinstance(text, CleanedDocument):
+        return text
+    return clean_document(text)
+
+
+def _garbage_message(doc: CleanedDocument) -> str:
+    """What to return instead of a summary: the admission reasons, if admit() refused it."""
+    admission = doc.admission
+    if admission.verdict == "reject":
+        return _REJECT_MESSAGE.format(
+            reasons=describe_admission(admission.reasons, admission.dropped)
+        )
+    return _GARBAGE_MESSAGE
+
+
+def _finalize(summary: str) -> str:
+    summary = summary.strip()
+    if summary:
+        summary = summary[0].upper() + summary[1:]
+    return summary
+
+
+def _record_request(model: str, detail: str, doc: CleanedDocument = None, words: int = 0,
+                    admission: Admission = None):
+    """
+    Count one request, its input size and its admission outcome (cleaning
+    happens once per request).  `admission` stands in for doc.admission on
+    the streamed path, which has no whole document.
+    """
+    # labels come from callers (HTTP bodies too) — keep their cardinality bounded
+    model  = model  if model in ("auto", _INSTANT, *_LOADERS) else "other"
+    detail = detail if detail in _LENGTH_RATIOS or detail == _ALL_DETAILS else "other"
+    metrics.REQUESTS.inc(model=model, detail=detail)
+    metrics.INPUT_WORDS.observe(doc.word_count if doc is not None else words)
+    if doc is not None and doc.is_garbage:
+        metrics.GARBAGE_REJECTIONS.inc()
+
+    admission = admission or (doc.admission if doc is not None else None)
+    if admission is None:
+        return
+    for reason in admission.reasons:
+        metrics.ADMISSIONS.inc(verdict=admission.verdict, reason=reason)
+    for signal in ("alpha", "compress", "function"):
+        if admission.scores.get(signal) is not None:
+            metrics.ADMISSION_SCORES.observe(admission.scores[signal], signal=signal)
+
+
+def _admission_meta(admission: Admission) -> dict:
+    """meta["admission"]: verdict, reason codes, lines dropped per reason and the scores."""
+    return {
+        "verdict": admission.verdict,
+        "reasons": list(admission.reasons),
+        "dropped": dict(admission.dropped),
+        "scores":  dict(admission.scores),
+    }
+
+
+def _record_input(engine: str, tokens: int, long_document: bool):
+    """
+    Record the routed token count and whether generation will truncate it.
+    Only input past the real window counts — not the _WINDOW_MARGIN
+    headroom that chunking keeps.
+    """
+    metrics.INPUT_TOKENS.observe(tokens, engine=engine)
+    if long_document:
+        return
+    tokenizer = _load_tokenizer(engine)
+    kept = (_model_window(tokenizer) - _count_tokens(tokenizer, _PREFIXES[engine])
+            - tokenizer.num_special_tokens_to_add())
+    if tokens > kept:
+        metrics.TRUNCATIONS.inc(engine=engine)
+
+
+def _record_cost(backend, plan: _Plan, seconds: float, multi_pass: bool):
+    """
+    Feed one uncached run to the cost model.  Inputs past the window only
+    count when they took the map-reduce path (`multi_pass`) the predictions
+    are about — truncated or pre-selected runs would skew the fit.
+    """
+    window = _input_budget(backend.tokenizer, _PREFIXES[plan.engine])
+    if plan.tokens <= window or multi_pass:
+        COST_MODEL.record(plan.engine, plan.greedy, plan.tokens, plan.max_len, seconds)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  WARM-UP
+#
+#  Opt-in (NEURALSUM_WARMUP=t5,bart): a daemon thread loads the configured
+#  models at server start and runs one short generation on each, so weight
+#  download, deserialization and allocator / kernel set-up are paid before
+#  the first user arrives.  The UI polls model_status() instead of blocking.
+# ─────────────────────────────────────────────────────────────────────────────
+
+_WARMUP_TEXT = (
+    "The committee met on Tuesday to review the annual budget. Members agreed "
+    "to increase funding for public libraries and to delay the road project "
+    "until next spring, citing rising material costs."
+)
+
+_ready        = {engine: threading.Event() for engine in _LOADERS}
+_warming      = set()
+_warmup_lock  = threading.Lock()
+_warmup_start = False
+
+
+def _load(engine: str):
+    """Load (or fetch the cached) backend for `engine` and mark it ready."""
+    if not _ready[engine].is_set():
+        metrics.COLD_REQUESTS.inc(engine=engine)
+    backend = _LOADERS[engine]()
+    _ready[engine].set()
+    return backend
+
+
+def _warm(engines):
+    for engine in engines:
+        try:
+            backend = _LOADERS[engine]()
+            _generate(backend, _PREFIXES[engine] + _WARMUP_TEXT, 20, 10)
+            _ready[engine].set()
+        except Exception:
+            pass                                 # a failed warm-up just leaves it cold
+        finally:
+            with _warmup_lock:
+                _warming.discard(engine)
+
+
+def start_warmup(models=None) -> bool:
+    """
+    Start the background warm-up once per process.
+
+    Parameters
+    ----------
+    models : iterable of "t5" | "bart"; defaults to config.WARMUP_MODELS
+
+    Returns
+    -------
+    True if this call started the thread, False if it was already started
+    or there is nothing to warm.
+    """
+    global _warmup_start
+
+    engines = [m for m in (models or config.WARMUP_MODELS) if m in _LOADERS]
+    with _warmup_lock:
+        if _warmup_start or not engines:
+            return False
+        _warmup_start = True
+        _warming.update(engines)
+
+    threading.Thread(target=_warm, args=(engines,), name="neuralsum-warmup", daemon=True).start()
+    return True
+
+
+def preload(models) -> list:
+    """
+    Load `models` synchronously in the calling thread, without a warm-up
+    generation and without starting any thread — safe to call before
+    os.fork(), so forked workers inherit the weights instead of reloading.
+
+    Returns
+    -------
+    The engines that were loaded.
+    """
+    engines = [m for m in models if m in _LOADERS]
+    for engine in engines:
+        _LOADERS[engine]()
+        _ready[engine].set()
+    return engines
+
+
+def model_ready(engine: str) -> bool:
+    """True once `engine` is loaded (and, if warmed, has run its dummy generation)."""
+    return engine in _ready and _ready[engine].is_set()
+
+
+def model_status(engine: str) -> str:
+    """"ready" | "warming" | "cold" — non-blocking, safe to call on every rerun."""
+    if model_ready(engine):
+        return "ready"
+    with _warmup_lock:
+        return "warming" if engine in _warming else "cold"
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  PUBLIC API
 # ─────────────────────────────────────────────────────────────────────────────
 
-def summarize_text(text: str, detail: str = "medium", model: str = "auto"):
+def summarize_text(
+    text: str,
+    detail: str = "medium",
+    model: str = "auto",
+    long_document: bool = True,
+    return_meta: bool = False,
+    preselect: bool = config.PRESELECT,
+    latency_budget: float = None,
+    chunk_store=None,
+):
     """
     Parameters
     ----------
-    text   : raw user input (cleaning happens here)
-    detail : "short" | "medium" | "long"
-    model  : "auto"  | "t5"    | "bart"
+    text          : raw user input (cleaning happens here) or a
+                    CleanedDocument from text_cleaner.clean_document()
+    detail        : "short" | "medium" | "long"
+    model         : "auto"  | "t5"    | "bart" | "instant"
+                    "instant" is extractive only — no model is loaded.
+    long_document : when True, inputs longer than the model window are
+                    summarized chunk-by-chunk (map-reduce) so the whole
+                    text counts.  False restores plain truncation.
+    return_meta   : also return a metadata dict (see below)
+    preselect     : with long_document, fit overlong inputs to the window
+                    by extractive sentence selection instead of map-reduce
+                    (one abstractive pass; much faster on long inputs)
+    latency_budget: seconds the generation should fit in.  The cost model
+                    (fitted on this host's recorded runs) picks the engine,
+                    beam vs greedy decoding and, if needed, a shorter length
+                    cap predicted to meet it.  None = usual routing.
+    chunk_store   : incremental mode — a store from new_chunk_store() /
+                    session_chunk_store() kept across calls.  Long inputs are
+                    cut into content-defined chunks whose partial summaries
+                    are kept in it, so re-running an edited document only
+                    re-generates the changed chunks plus the final pass.
 
     Returns
     -------
     (summary: str, model_used: str)
-      model_used is one of: "t5" | "bart" | "auto"
+      model_used is one of: "t5" | "bart" | "auto" | "instant"
+
+    With return_meta=True: (summary, model_used, meta) where meta holds
+      engine    : "t5" | "bart" | "instant" | None (garbage input)
+      precision : "fp32" | "int8" | "bf16" — the mode actually in effect
+      cached    : True when served from the summary cache
+      reused    : True when the summary was generated for a near-identical
+                  earlier input (see near_duplicates.py); `similarity`
+                  then holds the estimated Jaccard similarity
+      backend   : "transformers" | "onnx"
+      input_tokens, max_length, min_length
+                : the token budget the generation ran with
+      greedy    : True when the router chose greedy decoding
+      predicted_s
+                : the cost model's latency estimate (None without data)
+      chunks, chunks_reused
+                : with a chunk_store, map-stage chunks and how many of
+                  them were reused (absent when the input fit one pass)
+      admission : what text_cleaner.admit() did before cleaning — verdict
+                  ("accept" | "reduce" | "reject"), reasons, lines dropped
+                  per reason, scores
+
+    The generation runs on the worker pool; raises PoolSaturated when the
+    pool is full.
     """
 
+    started = time.perf_counter()
+
+    def _out(summary, model_used, **meta):
+        meta["backend"] = config.BACKEND
+        meta["admission"] = _admission_meta(doc.admission)
+        meta.setdefault("reused", False)
+        metrics.REQUEST_SECONDS.observe(
+            time.perf_counter() - started, engine=meta["engine"] or "none"
+        )
+        return (summary, model_used, meta) if return_meta else (summary, model_used)
+
     # ── Clean + validate ────────────────────────────────────────────────────
-    text = clean_text(text)
-
-    if is_garbage_input(text):
-        return "Input text is too short for meaningful summarization.", "none"
-
-    words = len(text.split())
-
-    # ── Dynamic length control ───────────────────────────────────────────────
-    if detail == "short":
-        max_len = int(words * 0.35)
-        min_len = int(words * 0.15)
-    elif detail == "long":
-        max_len = int(words * 0.75)
-        min_len = int(words * 0.40)
-    else:                                        # medium (default)
-        max_len = int(words * 0.55)
-        min_len = int(words * 0.25)
-
-    max_len = max(20, min(max_len, 200))
-    min_len = max(10, min(min_len, max_len - 5))
-
-    # ── Model selection + lazy load ──────────────────────────────────────────
-    if model == "bart":
-        pipe       = _load_bart()
-        model_used = "bart"
-        input_text = text                        # BART needs no task prefix
-
-    elif model == "t5":
-        pipe       = _load_t5()
-        model_used = "t5"
-        input_text = "summarize: " + text        # T5 requires task prefix
-
-    else:                                        # auto
-        if words >= 120:
-            pipe       = _load_bart()
-            model_used = "auto"
-            input_text = text
+    doc = _prepare(text)
+    _record_request(model, detail, doc)
+
+    if doc.is_garbage:
+        return _out(_garbage_message(doc), "none", engine=None, precision=None, cached=False)
+
+    text = doc.text
+
+    if model == _INSTANT:
+        summary = _finalize(extractive_summary(text, detail))
+        return _out(summary, _INSTANT, engine=_INSTANT, precision=None, cached=False)
+
+    # ── Routing + token-based length control ─────────────────────────────────
+    plan = _plan(model, doc, detail, latency_budget)
+    engine, model_used, max_len, min_len = plan.engine, plan.model_used, plan.max_len, plan.min_len
+    _record_input(engine, plan.tokens, long_document)
+    budget = dict(
+        input_tokens=plan.tokens, max_length=max_len, min_length=min_len,
+        greedy=plan.greedy, predicted_s=plan.predicted_s,
+    )
+
+    # ── Cache lookup ─────────────────────────────────────────────────────────
+    capped   = max_len if max_len != _length_budget(plan.tokens, detail)[0] else None
+    settings = (detail, engine, long_document)
+    options  = dict(preselect=preselect, greedy=plan.greedy, max_len=capped,
+                    incremental=chunk_store is not None)
+    key      = _cache_key(text, *settings, **options)
+    cached   = SUMMARY_CACHE.get(key)
+    if cached is not None:
+        return _out(
+            *cached,
+            engine=engine,
+            precision=_precision_in_use.get(engine, config.PRECISION),
+            cached=True,
+            **budget,
+        )
+
+    # ── Near-duplicate lookup (same settings, text left out of the key) ──────
+    namespace   = _cache_key("", *settings, **options)
+    sig, reused = _near_duplicate(text, namespace)
+    if reused is not None:
+        value, similarity = reused
+        return _out(
+            *value,
+            engine=engine,
+            precision=_precision_in_use.get(engine, config.PRECISION),
+            cached=True,
+            reused=True,
+            similarity=round(similarity, 3),
+            **budget,
+        )
+
+    # ── Lazy load + inference, on the worker pool ───────────────────────────
+    def _infer():
+        backend = _load(engine)
+        prefix  = _PREFIXES[engine]
+        generation_start = time.perf_counter()
+        if long_document:
+            result = _summarize_long(
+                backend, text, prefix, max_len, min_len, _BATCH_SIZE, preselect, plan.greedy,
+                chunk_store, counts,
+            )
         else:
-            pipe       = _load_t5()
-            model_used = "auto"
-            input_text = "summarize: " + text
+            result = _generate(backend, prefix + text, max_len, min_len, plan.greedy)
+        _record_cost(
+            backend, plan, time.perf_counter() - generation_start,
+            multi_pass=long_document and not preselect and not counts.get("chunks_reused"),
+        )
+        return result
 
-    # ── Inference ────────────────────────────────────────────────────────────
-    result = pipe(
-        input_text,
-        max_length=max_len,
-        min_length=min_len,
-        do_sample=False,
-        repetition_penalty=1.3,
-        no_repeat_ngram_size=3,
-        early_stopping=True,
-        truncation=True,
-    )[0]["summary_text"]
-
-    summary = result.strip()
-    if summary:
-        summary = summary[0].upper() + summary[1:]
+    counts = {}
+    result = POOL.run(_infer)
+
+    value = (_finalize(result), model_used)
+    SUMMARY_CACHE.put(key, value)
+    NEAR_DUPLICATES.add(namespace, sig, value)
+    return _out(
+        *value,
+        engine=engine,
+        precision=_precision_in_use.get(engine),
+        cached=False,
+        **budget,
+        **counts,
+    )
+
+
+def summarize_text_stream(
+    text: str,
+    detail: str = "medium",
+    model: str = "auto",
+    long_document: bool = True,
+    preselect: bool = config.PRESELECT,
+    chunk_store=None,
+):
+    """
+    Streaming variant of summarize_text().
+
+    Yields (summary_so_far: str, model_used: str) tuples while the final
+    pass is generated; the last tuple holds the finished summary.  For long
+    documents the map stage runs first (not streamed) and the final reduce
+    pass is streamed.  Decoding is greedy, so output can differ slightly
+    from summarize_text(), which uses the model's beam settings.
+    model="instant" yields the extractive summary once.  chunk_store
+    enables incremental re-runs as in summarize_text(), and a near-identical
+    earlier streamed input is reused as there (yielded once).
+
+    Generation runs on the shared worker pool; raises PoolSaturated when
+    the pool is full.
+    """
+
+    started = time.perf_counter()
+
+    # ── Clean + validate ────────────────────────────────────────────────────
+    doc = _prepare(text)
+    _record_request(model, detail, doc)
+
+    if doc.is_garbage:
+        yield _garbage_message(doc), "none"
+        return
+
+    text = doc.text
+
+    if model == _INSTANT:
+        yield _finalize(extractive_summary(text, detail)), _INSTANT
+        return
+
+    plan = _plan(model, doc, detail)
+    engine, model_used, max_len, min_len = plan.engine, plan.model_used, plan.max_len, plan.min_len
+    _record_input(engine, plan.tokens, long_document)
+
+    # ── Cache lookup ─────────────────────────────────────────────────────────
+    settings = (detail, engine, long_document)
+    options  = dict(stream=True, preselect=preselect, incremental=chunk_store is not None)
+    key      = _cache_key(text, *settings, **options)
+    cached   = SUMMARY_CACHE.get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    # ── Near-duplicate lookup (same settings, text left out of the key) ──────
+    namespace   = _cache_key("", *settings, **options)
+    sig, reused = _near_duplicate(text, namespace)
+    if reused is not None:
+        yield reused[0]
+        return
+
+    # ── Lazy load, then map stage + streamed final pass on the pool ──────────
+    backend = _load(engine)
+    prefix  = _PREFIXES[engine]
+
+    partial, timing = "", {}
+    for partial in _stream_generate(
+        backend, text, prefix, max_len, min_len, long_document, preselect, timing,
+        chunk_store,
+    ):
+        yield _finalize(partial), model_used
+
+    # the map stage (if any) used beams, so only single-pass runs are greedy samples
+    _record_cost(backend, replace(plan, greedy=True), timing["seconds"], multi_pass=False)
+
+    value = (_finalize(partial), model_used)
+    SUMMARY_CACHE.put(key, value)
+    NEAR_DUPLICATES.add(namespace, sig, value)
+    metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, engine=engine)
+    yield value
+
+
+def _timed(fn, *args, **kwargs):
+    """Pool job: (fn's result, seconds it ran — excluding time queued)."""
+    start  = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _combine_partials(partials, source_tokens: int, detail: str, model: str,
+                      preselect: bool):
+    """
+    Reduce pass of summarize_documents(): (summary, model_used) of the
+    joined per-document summaries.  When they already fit the length a
+    summary of all `source_tokens` would have, they are returned as they
+    are; otherwise one generation (map-reduce if over the window) shortens
+    them to it.  The partials are model output, so there is no admission
+    check, and nothing is counted as a request.
+    """
+    joined = " ".join(partials)
+    doc    = CleanedDocument(joined, len(joined.split()), 1.0, False)
+    if model == _INSTANT:
+        if doc.word_count <= _length_budget(source_tokens, detail)[0]:
+            return joined, _INSTANT
+        return _finalize(extractive_summary(joined, detail)), _INSTANT
+
+    engine, model_used, tokens = _resolve_model(model, doc)
+    max_len, min_len = _length_budget(source_tokens, detail)
+    if tokens <= max_len:
+        return joined, model_used
+
+    key    = _cache_key(joined, detail, engine, True, preselect=preselect, max_len=max_len)
+    cached = SUMMARY_CACHE.get(key)
+    if cached is not None:
+        return cached
+    summary = _summarize_long(
+        _load(engine), joined, _PREFIXES[engine], max_len, min_len, _BATCH_SIZE, preselect,
+    )
+    value = (_finalize(summary), model_used)
+    SUMMARY_CACHE.put(key, value)
+    return value
+
+
+def summarize_documents(
+    texts,
+    detail: str = "medium",
+    model: str = "auto",
+    long_document: bool = True,
+    preselect: bool = config.PRESELECT,
+    timeout: float = None,
+):
+    """
+    One combined summary of several documents.
+
+    Every document is cleaned, garbage-filtered and summarized on its own
+    (map), all of them concurrently on the worker pool; the per-document
+    summaries, in input order, are then summarized once more (reduce) —
+    unless, joined, they already fit the length a summary of all the
+    documents would have.
+    Wall time follows the pool's worker count rather than the number of
+    documents.  Submitting waits for queue space instead of raising
+    PoolSaturated, so a large set applies backpressure — up to `timeout`
+    seconds per job when given; then PoolSaturated is raised and the
+    jobs still queued are cancelled.
+
+    Parameters
+    ----------
+    texts         : iterable of raw inputs or CleanedDocuments
+    detail        : "short" | "medium" | "long" — for every summary
+    model         : "auto"  | "t5"    | "bart" | "instant"
+    long_document : see summarize_text()
+    preselect     : see summarize_text()
+    timeout       : seconds each job may wait for queue space (None = no limit)
+
+    Returns
+    -------
+    (summary: str, model_used: str, report: dict)
+      report["documents"] — per input, in order: summary, model_used,
+                            words, seconds (compute time), cached, skipped
+                            (True for garbage input), reasons (admission
+                            reason codes — why it was skipped or reduced)
+      report["reduce_s"], report["total_s"] — combine pass and wall time
+    """
+    started = time.perf_counter()
+    docs    = [_prepare(t) for t in texts]
+    source_tokens = 0
+    futures = []
+    try:
+        for doc in docs:
+            futures.append(None if doc.is_garbage else POOL.submit(
+                _timed, summarize_text, doc, detail, model, long_document,
+                return_meta=True, preselect=preselect, timeout=timeout,
+            ))
+    except PoolSaturated:
+        for future in futures:
+            if future is not None:
+                future.cancel()
+        raise
+
+    documents = []
+    for doc, future in zip(docs, futures):
+        if future is None:
+            _record_request(model, detail, doc)
+            documents.append(dict(
+                summary=_garbage_message(doc), model_used="none", words=doc.word_count,
+                seconds=0.0, cached=False, skipped=True, reasons=list(doc.admission.reasons),
+            ))
+            continue
+        (summary, model_used, meta), seconds = future.result()
+        documents.append(dict(
+            summary=summary, model_used=model_used, words=doc.word_count,
+            seconds=round(seconds, 3), cached=meta["cached"], skipped=False,
+            reasons=list(doc.admission.reasons),
+        ))
+        source_tokens += meta.get("input_tokens") or doc.word_count    # instant: words
+
+    partials = [d for d in documents if not d["skipped"]]
+    reduce_s = 0.0
+    if not partials:
+        summary, model_used = _GARBAGE_MESSAGE, "none"
+    elif len(partials) == 1:
+        summary, model_used = partials[0]["summary"], partials[0]["model_used"]
+    else:
+        (summary, model_used), reduce_s = POOL.submit(
+            _timed, _combine_partials, [d["summary"] for d in partials], source_tokens,
+            detail, model, preselect, timeout=timeout,
+        ).result()
+
+    return summary, model_used, {
+        "documents": documents,
+        "reduce_s":  round(reduce_s, 3),
+        "total_s":   round(time.perf_counter() - started, 3),
+    }
+
+
+def _stream_sentences(pieces, lengths):
+    """
+    (sentence, tokens) pairs from cleaned text pieces.  Only the last,
+    possibly unfinished sentence is held back between pieces.
+    """
+    buffer = ""
+    for piece in pieces:
+        buffer    = f"{buffer} {piece}" if buffer else piece
+        sentences = split_sentences(buffer)
+        buffer    = sentences.pop() if sentences else ""
+        if len(buffer) > _STREAM_MAX_SPLIT:
+            sentences.append(buffer)
+            buffer = ""
+        if sentences:
+            yield from zip(sentences, lengths(sentences))
+    if buffer:
+        yield from zip([buffer], lengths([buffer]))
+
+
+def _batched(items, size: int):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def summarize_chunked(
+    pieces,
+    detail: str = "medium",
+    model: str = "auto",
+    batch_size: int = _BATCH_SIZE,
+    return_meta: bool = False,
+    dropped: dict = None,
+):
+    """
+    Summarize a document that arrives as cleaned text pieces (see
+    text_cleaner.stream_document) without ever holding it whole.
+
+    Sentences are packed into window-sized chunks as the pieces arrive and
+    every `batch_size` chunks are summarized together (map); only the
+    partial summaries are kept.  The joined partials then go through the
+    usual reduce.  Inputs that turn out to be short (under _STREAM_HEAD
+    characters) take the regular summarize_text() path instead.  There is
+    no length cap and no summary cache on the chunked path.
+
+    Parameters
+    ----------
+    pieces      : iterable of cleaned text pieces, in document order
+    detail      : "short" | "medium" | "long"
+    model       : "auto"  | "t5"    | "bart" | "instant"
+    batch_size  : chunks per forward pass
+    return_meta : also return a meta dict with engine, words and admission
+                  (plus input_tokens and chunks on the chunked path)
+    dropped     : the dict stream_document() counts dropped lines into —
+                  merged into the reported admission
+
+    Returns
+    -------
+    (summary, model_used) — or (summary, model_used, meta)
+    """
+    started = time.perf_counter()
+    pieces  = iter(pieces)
+
+    # ── Peek: short inputs take the regular path ─────────────────────────────
+    head = []
+    size = 0
+    for piece in pieces:
+        head.append(piece)
+        size += len(piece) + 1
+        if size > _STREAM_HEAD:
+            break
+    else:
+        doc = clean_document(" ".join(head))
+        doc = replace(doc, admission=with_dropped(doc.admission, dropped))
+        if not return_meta:
+            return summarize_text(doc, detail, model)
+        summary, model_used, meta = summarize_text(doc, detail, model, return_meta=True)
+        return summary, model_used, dict(meta, words=doc.word_count)
+
+    sample = clean_document(" ".join(head))      # garbage check on the opening
+    if sample.is_garbage:
+        sample = replace(sample, admission=with_dropped(sample.admission, dropped))
+        _record_request(model, detail, sample)
+        meta = dict(engine=None, words=sample.word_count, input_tokens=0, chunks=0,
+                    admission=_admission_meta(sample.admission))
+        message = _garbage_message(sample)
+        return (message, "none", meta) if return_meta else (message, "none")
+
+    stats = {"words": 0}
+
+    def counted(stream):
+        for piece in stream:
+            stats["words"] += piece.count(" ") + 1
+            yield piece
+
+    stream = counted(itertools.chain(head, pieces))
+
+    # ── Map: pack and summarize chunks as they arrive ────────────────────────
+    if model == _INSTANT:
+        engine, model_used = _INSTANT, _INSTANT
+        count     = lambda sentences: [len(s.split()) for s in sentences]
+        sentences = _stream_sentences(stream, count)
+        partials  = [
+            extractive_summary(chunk, "medium")
+            for chunk in _pack_chunks(sentences, _INSTANT_WINDOW)
+        ]
+        chunks, tokens = len(partials), None
+        summary = extractive_summary(" ".join(partials), detail)
+    else:
+        engine     = model if model in _LOADERS else "bart"   # long → Auto picks BART
+        model_used = model if model in _LOADERS else "auto"
+        backend    = _load(engine)
+        prefix     = _PREFIXES[engine]
+        budget     = _input_budget(backend.tokenizer, prefix)
+
+        def lengths(sentences):
+            n = _token_lengths(backend.tokenizer, sentences)
+            stats["tokens"] = stats.get("tokens", 0) + sum(n)
+            return n
+
+        partials = []
+        chunks   = 0
+        for batch in _batched(_pack_chunks(_stream_sentences(stream, lengths), budget),
+                              batch_size):
+            partials.extend(p for p in _map_chunks(backend, batch, prefix, batch_size, False) if p)
+            chunks += len(batch)
+
+        # ── Reduce ───────────────────────────────────────────────────────────
+        tokens  = stats.get("tokens", 0)
+        summary = _summarize_long(
+            backend, " ".join(partials), prefix, *_length_budget(tokens, detail), batch_size
+        )
+
+    admission = with_dropped(sample.admission, dropped)
+    _record_request(model, detail, words=stats["words"], admission=admission)
+    metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, engine=engine)
+
+    value = (_finalize(summary), model_used)
+    if not return_meta:
+        return value
+    return (*value, dict(engine=engine, words=stats["words"], input_tokens=tokens,
+                         chunks=chunks, admission=_admission_meta(admission)))
+
+
+def summarize_file(stream, detail: str = "medium", model: str = "auto", html: bool = False,
+                   return_meta: bool = False):
+    """
+    Read, clean and summarize an uploaded file (binary file object) on the
+    worker pool — see summarize_chunked().  html=True strips markup first;
+    boilerplate / non-prose lines are dropped as the file streams in.
+    Raises PoolSaturated when the pool is full.
+    """
+    dropped = {}
+    return POOL.submit(
+        summarize_chunked, stream_document(stream, html, dropped), detail, model,
+        return_meta=return_meta, dropped=dropped,
+    ).result()
+
+
+def _summarize_all_details(text, model: str, long_document: bool, preselect: bool,
+                           return_meta: bool):
+    started = time.perf_counter()
+    details = tuple(_LENGTH_RATIOS)
+
+    def _out(summaries, model_used, **meta):
+        meta["backend"] = config.BACKEND
+        meta["admission"] = _admission_meta(doc.admission)
+        metrics.REQUEST_SECONDS.observe(
+            time.perf_counter() - started, engine=meta["engine"] or "none"
+        )
+        return (summaries, model_used, meta) if return_meta else (summaries, model_used)
+
+    doc = _prepare(text)
+    _record_request(model, _ALL_DETAILS, doc)
+    if doc.is_garbage:
+        return _out(dict.fromkeys(details, _garbage_message(doc)), "none", engine=None, cached=[])
+
+    text = doc.text
+    if model == _INSTANT:
+        summaries = {d: _finalize(extractive_summary(text, d)) for d in details}
+        return _out(summaries, _INSTANT, engine=_INSTANT, cached=[])
+
+    engine, model_used, tokens = _resolve_model(model, doc)
+    _record_input(engine, tokens, long_document)
+    budgets = {d: _length_budget(tokens, d) for d in details}
+
+    # same keys as summarize_text(), so both paths fill each other's cache
+    keys      = {d: _cache_key(text, d, engine, long_document, preselect=preselect)
+                 for d in details}
+    summaries = {d: SUMMARY_CACHE.get(keys[d]) for d in details}
+    cached    = [d for d in details if summaries[d] is not None]
+    missing   = [d for d in details if summaries[d] is None]
+
+    if missing:
+        backend = _load(engine)
+        prefix  = _PREFIXES[engine]
+        if long_document:                        # the map stage does not depend on detail
+            text = _reduce_to_window(backend, text, prefix, _BATCH_SIZE, preselect)
+        outputs = backend.summarize_lengths(
+            prefix + text, [budgets[d] for d in missing], **_GENERATION_KWARGS
+        )
+        for d, out in zip(missing, outputs):
+            summaries[d] = (_finalize(out.strip()), model_used)
+            SUMMARY_CACHE.put(keys[d], summaries[d])
+
+    return _out(
+        {d: summaries[d][0] for d in details},
+        model_used,
+        engine=engine,
+        cached=cached,
+        input_tokens=tokens,
+        budgets={d: list(budgets[d]) for d in details},
+    )
+
+
+def summarize_all_details(
+    text,
+    model: str = "auto",
+    long_document: bool = True,
+    return_meta: bool = False,
+    preselect: bool = config.PRESELECT,
+):
+    """
+    Short, medium and long summaries of one input in a single request.
+
+    Cleaning, routing, the map stage (long documents), tokenization and
+    the encoder forward pass run once; only the decoder runs per detail
+    level.  Outputs match summarize_text() at each level and share its
+    cache entries.  Runs on the worker pool; raises PoolSaturated when the
+    pool is full.
+
+    Returns
+    -------
+    ({"short": str, "medium": str, "long": str}, model_used: str)
+
+    With return_meta=True, also a meta dict: engine, backend, cached (the
+    levels served from the cache), input_tokens and budgets (max / min
+    length per level).
+    """
+    return POOL.submit(
+        _summarize_all_details, text, model, long_document, preselect, return_meta
+    ).result()
+
+
+def summarize_text_async(text, detail: str = "medium", model: str = "auto", **kwargs):
+    """
+    Queue summarize_text() on the worker pool and return a
+    concurrent.futures.Future resolving to its usual return value.
+    Raises PoolSaturated immediately when the pool is full.
+    """
+    return POOL.submit(summarize_text, text, detail, model, **kwargs)
+
+
+def pool_stats() -> dict:
+    """Worker count, thread allocation, in-flight / queued jobs, rejections."""
+    return POOL.stats()
+
+
+def auto_engine(text) -> str:
+    """Engine Auto would pick for `text` ("t5" | "bart"); loads tokenizers only."""
+    doc = _prepare(text)
+    return _resolve_model("auto", doc)[0] if doc.text else "t5"
+
+
+def predict_latency(text, detail: str = "medium", model: str = "auto",
+                    stream: bool = False):
+    """
+    (engine, seconds) the cost model predicts for summarizing `text` with
+    the default settings — greedy when `stream` (summarize_text_stream).
+    seconds is None until the host has recorded enough runs, and for
+    "instant".  Loads tokenizers only.
+    """
+    doc = _prepare(text)
+    if model == _INSTANT or not doc.text:
+        return (_INSTANT if model == _INSTANT else "t5"), None
+    plan = _plan(model, doc, detail)
+    if stream:
+        return plan.engine, COST_MODEL.predict(plan.engine, True, plan.tokens, plan.max_len)
+    return plan.engine, plan.predicted_s
+
+
+def input_hint(text, detail: str = "medium", model: str = "auto"):
+    """
+    (auto_engine, state, seconds) for the input panel, in one call: the
+    engine Auto would pick, its model_status(), and the predicted seconds
+    of a streamed run with `model` at `detail` (None for "all", "instant"
+    or too few recorded runs).  Loads tokenizers only.
+    """
+    doc     = _prepare(text)
+    seconds = None
+    if detail != _ALL_DETAILS:
+        _, seconds = predict_latency(doc, detail, model, stream=True)
+    engine = auto_engine(doc)
+    return engine, model_status(engine), seconds
+
+
+def model_info() -> dict:
+    """Precision actually in effect for each engine loaded so far."""
+    return {engine: {"precision": p} for engine, p in _precision_in_use.items()}
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters and occupancy of the summary cache and near-duplicate index."""
+    return dict(SUMMARY_CACHE.stats(), near_duplicates=NEAR_DUPLICATES.stats())
+
+
+def new_chunk_store() -> SummaryCache:
+    """An empty store of partial summaries for incremental re-runs (one per session)."""
+    return SummaryCache(max_entries=_SESSION_CHUNKS)
+
+
+def session_chunk_store(session: str) -> SummaryCache:
+    """
+    The chunk store of `session`, created on first use.  Only the
+    _MAX_SESSIONS most recently used sessions keep theirs.
+    """
+    with _sessions_lock:
+        store = _sessions.get(session)
+        if store is None:
+            store = _sessions[session] = new_chunk_store()
+        _sessions.move_to_end(session)
+        while len(_sessions) > _MAX_SESSIONS:
+            _sessions.popitem(last=False)
+        return store
+
+
+def metrics_text() -> str:
+    """Per-stage timings, request counters and process gauges (Prometheus text)."""
+    return metrics.render()
+
+
+def summarize_batch(
+    texts,
+    detail: str = "medium",
+    model: str = "auto",
+    batch_size: int = _BATCH_SIZE,
+    long_document: bool = True,
+    preselect: bool = config.PRESELECT,
+    timing: dict = None,
+):
+    """
+    Batched counterpart of summarize_text() for bulk jobs.
+
+    Inputs are grouped by resolved model, then by length budget (token
+    counts rounded to _BUDGET_STEP_TOKENS) and similar token length, and
+    each group runs as one padded batch — so every summary equals what
+    summarize_text() would produce (and caches) for it.  Inputs longer
+    than the model window take the map-reduce path (whose chunks are
+    batched as well).
+
+    Parameters
+    ----------
+    texts         : iterable of raw user inputs or CleanedDocuments
+    detail        : "short" | "medium" | "long"
+    model         : "auto"  | "t5"    | "bart" | "instant"
+    batch_size    : sequences per forward pass
+    long_document : see summarize_text()
+    preselect     : see summarize_text()
+    timing        : when given, timing["batch_sizes"] receives per input the
+                    size of the forward batch that generated it — 0 when no
+                    model ran (cache hit, rejected, instant), 1 for inputs
+                    that took the map-reduce path
+
+    Returns
+    -------
+    list of (summary: str, model_used: str), in input order
+    """
+    texts   = list(texts)
+    results = [None] * len(texts)
+    sizes   = [0] * len(texts)
+    groups  = {}                                 # engine → [(idx, text, tokens, model_used, key)]
+    indexed = {}                                 # idx → (near-duplicate namespace, signature)
+
+    # ── Clean, validate, route, consult cache ────────────────────────────────
+    for i, raw in enumerate(texts):
+        doc = _prepare(raw)
+        _record_request(model, detail, doc)
+        if doc.is_garbage:
+            results[i] = (_garbage_message(doc), "none")
+            continue
+        if model == _INSTANT:
+            results[i] = (_finalize(extractive_summary(doc.text, detail)), _INSTANT)
+            continue
+        engine, model_used, tokens = _resolve_model(model, doc)
+        _record_input(engine, tokens, long_document)
+        key    = _cache_key(doc.text, detail, engine, long_document, preselect=preselect)
+        cached = SUMMARY_CACHE.get(key)
+        if cached is not None:
+            results[i] = cached
+            continue
+        namespace   = _cache_key("", detail, engine, long_document, preselect=preselect)
+        sig, reused = _near_duplicate(doc.text, namespace)
+        if reused is not None:
+            results[i] = reused[0]
+            continue
+        indexed[i] = (namespace, sig)
+        groups.setdefault(engine, []).append((i, doc.text, tokens, model_used, key))
+
+    # ── One model at a time ──────────────────────────────────────────────────
+    for engine, items in groups.items():
+        backend = _load(engine)
+        prefix  = _PREFIXES[engine]
+        window  = _input_budget(backend.tokenizer, prefix)
+
+        fits = []
+        for item in items:
+            i, text, tokens, model_used, key = item
+            if long_document and tokens > window:
+                summary    = _summarize_long(
+                    backend, text, prefix, *_length_budget(tokens, detail), batch_size,
+                    preselect,
+                )
+                results[i] = (_finalize(summary), model_used)
+                sizes[i]   = 1
+                SUMMARY_CACHE.put(key, results[i])
+            else:
+                fits.append(item)
+
+        if not fits:
+            continue
+
+        fit_sizes = [0] * len(fits)
+        outputs   = _generate_bucketed(
+            backend,
+            [prefix + item[1] for item in fits],
+            [item[2] for item in fits],
+            [_length_budget(item[2], detail) for item in fits],
+            batch_size,
+            batch_sizes=fit_sizes,
+        )
+        for item, summary, size in zip(fits, outputs, fit_sizes):
+            results[item[0]] = (_finalize(summary), item[3])
+            sizes[item[0]]   = size
+            SUMMARY_CACHE.put(item[4], results[item[0]])
 
-    return summary, model_used
+    for i, (namespace, sig) in indexed.items():
+        NEAR_DUPLICATES.add(namespace, sig, results[i])
+    if timing is not None:
+        timing["batch_sizes"] = sizes
+    return results
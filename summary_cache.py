@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  SUMMARY CACHE
+#
+#  Content-addressed: the key is a SHA-256 over the cleaned text plus every
+#  setting that changes the output (detail, resolved model, generation
+#  parameters), so identical requests from any session share one entry.
+#
+#  Memory tier — bounded OrderedDict with LRU eviction.
+#  Disk tier   — optional directory of small JSON files that survives
+#                restarts; a disk hit is promoted back into memory.
+# ─────────────────────────────────────────────────────────────────────────────
+
+def make_key(text: str, detail: str, model: str, params: dict) -> str:
+    payload = json.dumps([text, detail, model, params], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    def __init__(self, max_entries: int = 256, disk_dir: str = None):
+        self.max_entries = max_entries
+        self.disk_dir    = disk_dir
+        self._entries    = OrderedDict()
+        self._lock       = threading.Lock()
+        self.hits        = 0
+        self.disk_hits   = 0
+        self.misses      = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    # ── helpers ──────────────────────────────────────────────────────────────
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], key + ".json")
+
+    def _remember(self, key: str, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str):
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return tuple(json.load(f))
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, value):
+        path = self._path(key)
+        tmp  = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(list(value), f)
+            os.replace(tmp, path)                # atomic — readers never see half a file
+        except OSError:
+            pass                                 # the disk tier is best-effort
+
+    # ── public ───────────────────────────────────────────────────────────────
+    def get(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        value = self._read_disk(key) if self.disk_dir else None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            if self.max_entries > 0:
+                self._remember(key, value)
+            return value
+
+    def put(self, key: str, value):
+        if self.max_entries > 0:
+            with self._lock:
+                self._remember(key, value)
+        if self.disk_dir:
+            self._write_disk(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits":      self.hits,
+                "disk_hits": self.disk_hits,
+                "misses":    self.misses,
+                "hit_rate":  (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "size":      len(self._entries),
+                "capacity":  self.max_entries,
+            }
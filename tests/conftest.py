@@ -0,0 +1,105 @@
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+# the modules live flat at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeTokenizer:
+    """One token per whitespace-separated word; "decoding" returns the words."""
+
+    model_max_length = 512
+
+    def __init__(self, name="fake"):
+        self.name_or_path = name
+
+    def __call__(self, texts, add_special_tokens=True, **kwargs):
+        return {"input_ids": [text.split() for text in texts]}
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 1
+
+    def batch_decode(self, rows, **kwargs):
+        return [" ".join(row) for row in rows]
+
+
+class FakeModel:
+    """
+    Seq2seq stand-in: the "summary" is the first max_length input words,
+    as long as a real summary that fills its cap.  Every generate() call
+    is recorded as (batch rows, max_length, min_length).
+    """
+
+    config            = SimpleNamespace(task_specific_params=None)
+    generation_config = None
+
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, input_ids, max_length, min_length, **kwargs):
+        self.calls.append((len(input_ids), max_length, min_length))
+        return [row[:max_length] for row in input_ids]
+
+
+@pytest.fixture
+def fake_models(monkeypatch):
+    """
+    Point summarizer at fake t5 / bart backends, not yet loaded, and fresh
+    caches; returns {engine: backend}, each with backend.model.calls.
+    """
+    import summarizer
+    from backends import InferenceBackend
+    from cost_model import CostModel
+    from near_duplicates import NearDuplicateIndex
+    from summary_cache import SummaryCache
+
+    backends = {
+        engine: InferenceBackend(FakeModel(), FakeTokenizer(engine))
+        for engine in ("t5", "bart")
+    }
+    monkeypatch.setattr(summarizer, "_load_tokenizer", lambda engine: backends[engine].tokenizer)
+    for engine, backend in backends.items():
+        monkeypatch.setitem(summarizer._LOADERS, engine, lambda backend=backend: backend)
+    monkeypatch.setattr(summarizer, "_ready", {engine: threading.Event() for engine in backends})
+    monkeypatch.setattr(summarizer, "SUMMARY_CACHE", SummaryCache(max_entries=64))
+    monkeypatch.setattr(summarizer, "NEAR_DUPLICATES", NearDuplicateIndex(max_entries=0))
+    monkeypatch.setattr(summarizer, "COST_MODEL", CostModel())
+    return backends
+
+
+@pytest.fixture
+def live_server(fake_models):
+    """
+    server.py's handler on an ephemeral localhost port, backed by
+    fake_models; yields (url, paths) where paths lists every request.
+    """
+    from http.server import ThreadingHTTPServer
+
+    import server
+
+    paths = []
+
+    class Handler(server.SummarizeHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            paths.append(self.path)
+            super().do_GET()
+
+        def do_POST(self):
+            paths.append(self.path)
+            super().do_POST()
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.batcher        = None
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", paths
+    httpd.shutdown()
+    httpd.server_close()
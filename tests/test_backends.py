@@ -0,0 +1,60 @@
+import summarizer
+from backends import InferenceBackend, TransformersBackend
+from benchmarks.common import load_corpus
+from conftest import FakeModel, FakeTokenizer
+
+TEXT    = " ".join(load_corpus()["river_history"].split()[:120])
+BUDGETS = [(20, 10), (40, 12), (60, 20)]
+
+
+class _EncoderOutput(dict):
+    """Stands in for transformers' ModelOutput: a dict built from keywords."""
+
+
+class _CountingTokenizer(FakeTokenizer):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def __call__(self, texts, **kwargs):
+        self.calls += 1
+        return super().__call__(texts, **kwargs)
+
+
+def test_generic_backend_tokenizes_once_and_decodes_per_budget():
+    backend = InferenceBackend(FakeModel(), _CountingTokenizer())
+    outputs = backend.summarize_lengths(TEXT, BUDGETS)
+
+    assert backend.tokenizer.calls == 1
+    assert [(max_len, min_len) for _, max_len, min_len in backend.model.calls] == BUDGETS
+    assert [len(o.split()) for o in outputs] == [20, 40, 60]
+
+
+def test_transformers_backend_encodes_once(monkeypatch):
+    backend = TransformersBackend(FakeModel(), _CountingTokenizer())
+    encoded, seen = [], []
+    monkeypatch.setattr(backend, "encode",
+                        lambda batch: encoded.append(batch) or _EncoderOutput(hidden="h"))
+    generate = backend.model.generate
+
+    def record(input_ids, encoder_outputs, **kwargs):
+        seen.append(encoder_outputs)
+        return generate(input_ids, **kwargs)
+
+    monkeypatch.setattr(backend.model, "generate", record)
+    outputs = backend.summarize_lengths(TEXT, BUDGETS)
+
+    assert backend.tokenizer.calls == 1 and len(encoded) == 1
+    assert len(seen) == len(BUDGETS) and all(o == {"hidden": "h"} for o in seen)
+    assert len({id(o) for o in seen}) == len(BUDGETS)      # a fresh container per decode
+    assert [len(o.split()) for o in outputs] == [20, 40, 60]
+
+
+def test_all_details_share_the_single_request_cache(fake_models):
+    summaries, model_used = summarizer.summarize_all_details(TEXT, "t5")
+    calls = len(fake_models["t5"].model.calls)
+    assert calls == 3 and model_used == "t5"
+
+    for detail, summary in summaries.items():
+        assert summarizer.summarize_text(TEXT, detail, "t5") == (summary, "t5")
+    assert len(fake_models["t5"].model.calls) == calls
@@ -0,0 +1,39 @@
+import summarizer
+from benchmarks.common import load_corpus
+
+BUDGET = 128
+
+
+class WordTokenizer:
+    """One token per whitespace-separated word."""
+
+    def __call__(self, texts, add_special_tokens=False):
+        return {"input_ids": [text.split() for text in texts]}
+
+
+def _document():
+    return " ".join(load_corpus().values())
+
+
+def test_stable_chunks_fit_the_budget():
+    tokenizer = WordTokenizer()
+    text      = _document()
+    chunks    = summarizer._split_chunks_stable(text, tokenizer, BUDGET)
+    assert len(chunks) > 3
+    assert all(len(chunk.split()) <= BUDGET for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_chunks_after_an_edit_are_reused():
+    # Plain packing shifts every later boundary when a sentence is added up
+    # front; content-defined cuts fall back into step a few chunks later.
+    tokenizer = WordTokenizer()
+    text      = _document()
+    edited    = "The committee added a short note before the first section. " + text
+
+    before = summarizer._split_chunks_stable(text, tokenizer, BUDGET)
+    after  = summarizer._split_chunks_stable(edited, tokenizer, BUDGET)
+
+    reused = [chunk in before for chunk in after]
+    assert not reused[0]
+    assert all(reused[len(after) // 2:])
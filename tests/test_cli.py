@@ -0,0 +1,49 @@
+import json
+from types import SimpleNamespace
+
+import cli
+from benchmarks.common import load_corpus
+
+LINES = [
+    '{"id": "a", "text": "keyword keyword keyword"}',
+    '{broken',
+    '[1, 2]',
+    '',
+    '{"id": "b", "text": 5}',
+]
+
+
+def _args(tmp_path, source):
+    return SimpleNamespace(
+        input=str(source), output=str(tmp_path / "out.jsonl"), checkpoint=None,
+        detail="medium", model="auto", jobs=1, batch_size=8,
+        id_field="id", text_field="text",
+    )
+
+
+def test_bad_lines_become_error_records(tmp_path):
+    source = tmp_path / "docs.jsonl"
+    source.write_text("\n".join(LINES) + "\n", encoding="utf-8")
+
+    counts  = cli.run(_args(tmp_path, source))
+    records = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+
+    assert counts["error"] == 3 and counts["rejected"] == 1
+    assert [r["id"] for r in records if r["status"] == "error"] == ["2", "3", "5"]
+    assert all("error" in r for r in records if r["status"] == "error")
+    # malformed lines are checkpointed: a resumed job does not report them again
+    assert (tmp_path / "out.jsonl.done").read_text().split() == ["a", "2", "3", "5"]
+    again = cli.run(_args(tmp_path, source))
+    assert again["skipped"] == 4 and again["error"] == 0
+
+
+def test_failed_batches_are_retried_on_resume(tmp_path, monkeypatch):
+    source = tmp_path / "docs.jsonl"
+    source.write_text(json.dumps({"id": "x", "text": load_corpus()["city_budget"]}) + "\n", encoding="utf-8")
+
+    def fail(*args):
+        raise RuntimeError("model crashed")
+
+    monkeypatch.setattr(cli, "_summarize_batch_job", fail)
+    assert cli.run(_args(tmp_path, source))["error"] == 1
+    assert (tmp_path / "out.jsonl.done").read_text() == ""
@@ -0,0 +1,35 @@
+import socket
+import time
+
+import client
+from client import RemoteSummarizer
+
+
+def test_input_hint_is_one_request(live_server):
+    url, paths = live_server
+    remote     = RemoteSummarizer(url)
+
+    engine, state, seconds = remote.input_hint("A short note about the river. " * 4, "short", "bart")
+    assert (engine, state, seconds) == ("t5", "cold", None)     # Auto's pick, not the selection
+    assert paths == ["/predict"]
+
+
+def test_input_hint_falls_back_when_offline():
+    with socket.socket() as s:                   # a port nothing listens on
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    remote = RemoteSummarizer(f"http://127.0.0.1:{port}")
+    assert remote.input_hint("word " * 10) == ("t5", "offline", None)
+    assert remote.input_hint("word " * 500) == ("bart", "offline", None)
+
+
+def test_input_hint_times_out_on_a_hung_server(monkeypatch):
+    monkeypatch.setattr(client, "_HINT_TIMEOUT_S", 0.2)
+    with socket.socket() as hung:                # accepts, never answers
+        hung.bind(("127.0.0.1", 0))
+        hung.listen()
+        remote = RemoteSummarizer(f"http://127.0.0.1:{hung.getsockname()[1]}")
+
+        start = time.perf_counter()
+        assert remote.input_hint("word " * 10) == ("t5", "offline", None)
+        assert time.perf_counter() - start < 2
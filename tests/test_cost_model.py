@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from cost_model import CostModel
+
+COEF = (0.2, 0.001, 0.02, 0.05)                  # a, b, c, d of the documented model
+
+
+def _seconds(tokens, max_len):
+    a, b, c, d = COEF
+    return a + b * tokens + c * max_len + d * tokens * max_len / 1000
+
+
+def _fill(model, n=24, engine="bart", greedy=False, seed=0):
+    rng = np.random.default_rng(seed)
+    for tokens, max_len in zip(rng.integers(50, 1000, n), rng.integers(20, 200, n)):
+        model.record(engine, greedy, int(tokens), int(max_len), _seconds(tokens, max_len))
+
+
+def _flushers():
+    return [t for t in threading.enumerate() if t.name == "neuralsum-cost-model"]
+
+
+def test_fit_recovers_the_cost_surface():
+    model = CostModel()
+    _fill(model)
+    assert model.predict("bart", False, 400, 120) == pytest.approx(_seconds(400, 120))
+    assert model.predict("bart", True, 400, 120) is None      # other decoding: no samples
+    assert model.stats() == {"bart:beam": 24}
+
+
+def test_no_prediction_below_min_samples():
+    model = CostModel()
+    _fill(model, n=7)
+    assert model.predict("bart", False, 400, 120) is None
+
+
+def test_largest_max_len_meets_the_budget():
+    model = CostModel()
+    _fill(model)
+    budget = _seconds(400, 120) + 1e-6                      # exact fit, up to rounding
+    assert model.largest_max_len("bart", False, 400, budget, 20, 200) == 120
+    assert model.largest_max_len("bart", False, 400, _seconds(400, 20) / 2, 20, 200) is None
+
+
+def test_samples_are_bounded():
+    model = CostModel(max_samples=10)
+    _fill(model, n=24)
+    assert model.stats() == {"bart:beam": 10}
+
+
+def test_record_stays_in_memory_until_flushed(tmp_path):
+    path    = str(tmp_path / "cost.json")
+    before  = len(_flushers())
+    model   = CostModel(path)
+    assert len(_flushers()) == before                          # nothing started on import
+    model.record("t5", True, 100, 40, 0.5)
+    assert not os.path.exists(path) and len(_flushers()) == before + 1
+
+    model.flush()
+    assert CostModel(path).stats() == {"t5:greedy": 1}
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_forked_workers_write_their_own_file(tmp_path):
+    path = str(tmp_path / "cost.json")
+    seed = CostModel(path)
+    _fill(seed, n=8, engine="t5")
+    seed.save()
+
+    parent = CostModel(path)                                    # like server.py: loads, never records
+    pid    = os.fork()
+    if pid == 0:                                                # worker: one new sample
+        parent.record("t5", False, 10, 20, _seconds(10, 20))
+        parent.flush()
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+    part = f"{path}.{pid}"
+    assert len(json.load(open(part))["samples"][0]["rows"]) == 9
+    assert len(json.load(open(path))["samples"][0]["rows"]) == 8
+
+    merged = CostModel(path)                                    # inherited rows kept once
+    assert merged.stats() == {"t5:beam": 9}
+    assert not os.path.exists(part)
+    assert len(json.load(open(path))["samples"][0]["rows"]) == 9
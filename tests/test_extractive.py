@@ -0,0 +1,17 @@
+import numpy as np
+import pytest
+
+import extractive
+
+
+def test_long_inputs_are_ranked_in_bounded_blocks(monkeypatch):
+    sizes = []
+    rank  = extractive._textrank
+    monkeypatch.setattr(extractive, "_MAX_SENTENCES", 50)
+    monkeypatch.setattr(extractive, "_textrank", lambda s: sizes.append(len(s)) or rank(s))
+
+    sentences = [f"Report {i} covers topic {i % 7} in detail." for i in range(120)]
+    scores    = extractive.score_sentences(sentences)
+    assert sizes == [50, 50, 20]
+    assert scores.shape == (120,) and scores.sum() == pytest.approx(1.0)
+    assert np.all(scores > 0)
@@ -0,0 +1,58 @@
+import metrics
+import summarizer
+from benchmarks.common import load_corpus
+from conftest import FakeTokenizer
+
+LONG   = " ".join(load_corpus().values()) * 2           # ≈ 2,000 words, four windows
+WINDOW = summarizer._input_budget(FakeTokenizer(), "summarize: ")
+
+
+def _record_rows(backend, monkeypatch):
+    """Longest input row of every generate() call."""
+    rows, generate = [], backend.model.generate
+
+    def record(input_ids, **kwargs):
+        rows.append(max(len(row) for row in input_ids))
+        return generate(input_ids, **kwargs)
+
+    monkeypatch.setattr(backend.model, "generate", record)
+    return rows
+
+
+def test_chunks_cover_the_text_within_the_budget():
+    chunks = summarizer._split_chunks(LONG, FakeTokenizer(), WINDOW)
+    assert len(chunks) > 3
+    assert all(len(chunk.split()) <= WINDOW for chunk in chunks)
+    assert " ".join(chunks).split() == LONG.split()
+
+
+def test_run_on_sentence_is_split_by_words():
+    sentence = " ".join(f"w{i}" for i in range(1000))
+    parts    = summarizer._split_words(sentence, 1000, 300)
+    assert all(len(part.split()) <= 300 for part in parts)
+    assert " ".join(parts) == sentence
+
+
+def test_long_input_is_mapped_then_reduced(fake_models, monkeypatch):
+    rows = _record_rows(fake_models["t5"], monkeypatch)
+    summary, model_used, meta = summarizer.summarize_text(LONG, "medium", "t5",
+                                                          return_meta=True)
+
+    calls = fake_models["t5"].model.calls
+    assert len(calls) >= 2                                   # map batch(es), then the final pass
+    assert all(n <= WINDOW + 1 for n in rows)               # + the "summarize:" prefix
+    assert calls[-1][1:] == (meta["max_length"], meta["min_length"]) == (200, 100)
+    assert summary and model_used == "t5"
+
+
+def test_truncation_without_long_document(fake_models):
+    before = metrics.TRUNCATIONS.value(engine="t5")
+    summarizer.summarize_text(LONG, "medium", "t5", long_document=False)
+    assert len(fake_models["t5"].model.calls) == 1
+    assert metrics.TRUNCATIONS.value(engine="t5") - before == 1
+
+
+def test_preselect_makes_one_abstractive_pass(fake_models, monkeypatch):
+    rows = _record_rows(fake_models["t5"], monkeypatch)
+    summarizer.summarize_text(LONG, "medium", "t5", preselect=True)
+    assert len(fake_models["t5"].model.calls) == 1 and rows[0] <= WINDOW + 1
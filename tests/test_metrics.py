@@ -0,0 +1,52 @@
+import math
+
+import pytest
+
+import metrics
+import summarizer
+
+
+def _histogram(*values):
+    hist = metrics.Histogram("test_seconds", "Test.", buckets=(1, 2, 5))
+    for value in values:
+        hist.observe(value)
+    return hist
+
+
+def test_quantile_is_the_bucket_bound():
+    hist = _histogram(0.5, 1.5, 1.5, 4)
+    assert hist.quantile(0.25) == 1
+    assert hist.quantile(0.5) == 2
+    assert hist.quantile(1.0) == 4                        # bound 5, capped at the peak
+
+
+def test_tail_quantile_is_finite():
+    hist = _histogram(0.5, 0.5, 0.5, 100)
+    assert hist.quantile(0.95) == 100                     # +Inf bucket → largest observation
+    assert "+Inf" in "\n".join(hist.render())             # the export keeps its +Inf bucket
+
+
+def test_quantile_without_samples():
+    assert _histogram().quantile(0.5) == 0.0
+
+
+def test_timing_table_reads_finite_percentiles(monkeypatch):
+    hist = metrics.Histogram("test_stage", "Test.", labels=("stage",), buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.005, 3.0):
+        hist.observe(seconds, stage="generate")
+    monkeypatch.setattr(metrics, "STAGE_SECONDS", hist)
+
+    row = next(r for r in metrics.timing_table() if r["metric"] == "stage:generate")
+    assert row["p50_ms"] == 10.0 and row["p95_ms"] == 3000.0
+    assert not any(math.isinf(r["p95_ms"]) for r in metrics.timing_table())
+
+
+@pytest.mark.parametrize("tokens, long_document, truncated", [
+    (510, False, 0),      # window 512 − "summarize:" − one special token
+    (511, False, 1),
+    (5000, True, 0),      # long documents are chunked, not truncated
+])
+def test_truncations_count_only_past_the_window(fake_models, tokens, long_document, truncated):
+    before = metrics.TRUNCATIONS.value(engine="t5")
+    summarizer._record_input("t5", tokens, long_document)
+    assert metrics.TRUNCATIONS.value(engine="t5") - before == truncated
@@ -0,0 +1,37 @@
+from batching import MicroBatcher
+from benchmarks.common import load_corpus
+from workers import InferencePool
+
+CORPUS = load_corpus()
+
+
+def _words(name, n):
+    return " ".join(CORPUS[name].split()[:n])
+
+
+def _run(texts, model="t5"):
+    pool    = InferencePool(workers=1, max_pending=4)
+    batcher = MicroBatcher(pool, window_ms=200, max_batch=len(texts))
+    futures = [batcher.submit(text, "medium", model) for text in texts]
+    results = [future.result(timeout=10) for future in futures]
+    pool.shutdown()
+    return results
+
+
+def test_concurrent_requests_share_one_forward(fake_models):
+    texts   = [_words(name, 100 + 5 * i)
+               for i, name in enumerate(("battery_research", "city_budget", "river_history"))]
+    results = _run(texts)
+
+    calls = fake_models["t5"].model.calls
+    assert len(calls) == 1 and calls[0][0] == 3
+    assert [r["timing"]["batch_size"] for r in results] == [3, 3, 3]
+    assert all(r["summary"] and r["model_used"] == "t5" for r in results)
+
+
+def test_batch_size_reports_the_real_forward(fake_models):
+    # same request settings, so one group — but different length budgets
+    results = _run([_words("city_budget", 60), _words("river_history", 300)])
+
+    assert [rows for rows, _, _ in fake_models["t5"].model.calls] == [1, 1]
+    assert [r["timing"]["batch_size"] for r in results] == [1, 1]
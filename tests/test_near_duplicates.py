@@ -0,0 +1,54 @@
+from benchmarks.common import load_corpus
+from near_duplicates import NearDuplicateIndex, signature, similarity
+
+CORPUS = load_corpus()
+TEXT   = CORPUS["river_history"]
+EDITED = TEXT.replace("river", "River", 1) + " The article was updated on Tuesday."
+
+
+def test_signature_needs_enough_words():
+    assert signature("far too short to compare") is None
+    assert signature(TEXT) is not None
+
+
+def test_similarity_orders_inputs():
+    sig = signature(TEXT)
+    assert similarity(sig, signature(TEXT)) == 1.0
+    assert similarity(sig, signature(EDITED)) > 0.85
+    assert similarity(sig, signature(CORPUS["city_budget"])) < 0.1
+
+
+def test_lookup_respects_threshold():
+    index = NearDuplicateIndex(threshold=0.8, max_entries=16)
+    index.add("ns", signature(TEXT), "summary")
+    value, sim = index.lookup("ns", signature(EDITED))
+    assert value == "summary" and sim >= 0.8
+    assert index.lookup("ns", signature(CORPUS["city_budget"])) is None
+
+    strict = NearDuplicateIndex(threshold=1.0, max_entries=16)
+    strict.add("ns", signature(TEXT), "summary")
+    assert strict.lookup("ns", signature(EDITED)) is None
+    assert strict.lookup("ns", signature(TEXT)) == ("summary", 1.0)
+
+
+def test_namespaces_are_separate():
+    index = NearDuplicateIndex(threshold=0.8, max_entries=16)
+    index.add("short", signature(TEXT), "short summary")
+    assert index.lookup("long", signature(TEXT)) is None
+
+
+def test_eviction_bounds_entries_and_buckets():
+    index = NearDuplicateIndex(threshold=0.8, max_entries=2)
+    for name in ("river_history", "city_budget", "battery_research"):
+        index.add("ns", signature(CORPUS[name]), name)
+    assert index.stats()["size"] == 2
+    assert index.lookup("ns", signature(TEXT)) is None
+    assert index.lookup("ns", signature(CORPUS["battery_research"]))[0] == "battery_research"
+    live = {i for ids in index._buckets.values() for i in ids}
+    assert live == set(index._entries)
+
+
+def test_disabled_index_never_matches():
+    index = NearDuplicateIndex(threshold=0.8, max_entries=0)
+    index.add("ns", signature(TEXT), "summary")
+    assert index.lookup("ns", signature(TEXT)) is None
@@ -0,0 +1,61 @@
+import pytest
+
+import summarizer
+from conftest import FakeTokenizer
+from text_cleaner import CleanedDocument
+
+
+def _doc(words):
+    return CleanedDocument(" ".join(["word"] * words), words, 1.0, False)
+
+
+@pytest.mark.parametrize("detail", ["short", "medium", "long"])
+def test_length_budget_bounds(detail):
+    for tokens in (0, 1, 40, 100, 500, 5000):
+        max_len, min_len = summarizer._length_budget(tokens, detail)
+        assert 20 <= max_len <= 200 and 10 <= min_len <= max(10, max_len // 2)
+    assert summarizer._length_budget(5000, detail)[0] == 200
+
+
+def test_length_budget_follows_rounded_tokens():
+    assert summarizer._length_budget(100, "medium") == (53, 15)      # 100 → 128 tokens
+    short, medium, long_ = (summarizer._length_budget(300, d)[0]
+                            for d in ("short", "medium", "long"))
+    assert short < medium < long_
+    assert summarizer._length_budget(300, "other") == summarizer._length_budget(300, "medium")
+
+
+def test_window_and_input_budget():
+    tokenizer = FakeTokenizer()
+    assert summarizer._model_window(tokenizer) == 512
+    assert summarizer._input_budget(tokenizer, "summarize: ") == 512 - 1 - summarizer._WINDOW_MARGIN
+
+    tokenizer.model_max_length = int(1e30)                            # HF "unset" sentinel
+    assert summarizer._model_window(tokenizer) == summarizer._WINDOW_FALLBACK
+
+
+def test_explicit_model_is_kept(fake_models):
+    assert summarizer._resolve_model("bart", _doc(40)) == ("bart", "bart", 40)
+    assert summarizer._resolve_model("t5", _doc(400)) == ("t5", "t5", 400)
+
+
+def test_auto_routes_on_token_counts(fake_models):
+    assert summarizer._resolve_model("auto", _doc(100)) == ("t5", "auto", 100)
+    assert summarizer._resolve_model("auto", _doc(159)) == ("t5", "auto", 159)
+    assert summarizer._resolve_model("auto", _doc(160)) == ("bart", "auto", 160)
+
+
+def test_bucketing_groups_by_budget_and_keeps_order(fake_models):
+    backend = fake_models["t5"]
+    inputs  = [" ".join(["x"] * n) for n in (300, 20, 25, 310)]
+    lengths = [300, 20, 25, 310]
+    budgets = [summarizer._length_budget(n, "medium") for n in lengths]
+    sizes   = [0] * len(inputs)
+
+    outputs = summarizer._generate_bucketed(backend, inputs, lengths, budgets, 8,
+                                            batch_sizes=sizes)
+    assert sorted(rows for rows, _, _ in backend.model.calls) == [2, 2]
+    assert sizes == [2, 2, 2, 2]
+    assert [len(o.split()) for o in outputs] == [
+        min(n, budget[0]) for n, budget in zip(lengths, budgets)
+    ]
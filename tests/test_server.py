@@ -0,0 +1,63 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import server
+import summarizer
+from benchmarks.common import load_corpus
+from workers import InferencePool
+
+CORPUS = load_corpus()
+
+
+def _post(url, path, payload):
+    request = urllib.request.Request(
+        url + path, json.dumps(payload).encode("utf-8"),
+        {"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as err:
+        return err.code, json.load(err)
+
+
+def test_failed_generation_is_a_json_500(live_server, fake_models, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("out of memory")
+
+    monkeypatch.setattr(fake_models["t5"].model, "generate", fail)
+    status, body = _post(live_server[0], "/summarize",
+                         {"text": CORPUS["city_budget"], "model": "t5"})
+    assert (status, body) == (500, {"error": "RuntimeError: out of memory"})
+
+
+def test_multi_answers_busy_when_the_pool_is_full(live_server, monkeypatch):
+    pool = InferencePool(workers=1, max_pending=0)
+    monkeypatch.setattr(summarizer, "POOL", pool)
+    monkeypatch.setattr(server, "_MULTI_QUEUE_WAIT_S", 0.1)
+    release = threading.Event()
+    pool.submit(release.wait)
+
+    try:
+        status, body = _post(live_server[0], "/summarize/multi",
+                             {"texts": [CORPUS["city_budget"], CORPUS["river_history"]]})
+    finally:
+        release.set()
+        pool.shutdown()
+    assert (status, body) == (503, {"error": "busy"})
+
+
+def test_multi_summarizes_when_there_is_room(live_server):
+    status, body = _post(live_server[0], "/summarize/multi",
+                         {"texts": [CORPUS["city_budget"], CORPUS["river_history"]],
+                          "model": "t5"})
+    assert status == 200 and body["summary"] and len(body["documents"]) == 2
+
+
+def test_oversized_instant_text_is_refused(live_server, monkeypatch):
+    monkeypatch.setattr(server, "_MAX_INSTANT_CHARS", 1000)
+    status, body = _post(live_server[0], "/summarize",
+                         {"text": CORPUS["city_budget"] * 3, "model": "instant"})
+    assert status == 413 and "/summarize/file" in body["error"]
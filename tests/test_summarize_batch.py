@@ -0,0 +1,37 @@
+import summarizer
+from benchmarks.common import load_corpus
+
+CORPUS = load_corpus()
+
+
+def _similar_inputs():
+    """Four prose inputs of 100-115 words."""
+    names = ("battery_research", "city_budget", "river_history", "software_release")
+    return [
+        " ".join(CORPUS[name].split()[:100 + 5 * i]) for i, name in enumerate(names)
+    ]
+
+
+def test_similar_lengths_share_a_budget():
+    assert summarizer._length_budget(100, "medium") == summarizer._length_budget(115, "medium")
+    assert summarizer._length_budget(100, "medium") != summarizer._length_budget(400, "medium")
+
+
+def test_similar_inputs_run_as_one_batch(fake_models):
+    texts   = _similar_inputs()
+    results = summarizer.summarize_batch(texts, "medium", "t5")
+
+    calls = fake_models["t5"].model.calls
+    assert len(calls) == 1 and calls[0][0] == len(texts)
+    assert all(summary and model_used == "t5" for summary, model_used in results)
+
+    # cached under the single-request key: summarize_text generates nothing
+    assert summarizer.summarize_text(texts[2], "medium", "t5") == results[2]
+    assert len(calls) == 1
+
+
+def test_batch_matches_single_requests(fake_models):
+    texts   = _similar_inputs()
+    batched = summarizer.summarize_batch(texts, "medium", "t5")
+    summarizer.SUMMARY_CACHE.clear()
+    assert [summarizer.summarize_text(t, "medium", "t5") for t in texts] == batched
@@ -0,0 +1,44 @@
+import metrics
+import summarizer
+from benchmarks.common import load_corpus
+
+CORPUS = load_corpus()
+SHORT  = [
+    "The harbour reopened on Monday after two weeks of repairs to the main pier and its cranes.",
+    "Local fishermen said that catches were steady this spring, although the price of fuel kept rising.",
+]
+
+
+def _requests():
+    return metrics.REQUESTS.value(model="t5", detail="medium")
+
+
+def test_short_documents_are_summarized_not_rejected(fake_models):
+    before = _requests()
+    summary, model_used, report = summarizer.summarize_documents(SHORT, "medium", "t5")
+
+    assert not any(d["skipped"] for d in report["documents"])
+    assert summary and summary != summarizer._GARBAGE_MESSAGE and model_used == "t5"
+    assert _requests() - before == 2                          # one per document, none for the reduce
+
+
+def test_partials_that_fit_are_returned_as_they_are(fake_models):
+    partials = ["The pier reopened.", "Catches were steady."]
+    combined = summarizer._combine_partials(partials, 200, "medium", "t5", False)
+    assert combined == ("The pier reopened. Catches were steady.", "t5")
+    assert fake_models["t5"].model.calls == []
+
+
+def test_long_partials_are_reduced_once(fake_models):
+    names = ("battery_research", "city_budget", "river_history", "software_release")
+    before = _requests()
+    summary, model_used, report = summarizer.summarize_documents(
+        [CORPUS[name] for name in names], "medium", "t5",
+    )
+
+    calls = fake_models["t5"].model.calls
+    assert len(calls) == len(names) + 1
+    assert calls[-1][1] == 200                                # the length of the whole set
+    assert len(summary.split()) <= 200 < sum(len(d["summary"].split())
+                                             for d in report["documents"])
+    assert _requests() - before == len(names)
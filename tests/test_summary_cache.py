@@ -0,0 +1,42 @@
+from summary_cache import SummaryCache, make_key
+
+PARAMS = {"num_beams": 4, "no_repeat_ngram_size": 3}
+
+
+def test_key_covers_every_setting():
+    key = make_key("text", "medium", "bart", PARAMS)
+    assert key == make_key("text", "medium", "bart", dict(reversed(PARAMS.items())))
+    assert key != make_key("text.", "medium", "bart", PARAMS)
+    assert key != make_key("text", "short", "bart", PARAMS)
+    assert key != make_key("text", "medium", "t5", PARAMS)
+    assert key != make_key("text", "medium", "bart", dict(PARAMS, num_beams=1))
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = SummaryCache(max_entries=2)
+    cache.put("a", ("A", "bart"))
+    cache.put("b", ("B", "bart"))
+    assert cache.get("a") == ("A", "bart")      # "b" is now the oldest
+    cache.put("c", ("C", "bart"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ("A", "bart") and cache.get("c") == ("C", "bart")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (3, 1, 2)
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    key = make_key("text", "medium", "bart", PARAMS)
+    SummaryCache(max_entries=4, disk_dir=str(tmp_path)).put(key, ("summary", "bart"))
+
+    cache = SummaryCache(max_entries=4, disk_dir=str(tmp_path))
+    assert cache.get(key) == ("summary", "bart")
+    assert cache.get(key) == ("summary", "bart")
+    assert (cache.disk_hits, cache.hits) == (1, 1)   # promoted into memory
+
+
+def test_disabled_memory_tier_still_uses_disk(tmp_path):
+    cache = SummaryCache(max_entries=0, disk_dir=str(tmp_path))
+    cache.put("k", ("summary", "t5"))
+    assert cache.stats()["size"] == 0
+    assert cache.get("k") == ("summary", "t5")
@@ -0,0 +1,151 @@
+import base64
+import os
+
+import pytest
+
+from benchmarks.common import load_corpus
+from text_cleaner import admit, clean_document, clean_text, is_garbage_input, with_dropped
+
+FRENCH = (
+    "La ville a présenté mardi son nouveau plan de transport pour les dix prochaines "
+    "années. Le projet prévoit la construction de deux lignes de tramway, l'extension "
+    "du réseau de pistes cyclables et la rénovation de plusieurs gares routières. "
+    "Selon la mairie, ces travaux doivent réduire la circulation automobile dans le "
+    "centre et améliorer la qualité de l'air. Les associations d'habitants saluent "
+    "l'ambition du plan, mais elles s'inquiètent du calendrier des chantiers et de "
+    "leur coût pour les commerces du quartier. Une consultation publique sera ouverte "
+    "au printemps afin de recueillir l'avis des riverains."
+)
+SPANISH = (
+    "El gobierno regional anunció ayer un programa para modernizar los hospitales de "
+    "la provincia. La inversión permitirá renovar los equipos de diagnóstico, ampliar "
+    "las salas de urgencias y contratar a más personal de enfermería. Los sindicatos "
+    "consideran que la medida llega tarde, porque las listas de espera han crecido "
+    "durante los últimos cinco años. Los responsables sanitarios explicaron que las "
+    "obras comenzarán en otoño y que los centros seguirán abiertos mientras duren los "
+    "trabajos. El plan será revisado cada año por una comisión independiente."
+)
+GERMAN = (
+    "Die Stadtverwaltung hat am Montag einen neuen Plan für den Ausbau der Fernwärme "
+    "vorgestellt. Bis zum Ende des Jahrzehnts sollen mehr als zwanzigtausend Haushalte "
+    "an das Netz angeschlossen werden. Die Kosten werden auf rund dreihundert Millionen "
+    "Euro geschätzt, die zum Teil aus Mitteln des Landes kommen. Kritiker bemängeln, "
+    "dass die Bürger bisher kaum beteiligt wurden und die Preise für die Wärme noch "
+    "nicht feststehen. Der Stadtrat will im Herbst über die erste Bauphase entscheiden "
+    "und danach regelmäßig über den Fortschritt berichten."
+)
+
+
+@pytest.mark.parametrize("text", load_corpus().values())
+def test_english_fixtures_are_accepted(text):
+    assert admit(text).verdict == "accept"
+
+
+@pytest.mark.parametrize("text", [FRENCH, SPANISH, GERMAN], ids=["fr", "es", "de"])
+def test_non_english_prose_is_admitted(text):
+    admission = admit(text)
+    assert admission.verdict == "accept", admission.reasons
+    assert not clean_document(text).is_garbage
+    assert not is_garbage_input(text)
+
+
+def test_keyword_list_has_no_sentences():
+    words = ["cloud", "python", "data", "devops", "kubernetes", "docker", "security",
+             "fintech", "platform", "mobile", "analytics", "react", "growth", "sales"]
+    text = " ".join(words[i * 7 % len(words)] + str(i % 5) * (i % 2) for i in range(200))
+    admission = admit(text)
+    assert admission.verdict == "reject"
+    assert "no_sentences" in admission.reasons
+
+
+def test_encoded_blob_is_rejected_with_reason():
+    blob = base64.b64encode(os.urandom(3000)).decode()
+    admission = admit(blob)
+    assert admission.verdict == "reject"
+    assert "encoded_lines" in admission.reasons
+    assert clean_document(blob).is_garbage
+
+
+def test_log_dump_is_rejected():
+    log = "\n".join(
+        f"2024-05-01 12:00:{i % 60:02d} INFO id={i * 7919} status=200 ms={i % 900}"
+        for i in range(200)
+    )
+    admission = admit(log)
+    assert admission.verdict == "reject"
+    assert admission.dropped == {"non_prose_lines": 200}
+
+
+def test_repeated_pattern_is_rejected():
+    admission = admit("The quick brown fox jumps over the lazy dog. " * 100)
+    assert admission.reasons == ("repetitive",)
+
+
+def test_boilerplate_lines_are_dropped_not_rejected():
+    article = load_corpus()["river_history"]
+    nav     = "Home | News | Sport | Weather | Contact"
+    admission = admit(f"{nav}\n{article}\n{nav}\nShare this article\nShare this article\n")
+    assert admission.verdict == "reduce"
+    assert admission.dropped == {"navigation": 1, "repeated_lines": 2}
+    assert nav not in admission.text
+    assert article.strip() in admission.text
+
+
+def test_hash_inside_a_sentence_keeps_the_line():
+    text = load_corpus()["river_history"].replace("\n", " ")
+    text += " The fix landed in commit 3f2a9c1e8b7d6a5f4e3d2c1b0a9f8e7d6c5b4a39 last week."
+    assert admit(text).verdict == "accept"
+
+
+def test_with_dropped_rejects_when_nothing_is_left():
+    merged = with_dropped(admit(""), {"non_prose_lines": 12})
+    assert merged.verdict == "reject"
+    assert merged.reasons == ("non_prose_lines", "nothing_left")
+
+
+EARNINGS = (
+    "Revenue was 3,214.5 million in Q3 2024, up 12.4 on 2,860.1 million in Q3 2023. "
+    "Margin was 18.2 against 16.9, EPS 1.47 against 1.21, and net debt 412 against 530. "
+    "The 2025 guide is 13,100 to 13,400 million, or 9.5 to 11.9 growth on 2024."
+)
+
+
+def test_figures_count_as_text():
+    admission = admit(EARNINGS)
+    assert admission.verdict == "accept", admission.reasons
+    assert admission.scores["alpha"] > 0.8
+
+
+def test_clean_text_only_normalises():
+    figures = "Q3 2024: revenue 3,214.5 vs 2,860.1, EPS 1.47 vs 1.21, debt 412 vs 530."
+    refrain = "And the river keeps rolling on"
+    text    = f"{EARNINGS}\n{figures}\n{refrain}\n  {refrain}\n"
+    assert admit(text).dropped                           # the summarize path drops lines …
+    assert clean_text(text) == " ".join(text.replace(":", "").split())   # … clean_text keeps them
+
+
+def test_clean_document_matches_clean_text():
+    text = "  The   river rose overnight; roads @ closed!\n\nCrews worked until dawn.  "
+    doc  = clean_document(text)
+    assert doc.text == clean_text(text)
+    assert doc.text == "The river rose overnight roads closed! Crews worked until dawn."
+    assert doc.word_count == len(doc.text.split()) == 10
+    assert doc.unique_ratio == 1.0
+
+
+def test_clean_document_flags_short_and_repetitive_input():
+    assert clean_document("").is_garbage and clean_document("").word_count == 0
+    assert clean_document("Too short to summarize.").is_garbage
+    repetitive = clean_document("test test test test " * 10)
+    assert repetitive.is_garbage and repetitive.unique_ratio < 0.3
+
+
+def test_cleaned_document_is_not_cleaned_again(monkeypatch):
+    import summarizer
+    import text_cleaner
+
+    doc = clean_document(load_corpus()["city_budget"])
+    monkeypatch.setattr(summarizer, "clean_document", None)       # would fail if called
+    monkeypatch.setattr(text_cleaner, "admit", None)
+    assert summarizer._prepare(doc) is doc
+    assert is_garbage_input(doc) is False
@@ -0,0 +1,34 @@
+import threading
+
+import pytest
+
+import summarizer
+from benchmarks.common import load_corpus
+from workers import InferencePool, PoolSaturated
+
+TEXT = " ".join(load_corpus()["city_budget"].split()[:80])
+
+
+def test_run_inside_a_worker_does_not_queue():
+    pool   = InferencePool(workers=1, max_pending=0)      # the outer job takes the only slot
+    thread = pool.submit(pool.run, threading.current_thread).result(timeout=5)
+    assert thread.name.startswith("neuralsum-infer")
+    pool.shutdown()
+
+
+def test_summarize_text_generates_on_the_pool(fake_models, monkeypatch):
+    pool = InferencePool(workers=1, max_pending=0)
+    monkeypatch.setattr(summarizer, "POOL", pool)
+    release = threading.Event()
+    busy    = pool.submit(release.wait)
+
+    with pytest.raises(PoolSaturated):                     # not run on the caller's thread
+        summarizer.summarize_text(TEXT, "medium", "t5")
+    assert fake_models["t5"].model.calls == []
+
+    release.set()
+    busy.result(timeout=5)
+    summary, model_used = summarizer.summarize_text(TEXT, "medium", "t5")
+    assert summary and model_used == "t5"
+    assert len(fake_models["t5"].model.calls) == 1
+    pool.shutdown()
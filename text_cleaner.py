@@ -1,44 +1,525 @@
+import codecs
 import re
+import zlib
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
 
+import numpy as np
 
-def clean_text(text: str) -> str:
+from metrics import STAGE_SECONDS
+
+
+# characters that survive cleaning: word chars, whitespace and . , ! ? -
+_NOISE = re.compile(r"[^\w\s\.,!?-]+")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  ADMISSION CONTROL
+#
+#  _is_garbage() only catches very short or very repetitive word lists; a
+#  base64 blob, a log dump or a table of figures passes it and goes on to
+#  load and run a 600 MB model.  admit() looks at the raw text before it is
+#  cleaned — NumPy over its UTF-8 bytes plus one zlib pass, no Python loop
+#  per character — in two steps:
+#
+#  Lines     — a line that repeats an earlier one (navigation, footers,
+#              log lines), is a menu / breadcrumb, is mostly digits and
+#              symbols (tables, log fields) or carries an encoded token is
+#              dropped; the rest of the text goes on ("reduce").
+#  Document  — what is left is rejected when it is undecodable bytes,
+#              mostly symbols (letters and digits both count as text, so
+#              a paragraph of figures passes), compresses like random data or like one
+#              repeated pattern, or has no sentence structure: no sentence
+#              ends *and* hardly any function words (keyword lists, tag
+#              clouds).  Sentence ends are language-neutral; the function
+#              words cover the main Latin-script languages, so prose in
+#              French or German is not mistaken for a word list.
+#
+#  Every dropped line and every rejection carries a reason code (REASONS)
+#  and the scores behind it are kept, so the thresholds below can be tuned
+#  from what production traffic actually trips (neuralsum_admissions_total,
+#  neuralsum_admission_score).
+#
+#  Admission belongs to the summarize entry points (clean_document,
+#  stream_document); clean_text() and iter_clean_text() only normalise.
+# ─────────────────────────────────────────────────────────────────────────────
+
+REASONS = {
+    # lines dropped
+    "repeated_lines":  "lines repeated from earlier in the text",
+    "navigation":      "menu / breadcrumb lines",
+    "non_prose_lines": "lines of mostly digits or symbols (tables, log fields)",
+    "encoded_lines":   "lines carrying encoded data (base64 / hex)",
+    # whole input rejected
+    "binary":          "undecodable binary data",
+    "low_alpha":       "mostly symbols",
+    "incompressible":  "random-looking data",
+    "repetitive":      "one pattern repeated over and over",
+    "no_sentences":    "no sentence structure",
+    "nothing_left":    "nothing readable left after dropping lines",
+}
+
+_MIN_LINE_BYTES  = 12       # shorter lines (headings, list items, blank lines) are always kept
+_LINE_ALPHA_MIN  = 0.5      # letters / non-space bytes below this → non-prose line
+_NAV_SEPARATORS  = 3        # | • · » separators in a line without a sentence end → navigation
+_ENCODED_LENGTH  = 40       # a run of base64 / hex characters at least this long …
+_ENCODED_DIGITS  = 0.1      # … mixing in digits (hex, base64) …
+_ENCODED_UPPER   = 0.15     # … or upper case (base64) is encoded; long words / slugs do neither
+_ENCODED_SHARE   = 0.5      # encoded bytes / non-space bytes of a line to drop it (a hash in a sentence stays)
+
+_BINARY_MAX      = 0.02     # U+FFFD (undecodable bytes) share of the characters
+_ALPHA_MIN       = 0.6      # letters and digits / non-space bytes of the admitted text
+_COMPRESS_BYTES  = 64 * 1024
+_COMPRESS_FLOOR  = 1024     # shorter texts are mostly zlib header — ratio not meaningful
+_COMPRESS_MIN    = 0.12     # zlib ratio below this → one repeated pattern
+_COMPRESS_MAX    = 0.72     # … above this → random / encoded; prose sits around 0.4-0.55
+_SENTENCE_WORDS  = 30       # fewer words → sentence signals not judged
+_FUNCTION_MIN    = 0.2      # prose runs 0.3-0.5 function words; keyword lists stay below this
+_WORDS_PER_END   = 150      # words per . ! ? above this → no sentence ends to speak of
+_ASCII_MIN       = 0.7      # function words are Latin-script; other scripts skip that check
+_MIN_KEPT_WORDS  = 15       # dropping lines may not leave less than this
+
+_FUNCTION_WORDS = frozenset((
+    # English
+    b"a an and are as at be but by for from had has have he her his i in is it its "
+    b"not of on or our she that the their there they this to was we were which who "
+    b"will with would you "
+    # French, Spanish, Italian, Portuguese
+    b"au aux ce dans de des du el elle en est et il ils la las le les lo los mais "
+    b"nous ou par pas pour que qui se son sont sur un una une y con del della di "
+    b"do da em na no os para per por su "
+    # German, Dutch
+    b"auf das dem den der des die ein eine es het ich ist mit nicht op sich und van "
+    b"von wird zu zijn"
+).split())
+_ASCII_WORD = re.compile(rb"[a-z]+")
+_SENTENCE_END = re.compile(rb"[.!?](?:\s|$)")
+
+
+@dataclass(frozen=True)
+class Admission:
+    """
+    Verdict of admit() on one input.
+
+    verdict : "accept" | "reduce" (lines dropped) | "reject"
+    text    : the text to clean and summarize — lines dropped on "reduce"
+    reasons : reason codes (keys of REASONS), line reasons first
+    dropped : reason → number of lines dropped for it
+    scores  : the document statistics the verdict was based on
+    """
+    verdict: str
+    text: str
+    reasons: tuple = ()
+    dropped: dict = field(default_factory=dict)
+    scores: dict = field(default_factory=dict)
+
+
+_ACCEPTED = Admission("accept", "")
+
+
+# per-byte class table, indexed by byte value: rows are the classes below
+# (any non-ASCII byte counts as a letter — other scripts are prose too)
+_SOLID, _LETTER, _ENDER, _ENCODING, _ASCII, _DIGIT = range(6)
+_BYTE_CLASSES = np.zeros((6, 256), dtype=np.uint8)
+_BYTE_CLASSES[_SOLID]  = 1
+_BYTE_CLASSES[_SOLID, [9, 10, 11, 12, 13, 32]] = 0
+_BYTE_CLASSES[_LETTER, list(range(65, 91)) + list(range(97, 123)) + list(range(128, 256))] = 1
+_BYTE_CLASSES[_ENDER, [33, 46, 63]] = 1
+_BYTE_CLASSES[_ENCODING, [43, 47, 61, 95] + list(range(48, 58)) + list(range(65, 91))
+              + list(range(97, 123))] = 1            # base64 / hex alphabet
+_BYTE_CLASSES[_ASCII, :128] = 1
+_BYTE_CLASSES[_DIGIT, 48:58] = 1
+
+
+def _per_line(masks, starts, size: int):
+    """Per-line sums of stacked byte masks; lines begin at `starts` (the last may be empty)."""
+    counts = np.zeros((masks.shape[0], starts.size), dtype=np.int32)
+    inner  = starts < size
+    counts[:, inner] = np.add.reduceat(masks, starts[inner], axis=1, dtype=np.int32)
+    return counts
+
+
+def _separators(arr):
+    """Mask of menu separators: | and the UTF-8 sequences of • · »."""
+    sep = arr == 0x7C
+    if arr.size >= 2:
+        sep[1:] |= (arr[:-1] == 0xC2) & ((arr[1:] == 0xB7) | (arr[1:] == 0xBB))
+    if arr.size >= 3:
+        sep[2:] |= (arr[:-2] == 0xE2) & (arr[1:-1] == 0x80) & (arr[2:] == 0xA2)
+    return sep
+
+
+def _encoded(token: bytes) -> bool:
+    digits = sum(token.count(d) for d in b"0123456789")
+    upper  = sum(1 for c in token if 65 <= c <= 90)
+    return digits >= _ENCODED_DIGITS * len(token) or upper >= _ENCODED_UPPER * len(token)
+
+
+def _filter_lines(data: bytes, seen: set, dropped: dict) -> bytes:
+    """
+    Drop the boilerplate / non-prose lines of `data` (complete lines).
+    `seen` holds CRCs of earlier lines so repeats are found across calls;
+    `dropped` counts the dropped lines per reason.
+    """
+    arr = np.frombuffer(data, dtype=np.uint8)
+    if arr.size == 0:
+        return data
+    starts  = np.concatenate(([0], np.flatnonzero(arr == 10) + 1))
+    classes = np.take(_BYTE_CLASSES[:_ASCII], arr, axis=1)
+    masks   = np.vstack((classes[:_ENCODING], _separators(arr)))
+    solid, letters, enders, seps = _per_line(masks, starts, arr.size)
+
+    non_prose  = letters < _LINE_ALPHA_MIN * solid
+    navigation = (seps >= _NAV_SEPARATORS) & (enders == 0)
+    encoded    = np.zeros(starts.size, dtype=np.int64)      # encoded bytes per line
+    edges      = np.diff(classes[_ENCODING].astype(np.int8), prepend=0, append=0)
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends   = np.flatnonzero(edges == -1)
+    long_runs  = run_ends - run_starts >= _ENCODED_LENGTH
+    for start, end in zip(run_starts[long_runs].tolist(), run_ends[long_runs].tolist()):
+        if _encoded(data[start:end]):
+            encoded[np.searchsorted(starts, start, side="right") - 1] += end - start
+    encoded = encoded >= _ENCODED_SHARE * solid
+
+    lines = data.split(b"\n")
+    kept  = []
+    for i, line in enumerate(lines):
+        if solid[i] < _MIN_LINE_BYTES:
+            kept.append(line)
+            continue
+        key = zlib.crc32(b" ".join(line.lower().split()))
+        if key in seen:
+            reason = "repeated_lines"
+        elif encoded[i]:
+            reason = "encoded_lines"
+        elif navigation[i]:
+            reason = "navigation"
+        elif non_prose[i]:
+            reason = "non_prose_lines"
+        else:
+            seen.add(key)
+            kept.append(line)
+            continue
+        seen.add(key)
+        dropped[reason] = dropped.get(reason, 0) + 1
+    return data if len(kept) == len(lines) else b"\n".join(kept)
+
+
+def _document_scores(text: str, data: bytes) -> dict:
+    arr    = np.frombuffer(data, dtype=np.uint8)
+    totals = _BYTE_CLASSES.astype(np.int64) @ np.bincount(arr, minlength=256)
+    solid, ascii_ = int(totals[_SOLID]), int(totals[_ASCII])
+    text_bytes    = int(totals[_LETTER]) + int(totals[_DIGIT])
+    sample = data[:_COMPRESS_BYTES]
+    words  = _ASCII_WORD.findall(data.lower())
+    return {
+        "binary":     text.count("\ufffd") / len(text) if text else 0.0,
+        "alpha":      text_bytes / solid if solid else None,
+        "ascii":      ascii_ / arr.size if arr.size else 1.0,
+        "compress":   (len(zlib.compress(sample, 1)) / len(sample)
+                       if len(sample) >= _COMPRESS_FLOOR else None),
+        "words":      len(words),
+        "function":   (sum(w in _FUNCTION_WORDS for w in words) / len(words)) if words else 0.0,
+        "words_per_end": len(words) / max(1, len(_SENTENCE_END.findall(data))),
+    }
+
+
+def _document_reasons(scores: dict) -> list:
+    if scores["binary"] > _BINARY_MAX:
+        return ["binary"]
+    reasons = []
+    if scores["alpha"] is not None and scores["alpha"] < _ALPHA_MIN:
+        reasons.append("low_alpha")
+    compress = scores["compress"]
+    if compress is not None and compress < _COMPRESS_MIN:
+        reasons.append("repetitive")
+    elif compress is not None and compress > _COMPRESS_MAX:
+        reasons.append("incompressible")
+    if (
+        scores["words"] >= _SENTENCE_WORDS
+        and scores["ascii"] >= _ASCII_MIN
+        and scores["words_per_end"] > _WORDS_PER_END
+        and scores["function"] < _FUNCTION_MIN
+    ):
+        reasons.append("no_sentences")
+    return reasons
+
+
+def admit(text: str) -> Admission:
+    """
+    Decide whether raw `text` is worth a model at all (see ADMISSION
+    CONTROL above): drop boilerplate / non-prose lines, then judge what is
+    left.  Costs well under a millisecond per 10 KB.
+    """
+    if not text or not text.strip():
+        return Admission("accept", text or "")
+
+    data    = text.encode("utf-8", "replace")
+    dropped = {}
+    kept    = _filter_lines(data, set(), dropped)
+    if kept is not data:
+        text = kept.decode("utf-8")
+
+    scores  = _document_scores(text, kept)
+    reasons = list(dropped) + _document_reasons(scores)
+    if dropped and len(text.split()) < _MIN_KEPT_WORDS:
+        reasons.append("nothing_left")
+    scores["lines_dropped"] = sum(dropped.values())
+
+    if len(reasons) > len(dropped):
+        verdict = "reject"
+    else:
+        verdict = "reduce" if dropped else "accept"
+    return Admission(verdict, text, tuple(reasons), dropped, scores)
+
+
+def describe_admission(reasons, dropped=None) -> str:
+    """Readable admission reasons; dropped-line reasons carry their line count."""
+    dropped = dropped or {}
+    return "; ".join(
+        f"{REASONS.get(r, r)} ({dropped[r]})" if r in dropped else REASONS.get(r, r)
+        for r in reasons
+    )
+
+
+def with_dropped(admission: Admission, dropped: dict) -> Admission:
+    """`admission` plus the lines admit_pieces() dropped before it (streamed documents)."""
+    if not dropped:
+        return admission
+    merged = dict(dropped)
+    for reason, lines in admission.dropped.items():
+        merged[reason] = merged.get(reason, 0) + lines
+    reasons = tuple(merged) + tuple(r for r in admission.reasons if r not in merged)
+    verdict = "reject" if admission.verdict == "reject" else "reduce"
+    if verdict == "reduce" and len(admission.text.split()) < _MIN_KEPT_WORDS:
+        reasons, verdict = reasons + ("nothing_left",), "reject"
+    scores  = dict(admission.scores, lines_dropped=sum(merged.values()))
+    return Admission(verdict, admission.text, reasons, merged, scores)
+
+
+def admit_pieces(pieces, dropped: dict):
+    """
+    Line step of admit() over a document that arrives in pieces (see
+    stream_document): yields the pieces with boilerplate / non-prose lines
+    removed and counts the dropped lines per reason into `dropped`.
+    Repeats are found across the whole document.
+    """
+    seen  = set()
+    carry = b""
+    for piece in pieces:
+        data = carry + piece.encode("utf-8", "replace")
+        cut  = data.rfind(b"\n")
+        if cut < 0:
+            if len(data) < _MAX_CARRY:
+                carry = data                     # no line end yet — keep reading
+                continue
+            cut = data.rfind(b" ")               # an overlong line is judged in parts
+            if cut < 0:
+                cut = len(data)
+        carry = data[cut + 1:]
+        kept  = _filter_lines(data[:cut], seen, dropped)
+        if kept:
+            yield kept.decode("utf-8", "replace") + "\n"
+    if carry:
+        kept = _filter_lines(carry, seen, dropped)
+        if kept:
+            yield kept.decode("utf-8")
+
+
+@dataclass(frozen=True)
+class CleanedDocument:
+    """
+    Result of one cleaning pass — computed once per input and passed
+    around instead of re-cleaning / re-splitting the text.  `admission`
+    tells which lines were dropped before cleaning, or why the input was
+    rejected (is_garbage is then True).
+    """
+    text: str
+    word_count: int
+    unique_ratio: float
+    is_garbage: bool
+    admission: Admission = _ACCEPTED
+
+
+def _is_garbage(word_count: int, unique_ratio: float) -> bool:
+    # too short, or too repetitive
+    return word_count < 15 or unique_ratio < 0.3
+
+
+def clean_document(text: str) -> CleanedDocument:
     """
-    Cleans user input text before summarization
+    Clean user input in a single pass:
+    admit() drops boilerplate lines and judges the raw text, then one
+    precompiled regex drops noise characters and one split() yields the
+    word list used for the cleaned text (whitespace collapsed and
+    stripped), the word count and the repetition ratio.
     """
 
+    if not text:
+        return CleanedDocument("", 0, 0.0, True)
+
+    with STAGE_SECONDS.time(stage="clean"):
+        admission = admit(text)
+        words = _NOISE.sub("", admission.text).split()
+        count = len(words)
+        ratio = len(set(words)) / count if count else 0.0
+
+        return CleanedDocument(
+            text=" ".join(words),
+            word_count=count,
+            unique_ratio=ratio,
+            is_garbage=admission.verdict == "reject" or _is_garbage(count, ratio),
+            admission=admission,
+        )
+
+
+def clean_text(text: str) -> str:
+    """
+    Cleans user input text before summarization: noise characters dropped,
+    whitespace collapsed and stripped.  Nothing else is removed — admit()
+    runs in clean_document(), on the way to a model.
+    """
     if not text:
         return ""
+    return " ".join(_NOISE.sub("", text).split())
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  STREAMING INGESTION
+#
+#  Uploaded files are read, decoded, stripped of HTML and cleaned one block
+#  at a time, so a multi-megabyte report never exists as one decoded string
+#  (let alone as raw, stripped and cleaned copies side by side).
+#  summarizer.summarize_chunked() consumes the cleaned pieces.
+# ─────────────────────────────────────────────────────────────────────────────
+
+_READ_SIZE = 64 * 1024              # bytes per read
+_MAX_CARRY = 64 * 1024              # a "word" longer than this is cut anyway
+_TRAILING  = re.compile(r"\S*\Z")   # the (possibly partial) last word of a block
 
-    # remove extra spaces
-    text = re.sub(r"\s+", " ", text)
+# contents never shown as text
+_SKIP_TAGS  = frozenset({"script", "style", "noscript", "template", "svg", "head"})
+# tags that end a line of text — keeps words in adjacent blocks apart
+_BLOCK_TAGS = frozenset({
+    "p", "div", "br", "li", "ul", "ol", "tr", "td", "th", "table", "section",
+    "article", "header", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote",
+    "pre", "hr", "title",
+})
 
-    # remove weird characters
-    text = re.sub(r"[^\w\s\.,!?-]", "", text)
 
-    # strip
-    text = text.strip()
+def read_chunks(stream, size: int = _READ_SIZE):
+    """Decoded text of a file object, `size` bytes at a time (invalid UTF-8 → U+FFFD)."""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        block = stream.read(size)
+        if not block:
+            break
+        yield decoder.decode(block) if isinstance(block, bytes) else block
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
 
-    return text
 
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
 
-def is_garbage_input(text: str) -> bool:
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+    def take(self) -> str:
+        text, self.parts = "".join(self.parts), []
+        return text
+
+
+def strip_html(pieces):
+    """Visible text of an HTML document that arrives in pieces (scripts / styles dropped)."""
+    parser = _TextExtractor()
+    for piece in pieces:
+        parser.feed(piece)
+        text = parser.take()
+        if text:
+            yield text
+    parser.close()
+    text = parser.take()
+    if text:
+        yield text
+
+
+def iter_clean_text(pieces):
+    """
+    Generator version of clean_text(): yields the cleaned text of `pieces`
+    block by block.  A word cut by a block boundary is carried over to the
+    next block, so the joined output (" ".join) equals clean_text() of the
+    joined pieces — for stream_document(), the file minus the lines
+    admit_pieces() dropped.
+    """
+    carry = ""
+    for piece in pieces:
+        piece = carry + piece
+        tail  = _TRAILING.search(piece).start()
+        if tail == 0 and len(piece) < _MAX_CARRY:
+            carry = piece                        # no whitespace yet — keep reading
+            continue
+        if tail == 0:
+            tail = len(piece)
+        carry = piece[tail:]
+        words = _NOISE.sub("", piece[:tail]).split()
+        if words:
+            yield " ".join(words)
+
+    words = _NOISE.sub("", carry).split()
+    if words:
+        yield " ".join(words)
+
+
+def stream_document(stream, html: bool = False, dropped: dict = None):
+    """
+    Cleaned text pieces of an uploaded file (.txt / .md, or .html with
+    html=True).  Boilerplate / non-prose lines are dropped on the way (see
+    admit_pieces); pass a dict as `dropped` to get their counts per reason.
+    """
+    pieces = read_chunks(stream)
+    if html:
+        pieces = strip_html(pieces)
+    pieces = admit_pieces(pieces, {} if dropped is None else dropped)
+    return iter_clean_text(pieces)
+
+
+def is_garbage_input(text) -> bool:
     """
     Detect useless inputs like:
     AI AI AI AI AI
     test test test test
     aaaaaa
-    """
+    — and anything admit() refuses (encoded blobs, log dumps, tables).
 
-    words = text.split()
-
-    # too short
-    if len(words) < 15:
-        return True
+    Accepts a plain string or an already computed CleanedDocument.
+    """
 
-    # repetition detection
-    unique_ratio = len(set(words)) / len(words)
+    if isinstance(text, CleanedDocument):
+        return text.is_garbage
 
-    if unique_ratio < 0.3:
+    words = text.split()
+    if not words:
         return True
 
-    return False
\ No newline at end of file
+    return (
+        _is_garbage(len(words), len(set(words)) / len(words))
+        or admit(text).verdict == "reject"
+    )
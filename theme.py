@@ -0,0 +1,475 @@
+# ─────────────────────────────────────────────────────────────────────────────
+#  THEMES
+#
+#  Everything in the page that depends only on the theme — the colour
+#  tokens (T), the stylesheet and the hero block — built once per process
+#  for both themes.  app.py picks the pre-rendered strings by name, so a
+#  rerun no longer re-formats ~400 lines of CSS.
+# ─────────────────────────────────────────────────────────────────────────────
+
+THEME_NAMES = ("dark", "light")
+
+
+def _palette(is_dark: bool) -> dict:
+    return {
+        # ── BACKGROUNDS ────────────────────────────────────────────────────────
+        "app_bg":          "#090c14"                    if is_dark else "#f5f3ff",
+        "textarea_bg":     "#111622"                    if is_dark else "#ffffff",
+        "textarea_border": "rgba(255,255,255,0.10)"     if is_dark else "rgba(79,70,229,0.20)",
+        "settings_bg":     "#0d1119"                    if is_dark else "#ffffff",
+        "select_bg":       "#111622"                    if is_dark else "#f5f3ff",
+        "select_border":   "rgba(255,255,255,0.09)"     if is_dark else "rgba(79,70,229,0.15)",
+        "popover_bg":      "#141824"                    if is_dark else "#ffffff",
+        "metric_bg":       "rgba(255,255,255,0.03)"     if is_dark else "rgba(79,70,229,0.05)",
+        "metric_border":   "rgba(255,255,255,0.06)"     if is_dark else "rgba(79,70,229,0.14)",
+        "card_border":     "rgba(255,255,255,0.07)"     if is_dark else "rgba(79,70,229,0.14)",
+        "settings_border": "rgba(255,255,255,0.06)"     if is_dark else "rgba(79,70,229,0.12)",
+        "pill_bg":         "rgba(255,255,255,0.04)"     if is_dark else "rgba(79,70,229,0.07)",
+        "pill_border":     "rgba(255,255,255,0.07)"     if is_dark else "rgba(79,70,229,0.16)",
+        "toggle_bg":       "#0d1119"                    if is_dark else "#ffffff",
+        # ── TEXT ───────────────────────────────────────────────────────────────
+        "text_primary":    "#ffffff"                    if is_dark else "#1e1b4b",
+        "text_secondary":  "rgba(255,255,255,0.42)"     if is_dark else "rgba(49,46,129,0.65)",
+        "text_muted":      "rgba(255,255,255,0.22)"     if is_dark else "rgba(49,46,129,0.50)",
+        "text_label":      "rgba(255,255,255,0.28)"     if is_dark else "rgba(79,70,229,0.65)",
+        "placeholder":     "rgba(255,255,255,0.18)"     if is_dark else "rgba(79,70,229,0.30)",
+        "textarea_text":   "rgba(255,255,255,0.88)"     if is_dark else "#1e1b4b",
+        "select_text":     "rgba(255,255,255,0.75)"     if is_dark else "#312e81",
+        "select_icon":     "rgba(255,255,255,0.35)"     if is_dark else "rgba(79,70,229,0.55)",
+        "opt_text":        "rgba(255,255,255,0.70)"     if is_dark else "rgba(49,46,129,0.85)",
+        # ── RESULT CARD ────────────────────────────────────────────────────────
+        "result_bg":       "rgba(99,255,200,0.03)"      if is_dark else "rgba(79,70,229,0.04)",
+        "result_border":   "rgba(99,255,200,0.12)"      if is_dark else "rgba(79,70,229,0.20)",
+        "result_text":     "rgba(255,255,255,0.82)"     if is_dark else "#1e1b4b",
+        # ── STRUCTURE / MESH ───────────────────────────────────────────────────
+        "grid":            "rgba(255,255,255,0.018)"    if is_dark else "rgba(79,70,229,0.015)",
+        #                                                                       ↑ ISSUE 9 — was 0.035
+        "mesh1":           "rgba(99,255,200,0.07)"      if is_dark else "rgba(79,70,229,0.07)",
+        "mesh2":           "rgba(120,80,255,0.09)"      if is_dark else "rgba(124,58,237,0.07)",
+        "mesh3":           "rgba(0,180,255,0.06)"       if is_dark else "rgba(192,38,211,0.05)",
+        "divider_mid":     "rgba(99,255,200,0.15)"      if is_dark else "rgba(79,70,229,0.30)",
+        "divider_side":    "rgba(255,255,255,0.04)"     if is_dark else "rgba(79,70,229,0.06)",
+        "footer_border":   "rgba(255,255,255,0.04)"     if is_dark else "rgba(79,70,229,0.10)",
+        "footer_text":     "rgba(255,255,255,0.15)"     if is_dark else "rgba(79,70,229,0.38)",
+        "compress_sub":    "rgba(255,255,255,0.22)"     if is_dark else "rgba(49,46,129,0.48)",
+        # ── BADGE / TIPS — ISSUE 6: reduced to ghost-hint level ───────────────
+        "badge_bg":        "rgba(99,255,200,0.02)"      if is_dark else "rgba(79,70,229,0.03)",
+        "badge_border":    "rgba(99,255,200,0.06)"      if is_dark else "rgba(79,70,229,0.10)",
+        "tip_label":       "rgba(99,255,200,0.35)"      if is_dark else "rgba(79,70,229,0.55)",
+        "tip_bold":        "rgba(255,255,255,0.30)"     if is_dark else "rgba(30,27,75,0.50)",
+        # ── ACCENT PALETTE ─────────────────────────────────────────────────────
+        "accent":          "#63ffc8"                    if is_dark else "#4f46e5",
+        "accent_blue":     "#3b82f6"                    if is_dark else "#7c3aed",
+        "accent_purple":   "#a78bfa"                    if is_dark else "#c026d3",
+        # ── COPY BUTTON — ISSUE 4: visible, clickable-looking ─────────────────
+        # dark  → mint border at 35% opacity + subtle mint tint bg
+        # light → indigo border at 35% opacity + subtle indigo tint bg
+        "copy_border":     "rgba(99,255,200,0.35)"      if is_dark else "rgba(79,70,229,0.35)",
+        "copy_bg":         "rgba(99,255,200,0.05)"      if is_dark else "rgba(79,70,229,0.05)",
+        "copy_text":       "rgba(99,255,200,0.75)"      if is_dark else "rgba(79,70,229,0.75)",
+        # ── SEMANTIC EXTRAS ────────────────────────────────────────────────────
+        "btn_text":        "#050810"                    if is_dark else "#ffffff",
+        "engine_bg":       "rgba(59,130,246,0.08)"      if is_dark else "rgba(79,70,229,0.07)",
+        "engine_border":   "rgba(59,130,246,0.18)"      if is_dark else "rgba(79,70,229,0.20)",
+        "engine_dot":      "#3b82f6"                    if is_dark else "#4f46e5",
+        "engine_val":      "#7dd3fc"                    if is_dark else "#4f46e5",
+    }
+
+
+def _stylesheet(T: dict) -> str:
+    return f"""
+<style>
+@import url('https://fonts.googleapis.com/css2?family=Syne:wght@400;500;600;700;800&family=DM+Sans:ital,opsz,wght@0,9..40,300;0,9..40,400;0,9..40,500;1,9..40,300&display=swap');
+
+*, *::before, *::after {{ box-sizing: border-box; }}
+
+html, body, .stApp {{
+    background-color: {T['app_bg']} !important;
+    font-family: 'DM Sans', sans-serif;
+}}
+
+.stApp {{
+    position:   relative;
+    min-height: 100vh;
+    overflow-x: hidden;
+}}
+
+.stApp::before {{
+    content: '';
+    position: fixed;
+    inset: 0;
+    background:
+        radial-gradient(ellipse 80% 60% at 10%  0%,  {T['mesh1']} 0%, transparent 60%),
+        radial-gradient(ellipse 60% 50% at 90% 10%,  {T['mesh2']} 0%, transparent 55%),
+        radial-gradient(ellipse 50% 40% at 50% 90%,  {T['mesh3']} 0%, transparent 60%);
+    pointer-events: none;
+    z-index: 0;
+}}
+
+/* ISSUE 9 — grid opacity reduced in light mode via T['grid'] token above */
+.stApp::after {{
+    content: '';
+    position: fixed;
+    inset: 0;
+    background-image:
+        linear-gradient({T['grid']} 1px, transparent 1px),
+        linear-gradient(90deg, {T['grid']} 1px, transparent 1px);
+    background-size: 60px 60px;
+    pointer-events: none;
+    z-index: 0;
+}}
+
+section.main > div,
+[data-testid="stAppViewContainer"] > .main {{
+    position: relative;
+    z-index: 1;
+}}
+
+#MainMenu, footer, header {{ visibility: hidden !important; }}
+[data-testid="collapsedControl"] {{ display: none !important; }}
+.stDeployButton {{ display: none !important; }}
+
+::-webkit-scrollbar {{ width: 4px; }}
+::-webkit-scrollbar-track {{ background: transparent; }}
+::-webkit-scrollbar-thumb {{ background: {T['accent']}55; border-radius: 2px; }}
+
+.block-container {{
+    padding:   0 2rem !important;
+    max-width: 1300px !important;
+}}
+[data-testid="column"] {{ padding: 0 10px !important; }}
+
+/* ── TEXTAREA ─────────────────────────────────────────── */
+.stTextArea > div,
+.stTextArea > div > div,
+.stTextArea > div > div > div,
+[data-baseweb="textarea"],
+[data-baseweb="textarea"] > div,
+[data-baseweb="base-input"],
+[data-baseweb="base-input"] > div {{
+    background:       {T['textarea_bg']} !important;
+    background-color: {T['textarea_bg']} !important;
+    border:           none !important;
+    box-shadow:       none !important;
+}}
+
+.stTextArea textarea {{
+    background:         {T['textarea_bg']} !important;
+    background-color:   {T['textarea_bg']} !important;
+    border:             1px solid {T['textarea_border']} !important;
+    border-radius:      14px !important;
+    color:              {T['textarea_text']} !important;
+    font-family:        'DM Sans', sans-serif !important;
+    font-size:          0.97rem !important;
+    font-weight:        300 !important;
+    line-height:        1.8 !important;
+    padding:            22px 24px !important;   /* ISSUE minor: 24px padding */
+    caret-color:        {T['accent']} !important;
+    resize:             none !important;
+    overflow-y:         hidden !important;
+    box-shadow:         none !important;
+    outline:            none !important;
+    -webkit-box-shadow: none !important;
+    -webkit-appearance: none !important;
+    min-height:         220px !important;
+    transition:         border-color 0.25s ease, box-shadow 0.25s ease !important;
+}}
+
+.stTextArea textarea::placeholder {{
+    color:       {T['placeholder']} !important;
+    font-style:  italic !important;
+    font-weight: 300 !important;
+}}
+
+.stTextArea textarea:focus {{
+    border-color:       {T['accent']}55 !important;
+    box-shadow:         0 0 0 3px {T['accent']}0f !important;
+    outline:            none !important;
+    -webkit-box-shadow: 0 0 0 3px {T['accent']}0f !important;
+}}
+
+.stTextArea textarea:invalid,
+.stTextArea textarea:required,
+.stTextArea textarea:-moz-ui-invalid {{
+    box-shadow:         none !important;
+    -webkit-box-shadow: none !important;
+    border-color:       {T['textarea_border']} !important;
+    outline:            none !important;
+}}
+
+.stTextArea label {{ display: none !important; }}
+
+/* ── SELECTBOX ────────────────────────────────────────── */
+div[data-baseweb="select"] > div {{
+    background-color: {T['select_bg']} !important;
+    border-color:     {T['select_border']} !important;
+    border-radius:    10px !important;
+    color:            {T['select_text']} !important;
+    font-family:      'DM Sans', sans-serif !important;
+    font-size:        0.9rem !important;
+}}
+
+div[data-baseweb="select"] > div:hover {{
+    border-color: {T['accent']}44 !important;
+}}
+
+div[data-baseweb="select"] svg {{ color: {T['select_icon']} !important; }}
+
+[data-baseweb="popover"], [data-baseweb="menu"] {{
+    background:    {T['popover_bg']} !important;
+    border:        1px solid {T['select_border']} !important;
+    border-radius: 10px !important;
+}}
+
+[role="option"] {{
+    color:            {T['opt_text']} !important;
+    font-family:      'DM Sans', sans-serif !important;
+    font-size:        0.88rem !important;
+    background-color: {T['popover_bg']} !important;
+}}
+
+[role="option"]:hover, [aria-selected="true"] {{
+    background-color: {T['accent']}14 !important;
+    color:            {T['accent']} !important;
+}}
+
+.stSelectbox label {{
+    font-family:    'DM Sans', sans-serif !important;
+    font-size:      0.72rem !important;
+    font-weight:    600 !important;
+    color:          {T['text_label']} !important;
+    letter-spacing: 0.10em !important;
+    text-transform: uppercase !important;
+    margin-bottom:  2px !important;
+}}
+
+/* ── RUN ANALYSIS BUTTON ──────────────────────────────── */
+.stButton > button {{
+    background:     linear-gradient(135deg, {T['accent']} 0%, {T['accent_blue']} 100%) !important;
+    color:          {T['btn_text']} !important;
+    font-family:    'Syne', sans-serif !important;
+    font-weight:    800 !important;
+    font-size:      0.82rem !important;
+    letter-spacing: 0.15em !important;
+    text-transform: uppercase !important;
+    padding:        0.82rem 1.5rem !important;
+    border-radius:  12px !important;
+    border:         none !important;
+    width:          100% !important;
+    cursor:         pointer !important;
+    box-shadow:     0 2px 22px {T['accent']}35, 0 1px 0 rgba(255,255,255,0.15) inset !important;
+    transition:     transform 0.18s ease, box-shadow 0.18s ease !important;
+}}
+
+.stButton > button:hover {{
+    transform:  translateY(-2px) !important;
+    box-shadow: 0 8px 30px {T['accent']}55 !important;
+}}
+
+.stButton > button:active {{
+    transform: translateY(0) !important;
+}}
+
+/* ── METRICS ──────────────────────────────────────────── */
+div[data-testid="stMetric"] {{
+    background:    {T['metric_bg']} !important;
+    border:        1px solid {T['metric_border']} !important;
+    border-radius: 14px !important;
+    padding:       18px 20px !important;
+}}
+
+div[data-testid="stMetric"]:hover {{
+    border-color: {T['accent']}22 !important;
+}}
+
+[data-testid="stMetricValue"] {{
+    font-family:    'Syne', sans-serif !important;
+    font-size:      1.9rem !important;
+    font-weight:    800 !important;
+    color:          {T['text_primary']} !important;
+    letter-spacing: -1px !important;
+}}
+
+[data-testid="stMetricLabel"] {{
+    font-size:      0.70rem !important;
+    font-weight:    600 !important;
+    color:          {T['text_label']} !important;
+    letter-spacing: 0.10em !important;
+    text-transform: uppercase !important;
+}}
+
+[data-testid="stMetricDelta"],
+[data-testid="stMetricDeltaIcon"] {{
+    color:     {T['accent']} !important;
+    font-size: 0.78rem !important;
+}}
+
+/* ── ALERT ────────────────────────────────────────────── */
+.stAlert > div {{
+    background:    rgba(251,191,36,0.06) !important;
+    border:        1px solid rgba(251,191,36,0.20) !important;
+    border-radius: 10px !important;
+    color:         {T['text_secondary']} !important;
+}}
+
+/* ── GRADIENT TITLE — CSS class bypasses Streamlit sanitizer ── */
+.ns-grad {{
+    background:              linear-gradient(90deg, {T['accent']} 0%, {T['accent_blue']} 50%, {T['accent_purple']} 100%) !important;
+    -webkit-background-clip: text !important;
+    -webkit-text-fill-color: transparent !important;
+    background-clip:         text !important;
+    display:                 inline !important;
+}}
+
+/* ── COPY TOAST ───────────────────────────────────────── */
+#ns-toast {{
+    position:       fixed;
+    bottom:         36px;
+    left:           50%;
+    transform:      translateX(-50%) translateY(16px);
+    background:     {T['settings_bg']};
+    border:         1px solid {T['accent']}55;
+    border-radius:  100px;
+    padding:        11px 24px 11px 18px;
+    display:        flex;
+    align-items:    center;
+    gap:            11px;
+    font-family:    'Syne', sans-serif;
+    font-size:      0.78rem;
+    font-weight:    600;
+    letter-spacing: 0.06em;
+    color:          {T['accent']};
+    box-shadow:     0 10px 40px rgba(0,0,0,0.28), 0 0 0 1px {T['accent']}22;
+    opacity:        0;
+    transition:     opacity 0.22s ease, transform 0.22s ease;
+    z-index:        99999;
+    pointer-events: none;
+    white-space:    nowrap;
+}}
+#ns-toast.ns-show {{
+    opacity:   1;
+    transform: translateX(-50%) translateY(0);
+}}
+
+#ns-spinner {{
+    width:            15px;
+    height:           15px;
+    border:           2px solid {T['accent']}30;
+    border-top-color: {T['accent']};
+    border-radius:    50%;
+    animation:        ns-spin 0.65s linear infinite;
+    flex-shrink:      0;
+    display:          none;
+}}
+#ns-toast.ns-show  #ns-spinner {{ display: block; }}
+#ns-check {{
+    display:     none;
+    font-size:   1rem;
+    line-height: 1;
+    color:       {T['accent']};
+}}
+#ns-toast.ns-done #ns-spinner {{ display: none; }}
+#ns-toast.ns-done #ns-check   {{ display: block; }}
+
+/* ── RESULT CARD ACTION BUTTONS ───────────────────────── */
+/* ISSUE 4 — copy button visible & clickable-looking in dark mode */
+.ns-action-btn {{
+    background:    {T['copy_bg']} !important;
+    border:        1px solid {T['copy_border']} !important;
+    border-radius: 8px !important;
+    color:         {T['copy_text']} !important;
+    font-family:   'DM Sans', sans-serif !important;
+    font-size:     0.78rem !important;
+    font-weight:   500 !important;
+    letter-spacing:0.05em !important;
+    padding:       7px 18px !important;
+    cursor:        pointer !important;
+    transition:    all 0.2s ease !important;
+    display:       inline-flex !important;
+    align-items:   center !important;
+    gap:           7px !important;
+    text-decoration: none !important;
+    line-height:   1 !important;
+}}
+.ns-action-btn:hover {{
+    background:   {T['accent']}15 !important;
+    border-color: {T['accent']}66 !important;
+    color:        {T['accent']} !important;
+    transform:    translateY(-1px) !important;
+}}
+.ns-action-btn svg {{ opacity: 0.7; flex-shrink: 0; }}
+
+/* ── KEYFRAMES ────────────────────────────────────────── */
+@keyframes blockFill {{
+    0%   {{ opacity: 0.12; transform: scaleY(0.55); }}
+    100% {{ opacity: 1;    transform: scaleY(1); }}
+}}
+@keyframes pulse {{
+    0%,100% {{ opacity:1;   transform:scale(1); }}
+    50%     {{ opacity:0.5; transform:scale(0.85); }}
+}}
+@keyframes ns-spin {{
+    to {{ transform: rotate(360deg); }}
+}}
+</style>
+
+<style>
+[data-testid="stHorizontalBlock"]:first-of-type .stButton > button {{
+    background:     {T['toggle_bg']} !important;
+    border:         1px solid {T['card_border']} !important;
+    border-radius:  100px !important;
+    color:          {T['text_secondary']} !important;
+    font-family:    'DM Sans', sans-serif !important;
+    font-size:      0.75rem !important;
+    font-weight:    500 !important;
+    letter-spacing: 0.04em !important;
+    padding:        6px 16px !important;
+    box-shadow:     0 2px 10px rgba(0,0,0,0.15) !important;
+    width:          auto !important;
+    text-transform: none !important;
+}}
+[data-testid="stHorizontalBlock"]:first-of-type .stButton > button:hover {{
+    border-color: {T['accent']}55 !important;
+    color:        {T['accent']} !important;
+    transform:    none !important;
+    box-shadow:   0 2px 14px rgba(0,0,0,0.2) !important;
+}}
+</style>
+"""
+
+
+def _hero(T: dict, is_dark: bool) -> str:
+    eyebrow_bg     = "rgba(99,255,200,0.07)"  if is_dark else "rgba(79,70,229,0.07)"
+    eyebrow_border = "rgba(99,255,200,0.18)"  if is_dark else "rgba(79,70,229,0.20)"
+    return f"""
+<div style="padding:12px 0 20px 0;">
+    <div style="display:inline-flex;align-items:center;gap:8px;
+        background:{eyebrow_bg};border:1px solid {eyebrow_border};
+        border-radius:100px;padding:5px 14px 5px 10px;margin-bottom:14px;">
+        <span style="width:7px;height:7px;background:{T['accent']};border-radius:50%;
+            box-shadow:0 0 8px {T['accent']};display:inline-block;
+            animation:pulse 2s ease infinite;"></span>
+        <span style="font-family:'DM Sans',sans-serif;font-size:0.70rem;font-weight:600;
+            color:{T['accent']};letter-spacing:0.14em;text-transform:uppercase;">
+            Transformer &middot; T5 &amp; BART &middot; NLP
+        </span>
+    </div>
+    <div style="font-family:'Syne',sans-serif;
+        font-size:clamp(2.4rem,5vw,4.2rem);font-weight:800;
+        line-height:1.0;letter-spacing:-2px;
+        color:{T['text_primary']};margin-bottom:10px;">
+        Neural<span class="ns-grad">Sum</span>
+    </div>
+    <div style="font-size:1.0rem;color:{T['text_secondary']};font-weight:300;
+        max-width:460px;line-height:1.6;font-family:'DM Sans',sans-serif;">
+        Distill vast information into precise intelligence &mdash; powered by transformer models.
+    </div>
+</div>
+<div style="height:1px;margin-bottom:24px;
+    background:linear-gradient(90deg,{T['divider_side']},{T['divider_mid']} 50%,{T['divider_side']});"></div>
+"""
+
+
+PALETTES    = {name: _palette(name == "dark") for name in THEME_NAMES}
+STYLESHEETS = {name: _stylesheet(PALETTES[name]) for name in THEME_NAMES}
+HEROES      = {name: _hero(PALETTES[name], name == "dark") for name in THEME_NAMES}
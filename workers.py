@@ -0,0 +1,123 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  INFERENCE WORKER POOL
+#
+#  Every Streamlit session used to call the shared models straight from its
+#  own script thread, so two concurrent BART requests each spun up a full
+#  set of torch intra-op threads and fought over the cores.  All inference
+#  now goes through one bounded pool:
+#
+#  workers            — generations that may run at the same time
+#  threads_per_worker — cores budgeted per worker (default cores / workers).
+#                       torch's intra-op thread count is process-wide, so
+#                       the pool sets it once per process, to
+#                       threads_per_worker × workers, shared by the workers
+#  max_pending        — jobs allowed to wait for a worker; beyond that
+#                       submit() raises PoolSaturated (backpressure) instead
+#                       of letting the queue grow without bound
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class PoolSaturated(RuntimeError):
+    """Raised when every worker is busy and the wait queue is full."""
+
+
+class InferencePool:
+    def __init__(self, workers: int = 2, threads_per_worker: int = 0, max_pending: int = 8):
+        self.workers            = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self.max_pending        = max(0, max_pending)
+
+        self._slots    = threading.BoundedSemaphore(self.workers + self.max_pending)
+        self._lock     = threading.Lock()
+        self._inflight = 0
+        self._rejected = 0
+        self._torch_pid = None                   # process whose torch threads were set
+        self._local    = threading.local()       # .worker is True on the pool's own threads
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="neuralsum-infer",
+            initializer=self._init_worker,
+        )
+
+    @property
+    def torch_threads(self) -> int:
+        return self.threads_per_worker * self.workers
+
+    def _init_worker(self):
+        # The first worker of each process applies it: after a pre-fork the
+        # parent's single-thread setting must be replaced in every child.
+        self._local.worker = True
+        with self._lock:
+            if self._torch_pid == os.getpid():
+                return
+            self._torch_pid = os.getpid()
+        try:
+            import torch
+            torch.set_num_threads(self.torch_threads)
+        except ImportError:
+            pass
+
+    def _release(self, _future):
+        with self._lock:
+            self._inflight -= 1
+        self._slots.release()
+
+    def submit(self, fn, *args, timeout: float = 0, **kwargs):
+        """
+        Queue fn(*args, **kwargs) and return its Future.
+
+        timeout — seconds to wait for queue space; 0 fails fast with
+        PoolSaturated when the pool is full, None waits as long as needed
+        (batch jobs that want backpressure rather than rejection).
+        """
+        if timeout is None:
+            acquired = self._slots.acquire()
+        elif timeout > 0:
+            acquired = self._slots.acquire(timeout=timeout)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                self._rejected += 1
+            raise PoolSaturated(
+                f"{self.workers} workers busy and {self.max_pending} jobs already queued"
+            )
+
+        with self._lock:
+            self._inflight += 1
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def run(self, fn, *args, timeout: float = 0, **kwargs):
+        """
+        fn(*args, **kwargs) on a worker; waits for and returns its result.
+        Called from one of the pool's own workers it runs right there — a
+        job waiting on a job queued behind it would deadlock a full pool.
+        """
+        if getattr(self._local, "worker", False):
+            return fn(*args, **kwargs)
+        return self.submit(fn, *args, timeout=timeout, **kwargs).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers":            self.workers,
+                "torch_threads":      self.torch_threads,
+                "inflight":           self._inflight,
+                "queued":             max(0, self._inflight - self.workers),
+                "capacity":           self.workers + self.max_pending,
+                "rejected":           self._rejected,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)